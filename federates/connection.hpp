@@ -0,0 +1,65 @@
+/*
+==========================================================================================
+Copyright (C) 2019, Battelle Memorial Institute
+Written by Jacob Hansen, Pacific Northwest National Laboratory
+==========================================================================================
+*/
+#ifndef _CONNECTION_HPP_
+#define _CONNECTION_HPP_
+
+#include <string>
+#include <chrono>
+#include <thread>
+#include <stdlib.h>
+#include <unistd.h>
+#include <sys/socket.h>
+#include <netinet/in.h>
+#include <arpa/inet.h>
+
+// port the stand-in broker listens on when it is not given one, like the default port of a HELICS broker
+const int NOOP_BROKER_PORT = 23500;
+
+// the stand-ins only talk over the loopback interface, a stand-in experiment always runs on a single host
+inline sockaddr_in loopback_address(int port) {
+	sockaddr_in address = {};
+	address.sin_family = AF_INET;
+	address.sin_port = htons(port);
+	address.sin_addr.s_addr = htonl(INADDR_LOOPBACK);
+	return address;
+}
+
+// reads the port of the broker a federate connects to from the --brokerport argument of the core init string in its
+// HELICS config, the default port when there is none
+inline int config_broker_port(const std::string &configText) {
+	std::string::size_type position = configText.find("--brokerport=");
+	if (position == std::string::npos) {
+		return NOOP_BROKER_PORT;
+	}
+	return atoi(configText.c_str() + position + 13);
+}
+
+// tells the stand-in broker on the port that a federate or sub-broker below it is done, the connection is retried
+// until the timeout as the broker may still be starting, returns false when the broker could not be reached
+inline bool notify_broker(int port, double timeout = 30.) {
+	sockaddr_in address = loopback_address(port);
+	auto deadline = std::chrono::steady_clock::now() + std::chrono::duration<double>(timeout);
+	while (true) {
+		int brokerFd = socket(AF_INET, SOCK_STREAM, 0);
+		if (brokerFd < 0) {
+			return false;
+		}
+		if (connect(brokerFd, reinterpret_cast<sockaddr*>(&address), sizeof(address)) == 0) {
+			char done = 'd';
+			bool sent = write(brokerFd, &done, 1) == 1;
+			close(brokerFd);
+			return sent;
+		}
+		close(brokerFd);
+		if (std::chrono::steady_clock::now() > deadline) {
+			return false;
+		}
+		std::this_thread::sleep_for(std::chrono::milliseconds(10));
+	}
+}
+
+#endif
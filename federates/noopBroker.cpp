@@ -0,0 +1,79 @@
+/*
+==========================================================================================
+Copyright (C) 2019, Battelle Memorial Institute
+Written by Jacob Hansen, Pacific Northwest National Laboratory
+==========================================================================================
+*/
+#include <iostream>
+#include <stdio.h>
+#include <string.h>
+#include <errno.h>
+
+#include "logging.hpp"
+#include "connection.hpp"
+
+using namespace std;
+
+// set the definition for the logger
+loglevel_e loglevel;
+
+/* ==================================================================================================================
+====================== MAIN PART ====================================================================================
+===================================================================================================================*/
+
+// stand-in broker, it accepts the arguments of helics_broker and waits until every federate below it (or every
+// sub-broker with --minbrokers) has told it that it is done. A sub-broker then tells its parent (--brokerport) in turn,
+// so a hierarchy of stand-in brokers exits from the leaves up like a HELICS one
+int main(int argc, const char *argv[]) {
+	loglevel = logINFO;
+
+	LINFO << "Running process -> " << argv[0] ;
+	int federates = 0;
+	int minBrokers = 0;
+	int port = NOOP_BROKER_PORT;
+	int parentPort = -1;
+	for (int i = 1; i < argc; i++) {
+		LINFO << "    " << argv[i];
+		// the other arguments of helics_broker (tick, timeout, log level, core type, port start) do not apply here
+		sscanf(argv[i], "--federates=%d", &federates);
+		sscanf(argv[i], "--minbrokers=%d", &minBrokers);
+		sscanf(argv[i], "--port=%d", &port);
+		sscanf(argv[i], "--brokerport=%d", &parentPort);
+	}
+
+	// a broker with sub-brokers only hears from them, the federates report to their leaf broker
+	int expected = minBrokers > 0 ? minBrokers : federates;
+
+	int listenFd = socket(AF_INET, SOCK_STREAM, 0);
+	int reuse = 1;
+	setsockopt(listenFd, SOL_SOCKET, SO_REUSEADDR, &reuse, sizeof(reuse));
+	sockaddr_in address = loopback_address(port);
+	if (listenFd < 0 || ::bind(listenFd, reinterpret_cast<sockaddr*>(&address), sizeof(address)) != 0 || listen(listenFd, SOMAXCONN) != 0) {
+		LERROR << "not able to listen on port " << port << " (" << strerror(errno) << ")";
+		return 1;
+	}
+	LINFO << "Waiting for " << expected << (minBrokers > 0 ? " sub-brokers" : " federates") << " on port " << port;
+
+	int done = 0;
+	while (done < expected) {
+		int connectionFd = accept(listenFd, NULL, NULL);
+		if (connectionFd < 0) {
+			continue;
+		}
+		char message = 0;
+		if (read(connectionFd, &message, 1) == 1 && message == 'd') {
+			done++;
+			LDEBUG << done << " of " << expected << " done";
+		}
+		close(connectionFd);
+	}
+	close(listenFd);
+
+	if (parentPort >= 0 && !notify_broker(parentPort)) {
+		LERROR << "not able to reach the parent broker on port " << parentPort;
+		return 1;
+	}
+
+	LINFO << "Terminating stand-in broker";
+	return 0;
+}
@@ -0,0 +1,45 @@
+/*
+==========================================================================================
+Copyright (C) 2019, Battelle Memorial Institute
+Written by Jacob Hansen, Pacific Northwest National Laboratory
+==========================================================================================
+*/
+#ifndef _PROGRESS_HPP_
+#define _PROGRESS_HPP_
+
+#include <string>
+#include <string.h>
+#include <stdlib.h>
+#include <fcntl.h>
+#include <unistd.h>
+#include <sys/mman.h>
+
+// the heartbeat of a federate is its granted time, kept in a memory mapped "<name>.progress" file so the test suite
+// can watch the federation advance while the main loop only does a store to memory, returns NULL when the
+// heartbeat is disabled (LOG_PROGRESS is not 1) or the file can not be mapped
+inline double *map_progress(const std::string &simName) {
+    char *log_progress_export = getenv("LOG_PROGRESS");
+    if (!log_progress_export || strcmp(log_progress_export,"1") != 0) {
+        return NULL;
+    }
+
+    int progressFd = open((simName + ".progress").c_str(), O_RDWR | O_CREAT | O_TRUNC, 0644);
+    if (progressFd < 0) {
+        return NULL;
+    }
+
+    void *progress = MAP_FAILED;
+    if (ftruncate(progressFd, sizeof(double)) == 0) {
+        progress = mmap(NULL, sizeof(double), PROT_READ | PROT_WRITE, MAP_SHARED, progressFd, 0);
+    }
+    close(progressFd);
+
+    if (progress == MAP_FAILED) {
+        return NULL;
+    }
+    // a federate that is still initializing has not been granted any time yet
+    *static_cast<double*>(progress) = -1;
+    return static_cast<double*>(progress);
+}
+
+#endif
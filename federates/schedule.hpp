@@ -0,0 +1,36 @@
+/*
+==========================================================================================
+Copyright (C) 2019, Battelle Memorial Institute
+Written by Jacob Hansen, Pacific Northwest National Laboratory
+==========================================================================================
+*/
+#ifndef _SCHEDULE_HPP_
+#define _SCHEDULE_HPP_
+
+#include <string>
+#include <vector>
+#include <fstream>
+
+// a message of a replayed workload, the index is the publication (or endpoint) of the federate it is sent on
+struct scheduled_message {
+	double time;
+	int message;
+	int bytes;
+};
+
+// reads the "<name>.schedule" file of a replayed workload with a "<time> <message> <bytes>" line per message in time
+// order, returns false when the federate has no schedule and sends every message on every step instead
+inline bool read_schedule(const std::string &simName, std::vector<scheduled_message> &schedule) {
+	std::ifstream scheduleFile(simName + ".schedule");
+	if (!scheduleFile) {
+		return false;
+	}
+
+	scheduled_message entry;
+	while (scheduleFile >> entry.time >> entry.message >> entry.bytes) {
+		schedule.push_back(entry);
+	}
+	return true;
+}
+
+#endif
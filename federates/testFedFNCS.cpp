@@ -9,11 +9,13 @@ Written by Jacob Hansen, Pacific Northwest National Laboratory
 #include <vector>
 #include <iomanip>
 #include <algorithm>
+#include <chrono>
 #include <stdio.h>
 #include <string.h> 
 
 #include "fncs.hpp"
 #include "logging.hpp"
+#include "progress.hpp"
 
 using namespace std;
 
@@ -76,6 +78,11 @@ int main(int argc, const char *argv[]) {
 	} else if (strcmp(log_level_export,"DEBUG4") == 0) {
 		loglevel = logDEBUG4;
 	}
+
+	// Setting up the per step latency logging based on user input
+	char *log_latency_export = NULL;
+	log_latency_export = getenv("LOG_LATENCY");
+	bool logLatency = log_latency_export && strcmp(log_latency_export,"1") == 0;
 	
 	LINFO << "Running process -> " << argv[0] ;
 		
@@ -117,6 +124,15 @@ int main(int argc, const char *argv[]) {
 				
 		double currentTime = 0; //current time in seconds
 		double nextTime = 0; // next time in seconds
+
+		// work time and time request latency of every step, kept in memory so the main loop does not touch the disk
+		vector<float> stepTimes;
+		if (logLatency) {
+			stepTimes.reserve(2 * (size_t(simStopTime / deltaTime) + 2));
+		}
+
+		// heartbeat the test suite watches to tell a slow federation from a stuck one
+		double *progress = map_progress(simName);
 			
 		// Let's get a list of the subscriptions we have 
 		vector<string> subscription_keys = fncs::get_keys();
@@ -173,6 +189,7 @@ int main(int argc, const char *argv[]) {
 		initTimeWall = difftime(tStopWall, tStartWall);
 		tStart = clock();
 		tStartWall = time(NULL);
+		auto stepStart = chrono::steady_clock::now();
 
 		
     	do {
@@ -202,7 +219,17 @@ int main(int argc, const char *argv[]) {
 				nextTime = min(currentTime + deltaTime, simStopTime);
 			}
 
+			auto requestStart = chrono::steady_clock::now();
 			currentTime = fncs::time_request(nextTime);
+			auto requestStop = chrono::steady_clock::now();
+			if (progress) {
+				*progress = currentTime;
+			}
+			if (logLatency) {
+				stepTimes.push_back(chrono::duration<float>(requestStart - stepStart).count());
+				stepTimes.push_back(chrono::duration<float>(requestStop - requestStart).count());
+			}
+			stepStart = requestStop;
 		}
 		while(currentTime < simStopTime);
 
@@ -228,6 +255,12 @@ int main(int argc, const char *argv[]) {
 		LDEBUG << "Execution time [seconds]: " << executionTime;
 		LDEBUG << "Closing time [seconds]: " << closeTime;
 		
+		if (logLatency) {
+			// every federate writes its steps as pairs of 32 bit floats (work time, time request latency) in seconds
+			ofstream latencyLogging(simName + ".latency", ios::out | ios::binary);
+			latencyLogging.write(reinterpret_cast<const char*>(stepTimes.data()), stepTimes.size() * sizeof(float));
+		}
+
 		if (logTime) {
 			// adding in a file that collects data time execution
 			ofstream timeDataLogging("timeDataLogging.csv", ios::out);
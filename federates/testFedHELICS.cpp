@@ -6,15 +6,21 @@ Written by Jacob Hansen, Pacific Northwest National Laboratory
 */
 #include <iostream>
 #include <fstream>
+#include <sstream>
 #include <vector>
+#include <thread>
 #include <iomanip>
 #include <algorithm>
+#include <chrono>
 #include <stdio.h>
 #include <string.h> 
 
 #include "helics/helics.hpp"
 #include "helics/application_api/queryFunctions.hpp"
+#include "helics/core/BrokerFactory.hpp"
 #include "logging.hpp"
+#include "progress.hpp"
+#include "schedule.hpp"
 
 using namespace std;
 
@@ -39,7 +45,8 @@ string generate_random_string(int max_length){
 }
 
 
-int main(int argc, const char *argv[]) {
+// runs a single federate from its config file, the federates of a pack run it at the same time in their own threads
+int run_federate(const string &configString, int logTime, int simType, double simStopTime, double deltaTime, int messageSize, bool logLatency) {
 	// variable to keep track of the total time used
 	clock_t tStart = clock();
 	clock_t tStop;
@@ -54,65 +61,34 @@ int main(int argc, const char *argv[]) {
 	double closeTime;
 	double closeTimeWall;
 
-	// Setting up the logger based on user input
-	char *log_level_export = NULL;
-	log_level_export = getenv("LOG_LEVEL");
-	
-	if (!log_level_export) {
-		loglevel = logWARNING; 
-	} else if (strcmp(log_level_export,"ERROR") == 0) {
-		loglevel = logERROR;
-	} else if (strcmp(log_level_export,"WARNING") == 0) {
-		loglevel = logWARNING;
-	} else if (strcmp(log_level_export,"INFO") == 0) {
-		loglevel = logINFO;
-	} else if (strcmp(log_level_export,"DEBUG") == 0) {
-		loglevel = logDEBUG;
-	} else if (strcmp(log_level_export,"DEBUG1") == 0) {
-		loglevel = logDEBUG1;
-	} else if (strcmp(log_level_export,"DEBUG2") == 0) {
-		loglevel = logDEBUG2;
-	} else if (strcmp(log_level_export,"DEBUG3") == 0) {
-		loglevel = logDEBUG3;
-	} else if (strcmp(log_level_export,"DEBUG4") == 0) {
-		loglevel = logDEBUG4;
-	}
-	
-	LINFO << "Running process -> " << argv[0] ;
-		
 	// portion to initialize HELICS
 	LINFO << "Initializing HELICS federate";
 	// configuration file for federate
-	std::string configString = argv[1];
-	auto fed = std::make_unique<helics::ValueFederate> (configString);   	
+	// a combination federate so the same program runs the value and the endpoint (message) workloads
+	auto fed = std::make_unique<helics::CombinationFederate> (configString);   	
 
 	// determine simulator name
 	string simName = fed->getName();
 	LINFO << "Name of simulator is -> " << simName;	
 
 	try {	
-		int logTime; // federate type -> 0=false, 1=true
-		sscanf(argv[2], "%d%*s", &logTime);
 		LINFO << "Federate log time [0=false, 1=true]: " << logTime;
-
-		int simType; // federate type -> 0=echoer, 1=publisher
-		sscanf(argv[3], "%d%*s", &simType);
 		LINFO << "Federate type [0=echoer, 1=publisher]: " << simType;
-
-		double simStopTime; // simulation stop time
-		sscanf(argv[4], "%lf%*s", &simStopTime);
 		LINFO << "Simulation stop time [seconds]: " << simStopTime;
-		
-		double deltaTime; // simulation delta time
-		sscanf(argv[5], "%lf%*s", &deltaTime);
 		LINFO << "Delta time [seconds]: " << deltaTime;
-
-		int messageSize; // individual message size
-		sscanf(argv[6], "%d%*s", &messageSize);
 		LINFO << "Message size: " << messageSize;
 				
 		double currentTime = 0; //current time in seconds
 		double nextTime = 0; // next time in seconds
+
+		// work time and time request latency of every step, kept in memory so the main loop does not touch the disk
+		vector<float> stepTimes;
+		if (logLatency) {
+			stepTimes.reserve(2 * (size_t(simStopTime / deltaTime) + 2));
+		}
+
+		// heartbeat the test suite watches to tell a slow federation from a stuck one
+		double *progress = map_progress(simName);
 			
 		// Let's get a list of the subscriptions we have 
 		vector<string> subscription_keys;
@@ -161,6 +137,51 @@ int main(int argc, const char *argv[]) {
 				LDEBUG << "    " << publication_keys[i] << " -> " << publication_values[i];
 			}
 		}		
+
+		// the info of every endpoint lists the destinations it sends a message to each step, the echoer has no
+		// destinations and replies to the sender instead, a "tap" endpoint only receives the copies of a cloning filter
+		int endpointCount = fed->getEndpointCount();
+		vector<helics::Endpoint*> endpoint_ids;
+		vector<vector<string>> endpoint_destinations;
+		vector<bool> endpoint_taps;
+		for(int i = 0; i != endpointCount; i++) {
+			auto &endpoint = fed->getEndpoint(i);
+			vector<string> destinations;
+			stringstream infoStream(endpoint.getInfo());
+			string destination;
+			while (getline(infoStream, destination, ',')) {
+				if (!destination.empty()) {
+					destinations.push_back(destination);
+				}
+			}
+			const string &endpointName = endpoint.getName();
+			endpoint_ids.push_back(&endpoint);
+			endpoint_destinations.push_back(destinations);
+			endpoint_taps.push_back(endpointName.size() >= 4 && endpointName.compare(endpointName.size() - 4, 4, "/tap") == 0);
+		}
+		string message_payload = simType == 1 ? generate_random_string(messageSize) : "";
+
+		// a replayed workload sends the messages of the schedule file instead of every message on every step, the
+		// payloads are cut from one random string as long as the largest message
+		vector<scheduled_message> schedule;
+		bool replay = read_schedule(simName, schedule);
+		vector<scheduled_message>::size_type nextMessage = 0;
+		string replay_payload;
+		if (replay) {
+			int maxBytes = 0;
+			for (auto &entry : schedule) {
+				maxBytes = max(maxBytes, entry.bytes);
+			}
+			replay_payload = generate_random_string(maxBytes);
+			LINFO << "Replaying " << schedule.size() << " scheduled messages";
+		}
+
+		if (loglevel >= logDEBUG) {
+			LDEBUG << "Endpoints:";
+			for(vector<helics::Endpoint*>::size_type i = 0; i != endpoint_ids.size(); i++) {
+				LDEBUG << "    " << endpoint_ids[i]->getName() << " -> " << endpoint_destinations[i].size() << " destinations";
+			}
+		}
 		
 		// we are done with the setup, start the initialization
 	    LINFO << "federate entering init mode";
@@ -177,13 +198,55 @@ int main(int argc, const char *argv[]) {
 		initTimeWall = difftime(tStopWall, tStartWall);
 		tStart = clock();
 		tStartWall = time(NULL);
+		auto stepStart = chrono::steady_clock::now();
 
 		
     	do {
 			// update time
 			LINFO << "Current time = " << currentTime;
-	
-			if (currentTime == nextTime) {
+
+			// a message is read on the first grant after it arrives, which is not always the step it was sent in (with the delay
+			// interface the filter of the sending endpoint delivers it half an update interval late), so they are drained on every grant
+			for(vector<helics::Endpoint*>::size_type i = 0; i != endpoint_ids.size(); i++) {
+				while (endpoint_ids[i]->hasMessage()) {
+					auto message = endpoint_ids[i]->getMessage();
+					LDEBUG1 << "    " << endpoint_ids[i]->getName() << " <- " << message->original_source;
+					if (simType == 0 && endpoint_destinations[i].empty() && !endpoint_taps[i]) {
+						endpoint_ids[i]->send(message->original_source, message->data);
+					}
+				}
+			}
+
+			if (replay) {
+				// the subscriptions that were updated are read, and echoed back by the echoer as soon as they arrive
+				for(vector<double>::size_type i = 0; i != subscription_keys.size(); i++) {
+					if (subscription_ids[i].isUpdated()) {
+						subscription_values[i] = subscription_ids[i].getValue<string>();
+						LDEBUG1 << "    " << subscription_keys[i] << " -> " << subscription_values[i];
+						if (simType == 0 && i < publication_ids.size()) {
+							publication_ids[i].publish(subscription_values[i]);
+						}
+					}
+				}
+
+				// send the scheduled messages that are due
+				while (nextMessage < schedule.size() && schedule[nextMessage].time <= currentTime) {
+					const scheduled_message &entry = schedule[nextMessage++];
+					if (entry.message < int(publication_ids.size())) {
+						publication_ids[entry.message].publish(replay_payload.substr(0, entry.bytes));
+						LDEBUG1 << "    " << publication_keys[entry.message] << " -> " << entry.bytes << " bytes";
+					}
+					if (entry.message < int(endpoint_ids.size())) {
+						for(auto &destination : endpoint_destinations[entry.message]) {
+							endpoint_ids[entry.message]->send(destination, replay_payload.data(), entry.bytes);
+							LDEBUG1 << "    " << endpoint_ids[entry.message]->getName() << " -> " << destination;
+						}
+					}
+				}
+
+				// without messages left the federate waits for the end, it is still granted earlier whenever something arrives
+				nextTime = nextMessage < schedule.size() ? schedule[nextMessage].time : simStopTime;
+			} else if (currentTime == nextTime) {
 				// update subscriptions
 				LDEBUG << "Updated subscriptions:";
 				for(vector<double>::size_type i = 0; i != subscription_keys.size(); i++) {
@@ -203,10 +266,28 @@ int main(int argc, const char *argv[]) {
 					}	
 				}
 
+				// send messages
+				for(vector<helics::Endpoint*>::size_type i = 0; i != endpoint_ids.size(); i++) {
+					for(auto &destination : endpoint_destinations[i]) {
+						endpoint_ids[i]->send(destination, message_payload);
+						LDEBUG1 << "    " << endpoint_ids[i]->getName() << " -> " << destination;
+					}
+				}
+
 				nextTime = min(currentTime + deltaTime, simStopTime);
 			}
 
+			auto requestStart = chrono::steady_clock::now();
 			currentTime = fed->requestTime ((helics::Time) nextTime);
+			auto requestStop = chrono::steady_clock::now();
+			if (progress) {
+				*progress = currentTime;
+			}
+			if (logLatency) {
+				stepTimes.push_back(chrono::duration<float>(requestStart - stepStart).count());
+				stepTimes.push_back(chrono::duration<float>(requestStop - requestStart).count());
+			}
+			stepStart = requestStop;
 		}
 		while(currentTime < simStopTime);
 
@@ -220,7 +301,6 @@ int main(int argc, const char *argv[]) {
 
 		LINFO << "Terminating HELICS federate";
 		fed->finalize();
-		helics::cleanupHelicsLibrary();
 
 			// capture the time it took to close out
 		tStop = clock();
@@ -233,6 +313,12 @@ int main(int argc, const char *argv[]) {
 		LDEBUG << "Execution time [seconds]: " << executionTime;
 		LDEBUG << "Closing time [seconds]: " << closeTime;
 		
+		if (logLatency) {
+			// every federate writes its steps as pairs of 32 bit floats (work time, time request latency) in seconds
+			ofstream latencyLogging(simName + ".latency", ios::out | ios::binary);
+			latencyLogging.write(reinterpret_cast<const char*>(stepTimes.data()), stepTimes.size() * sizeof(float));
+		}
+
 		if (logTime) {
 			// adding in a file that collects data time execution
 			ofstream timeDataLogging("timeDataLogging.csv", ios::out);
@@ -249,7 +335,6 @@ int main(int argc, const char *argv[]) {
 		cerr << "Terminating program..." << endl;
         fed->error(-2, e.what());
         fed->finalize();
-		helics::cleanupHelicsLibrary();
         return -2;
   	}
     catch (...) {
@@ -257,9 +342,155 @@ int main(int argc, const char *argv[]) {
 		cerr << "Terminating program..." << endl;
         fed->error(-3, "Unknown and unexpected error thrown");
         fed->finalize();
-		helics::cleanupHelicsLibrary();
         return -3;
 	}	
 
 	return 0;
 }
+
+
+// runs every federate of a pack file as a thread of this process, each line of the pack is either
+// "<config> <log time> <federate type>" or "broker <arguments>" to start an in process broker for the federates
+int run_pack(const string &packString, double simStopTime, double deltaTime, int messageSize, bool logLatency) {
+	ifstream packFile(packString);
+	if (!packFile) {
+		LERROR << "not able to read specified pack file (" << packString << ")";
+		return -1;
+	}
+
+	vector<string> configs;
+	vector<int> logTimes;
+	vector<int> simTypes;
+	shared_ptr<helics::Broker> broker;
+	string line;
+	while (getline(packFile, line)) {
+		if (line.empty()) {
+			continue;
+		}
+		if (line.compare(0, 7, "broker ") == 0) {
+			LINFO << "Starting in process broker -> " << line.substr(7);
+			broker = helics::BrokerFactory::create(helics::core_type::INPROC, line.substr(7));
+			continue;
+		}
+		string config;
+		int logTime = 0;
+		int simType = 0;
+		stringstream lineStream(line);
+		lineStream >> config >> logTime >> simType;
+		configs.push_back(config);
+		logTimes.push_back(logTime);
+		simTypes.push_back(simType);
+	}
+	LINFO << "Running " << configs.size() << " federates in this process";
+
+	// the federates of a pack share the core named in their configs, so they have to run at the same time
+	vector<int> results(configs.size(), 0);
+	vector<thread> threads;
+	for (vector<string>::size_type i = 0; i != configs.size(); i++) {
+		threads.emplace_back([&, i]() {
+			try {
+				results[i] = run_federate(configs[i], logTimes[i], simTypes[i], simStopTime, deltaTime, messageSize, logLatency);
+			}
+			catch (const exception& e) {
+				LERROR << "Caught a standard exception in federate " << configs[i] << ", see below for details";
+				cerr << e.what() << endl;
+				results[i] = -2;
+			}
+		});
+	}
+	for (auto &federateThread : threads) {
+		federateThread.join();
+	}
+
+	if (broker) {
+		broker->disconnect();
+	}
+
+	// the first federate that failed decides the exit code of the process
+	for (auto federateResult : results) {
+		if (federateResult != 0) {
+			return federateResult;
+		}
+	}
+	return 0;
+}
+
+
+int main(int argc, const char *argv[]) {
+	// Setting up the logger based on user input
+	char *log_level_export = NULL;
+	log_level_export = getenv("LOG_LEVEL");
+	
+	if (!log_level_export) {
+		loglevel = logWARNING; 
+	} else if (strcmp(log_level_export,"ERROR") == 0) {
+		loglevel = logERROR;
+	} else if (strcmp(log_level_export,"WARNING") == 0) {
+		loglevel = logWARNING;
+	} else if (strcmp(log_level_export,"INFO") == 0) {
+		loglevel = logINFO;
+	} else if (strcmp(log_level_export,"DEBUG") == 0) {
+		loglevel = logDEBUG;
+	} else if (strcmp(log_level_export,"DEBUG1") == 0) {
+		loglevel = logDEBUG1;
+	} else if (strcmp(log_level_export,"DEBUG2") == 0) {
+		loglevel = logDEBUG2;
+	} else if (strcmp(log_level_export,"DEBUG3") == 0) {
+		loglevel = logDEBUG3;
+	} else if (strcmp(log_level_export,"DEBUG4") == 0) {
+		loglevel = logDEBUG4;
+	}
+
+	// Setting up the per step latency logging based on user input
+	char *log_latency_export = NULL;
+	log_latency_export = getenv("LOG_LATENCY");
+	bool logLatency = log_latency_export && strcmp(log_latency_export,"1") == 0;
+	
+	LINFO << "Running process -> " << argv[0] ;
+
+	std::string configString = argc > 1 ? argv[1] : "";
+	int result;
+	if (configString.size() > 5 && configString.compare(configString.size() - 5, 5, ".pack") == 0) {
+		// the arguments of a pack are <pack> <stop time> <delta time> <message size>
+		if (argc < 5) {
+			LERROR << "usage: " << argv[0] << " <pack> <stop time> <delta time> <message size>";
+			return -1;
+		}
+
+		double simStopTime; // simulation stop time
+		sscanf(argv[2], "%lf%*s", &simStopTime);
+
+		double deltaTime; // simulation delta time
+		sscanf(argv[3], "%lf%*s", &deltaTime);
+
+		int messageSize; // individual message size
+		sscanf(argv[4], "%d%*s", &messageSize);
+
+		result = run_pack(configString, simStopTime, deltaTime, messageSize, logLatency);
+	} else {
+		if (argc < 7) {
+			LERROR << "usage: " << argv[0] << " <config> <log time> <federate type> <stop time> <delta time> <message size>";
+			return -1;
+		}
+
+		int logTime; // federate type -> 0=false, 1=true
+		sscanf(argv[2], "%d%*s", &logTime);
+
+		int simType; // federate type -> 0=echoer, 1=publisher
+		sscanf(argv[3], "%d%*s", &simType);
+
+		double simStopTime; // simulation stop time
+		sscanf(argv[4], "%lf%*s", &simStopTime);
+
+		double deltaTime; // simulation delta time
+		sscanf(argv[5], "%lf%*s", &deltaTime);
+
+		int messageSize; // individual message size
+		sscanf(argv[6], "%d%*s", &messageSize);
+
+		result = run_federate(configString, logTime, simType, simStopTime, deltaTime, messageSize, logLatency);
+	}
+
+	helics::cleanupHelicsLibrary();
+	return result;
+}
@@ -0,0 +1,288 @@
+/*
+==========================================================================================
+Copyright (C) 2019, Battelle Memorial Institute
+Written by Jacob Hansen, Pacific Northwest National Laboratory
+==========================================================================================
+*/
+#include <iostream>
+#include <fstream>
+#include <sstream>
+#include <vector>
+#include <thread>
+#include <iomanip>
+#include <algorithm>
+#include <chrono>
+#include <stdio.h>
+#include <string.h>
+
+#include "logging.hpp"
+#include "progress.hpp"
+#include "schedule.hpp"
+#include "connection.hpp"
+
+using namespace std;
+
+// set the definition for the logger
+loglevel_e loglevel;
+
+/* ==================================================================================================================
+====================== MAIN PART ====================================================================================
+===================================================================================================================*/
+
+// runs a single stand-in federate from its config file, the federates of a pack run it at the same time in their own threads.
+// The federate tells the stand-in broker of its config when it is done, unless the broker runs in its own process (inproc)
+int run_federate(const string &configString, int logTime, int simType, double simStopTime, double deltaTime, int messageSize, bool logLatency, bool notifyBroker) {
+	// variable to keep track of the total time used
+	clock_t tStart = clock();
+	clock_t tStop;
+
+	time_t tStartWall = time(NULL);
+	time_t tStopWall;
+
+	double initTime;
+	double initTimeWall;
+	double executionTime;
+	double executionTimeWall;
+	double closeTime;
+	double closeTimeWall;
+
+	// the configuration file is read like a real federate would, the name of the simulator is the name of the file
+	ifstream configFile(configString);
+	if (!configFile) {
+		LERROR << "not able to read specified config file (" << configString << ")";
+		return -1;
+	}
+	stringstream configText;
+	configText << configFile.rdbuf();
+	string simName = configString.substr(0, configString.find_last_of('.'));
+	LINFO << "Name of simulator is -> " << simName;
+
+	LINFO << "Federate log time [0=false, 1=true]: " << logTime;
+	LINFO << "Federate type [0=echoer, 1=publisher]: " << simType;
+	LINFO << "Simulation stop time [seconds]: " << simStopTime;
+	LINFO << "Delta time [seconds]: " << deltaTime;
+	LINFO << "Message size: " << messageSize;
+
+	int brokerPort = config_broker_port(configText.str());
+
+	double currentTime = 0; //current time in seconds
+
+	// work time and time request latency of every step, kept in memory so the main loop does not touch the disk
+	vector<float> stepTimes;
+	if (logLatency) {
+		stepTimes.reserve(2 * (size_t(simStopTime / deltaTime) + 2));
+	}
+
+	// heartbeat the test suite watches to tell a slow federation from a stuck one
+	double *progress = map_progress(simName);
+
+	// a replayed workload is only granted the times of its scheduled messages
+	vector<scheduled_message> schedule;
+	bool replay = read_schedule(simName, schedule);
+	vector<scheduled_message>::size_type nextMessage = 0;
+
+	// capture the time it took to initialize
+	tStop = clock();
+	tStopWall = time(NULL);
+	initTime = double(tStop - tStart) / CLOCKS_PER_SEC;
+	initTimeWall = difftime(tStopWall, tStartWall);
+	tStart = clock();
+	tStartWall = time(NULL);
+	auto stepStart = chrono::steady_clock::now();
+
+	// every time request is granted right away
+	do {
+		LINFO << "Current time = " << currentTime;
+		auto requestStart = chrono::steady_clock::now();
+		if (replay) {
+			while (nextMessage < schedule.size() && schedule[nextMessage].time <= currentTime) {
+				nextMessage++;
+			}
+			currentTime = nextMessage < schedule.size() ? schedule[nextMessage].time : simStopTime;
+		} else {
+			currentTime = min(currentTime + deltaTime, simStopTime);
+		}
+		auto requestStop = chrono::steady_clock::now();
+		if (progress) {
+			*progress = currentTime;
+		}
+		if (logLatency) {
+			stepTimes.push_back(chrono::duration<float>(requestStart - stepStart).count());
+			stepTimes.push_back(chrono::duration<float>(requestStop - requestStart).count());
+		}
+		stepStart = requestStop;
+	}
+	while(currentTime < simStopTime);
+
+	// capture the time it took to execute main loop
+	tStop = clock();
+	tStopWall = time(NULL);
+	executionTime = double(tStop - tStart) / CLOCKS_PER_SEC;
+	executionTimeWall = difftime(tStopWall, tStartWall);
+	tStart = clock();
+	tStartWall = time(NULL);
+
+	LINFO << "Terminating stand-in federate";
+	if (notifyBroker && !notify_broker(brokerPort)) {
+		LERROR << "not able to reach the broker on port " << brokerPort;
+		return -1;
+	}
+
+	// capture the time it took to close out
+	tStop = clock();
+	tStopWall = time(NULL);
+	closeTime = double(tStop - tStart) / CLOCKS_PER_SEC;
+	closeTimeWall = difftime(tStopWall, tStartWall);
+
+	LDEBUG << "Initialization time [seconds]: " << initTime;
+	LDEBUG << "Execution time [seconds]: " << executionTime;
+	LDEBUG << "Closing time [seconds]: " << closeTime;
+
+	if (logLatency) {
+		// every federate writes its steps as pairs of 32 bit floats (work time, time request latency) in seconds
+		ofstream latencyLogging(simName + ".latency", ios::out | ios::binary);
+		latencyLogging.write(reinterpret_cast<const char*>(stepTimes.data()), stepTimes.size() * sizeof(float));
+	}
+
+	if (logTime) {
+		// adding in a file that collects data time execution
+		ofstream timeDataLogging("timeDataLogging.csv", ios::out);
+		// creating the beginning of the header for the file
+		timeDataLogging << "Initialization time,Execution time,Closing time" << endl;
+		timeDataLogging << std::fixed << std::setprecision(4) << initTime << "," << executionTime << "," << closeTime << endl;
+		timeDataLogging << std::fixed << std::setprecision(4) << initTimeWall << "," << executionTimeWall << "," << closeTimeWall << endl;
+	}
+
+	return 0;
+}
+
+// runs every federate of a pack file as a thread of this process like testFedHELICS does, the in process broker of a
+// pack is skipped and its federates then have no broker to report to
+int run_pack(const string &packString, double simStopTime, double deltaTime, int messageSize, bool logLatency) {
+	ifstream packFile(packString);
+	if (!packFile) {
+		LERROR << "not able to read specified pack file (" << packString << ")";
+		return -1;
+	}
+
+	vector<string> configs;
+	vector<int> logTimes;
+	vector<int> simTypes;
+	bool inprocBroker = false;
+	string line;
+	while (getline(packFile, line)) {
+		if (line.compare(0, 7, "broker ") == 0) {
+			inprocBroker = true;
+			continue;
+		}
+		if (line.empty()) {
+			continue;
+		}
+		string config;
+		int logTime = 0;
+		int simType = 0;
+		stringstream lineStream(line);
+		lineStream >> config >> logTime >> simType;
+		configs.push_back(config);
+		logTimes.push_back(logTime);
+		simTypes.push_back(simType);
+	}
+	LINFO << "Running " << configs.size() << " federates in this process";
+
+	vector<int> results(configs.size(), 0);
+	vector<thread> threads;
+	for (vector<string>::size_type i = 0; i != configs.size(); i++) {
+		threads.emplace_back([&, i]() {
+			results[i] = run_federate(configs[i], logTimes[i], simTypes[i], simStopTime, deltaTime, messageSize, logLatency, !inprocBroker);
+		});
+	}
+	for (auto &federateThread : threads) {
+		federateThread.join();
+	}
+
+	// the first federate that failed decides the exit code of the process
+	for (auto federateResult : results) {
+		if (federateResult != 0) {
+			return federateResult;
+		}
+	}
+	return 0;
+}
+
+
+// stand-in federate that honours the command line contract of testFedHELICS and testFedFNCS without talking to the
+// other federates, it is used to measure the overhead of the test suite itself
+int main(int argc, const char *argv[]) {
+	// Setting up the logger based on user input
+	char *log_level_export = NULL;
+	log_level_export = getenv("LOG_LEVEL");
+
+	if (!log_level_export) {
+		loglevel = logWARNING;
+	} else if (strcmp(log_level_export,"ERROR") == 0) {
+		loglevel = logERROR;
+	} else if (strcmp(log_level_export,"WARNING") == 0) {
+		loglevel = logWARNING;
+	} else if (strcmp(log_level_export,"INFO") == 0) {
+		loglevel = logINFO;
+	} else if (strcmp(log_level_export,"DEBUG") == 0) {
+		loglevel = logDEBUG;
+	} else if (strcmp(log_level_export,"DEBUG1") == 0) {
+		loglevel = logDEBUG1;
+	} else if (strcmp(log_level_export,"DEBUG2") == 0) {
+		loglevel = logDEBUG2;
+	} else if (strcmp(log_level_export,"DEBUG3") == 0) {
+		loglevel = logDEBUG3;
+	} else if (strcmp(log_level_export,"DEBUG4") == 0) {
+		loglevel = logDEBUG4;
+	}
+
+	// Setting up the per step latency logging based on user input
+	char *log_latency_export = NULL;
+	log_latency_export = getenv("LOG_LATENCY");
+	bool logLatency = log_latency_export && strcmp(log_latency_export,"1") == 0;
+
+	LINFO << "Running process -> " << argv[0] ;
+
+	std::string configString = argc > 1 ? argv[1] : "";
+	if (configString.size() > 5 && configString.compare(configString.size() - 5, 5, ".pack") == 0) {
+		// the arguments of a pack are <pack> <stop time> <delta time> <message size>
+		if (argc < 5) {
+			LERROR << "usage: " << argv[0] << " <pack> <stop time> <delta time> <message size>";
+			return -1;
+		}
+
+		double simStopTime; // simulation stop time
+		sscanf(argv[2], "%lf%*s", &simStopTime);
+
+		double deltaTime; // simulation delta time
+		sscanf(argv[3], "%lf%*s", &deltaTime);
+
+		int messageSize; // individual message size
+		sscanf(argv[4], "%d%*s", &messageSize);
+
+		return run_pack(configString, simStopTime, deltaTime, messageSize, logLatency);
+	}
+
+	if (argc < 7) {
+		LERROR << "usage: " << argv[0] << " <config> <log time> <federate type> <stop time> <delta time> <message size>";
+		return -1;
+	}
+
+	int logTime; // federate type -> 0=false, 1=true
+	sscanf(argv[2], "%d%*s", &logTime);
+
+	int simType; // federate type -> 0=echoer, 1=publisher
+	sscanf(argv[3], "%d%*s", &simType);
+
+	double simStopTime; // simulation stop time
+	sscanf(argv[4], "%lf%*s", &simStopTime);
+
+	double deltaTime; // simulation delta time
+	sscanf(argv[5], "%lf%*s", &deltaTime);
+
+	int messageSize; // individual message size
+	sscanf(argv[6], "%d%*s", &messageSize);
+
+	return run_federate(configString, logTime, simType, simStopTime, deltaTime, messageSize, logLatency, true);
+}
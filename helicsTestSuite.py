@@ -12,15 +12,111 @@ able to test both FNCS and HELICS
 # Government, including the right to distribute to other Government contractors.
 ##################################################################################################################
 
-import os, json, yaml, shutil, subprocess, time, random
-from yaml import CDumper as Dumper
+import os, re, json, shutil, subprocess, time, random, signal, queue, hashlib, threading, argparse, itertools, select, socket, platform, uuid, math, sys, gzip, tempfile, resource
+import importlib.util
 from pathlib import Path
-import pandas as pd
-from termcolor import colored
-import numpy as np
-import matplotlib.pyplot as plt
 
 
+def lazy_import(name):
+    """
+    This function imports a module that is only loaded the first time one of its attributes is used. Generating configs
+    or printing the help does not need numpy or pandas, and importing them up front takes most of a second
+    
+    Inputs
+        name - name of the module
+
+    Outputs
+        module - the module, loaded on first use
+    """
+
+    # a module that is already imported (e.g. by the script that imports the test suite) is used as it is, loading it
+    # again would leave two copies of it around
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.find_spec(name)
+    spec.loader = importlib.util.LazyLoader(spec.loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+# the heavy imports (numpy, pandas, matplotlib, yaml, termcolor, the thread pool, and the worker connections) are deferred
+# to where they are used so the script starts fast
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+
+# timing results of an experiment (the federate that logs time and the launcher), these are aggregated over the trials of an experiment
+TIME_COLUMNS = ['initialization time (cpu)','execution time (cpu)','closing time (cpu)','initialization time (wall)','execution time (wall)','closing time (wall)','spawn time (wall)','launch time (wall)']
+
+# resource usage results of an experiment, aggregated over the trials of an experiment like the timing results
+RESOURCE_COLUMNS = ['broker cpu time (s)','broker peak rss (MB)','broker cpu max (%)','broker threads max','federate cpu time (s)','federate peak rss max (MB)','federate peak rss total (MB)','voluntary context switches','involuntary context switches','open fds max']
+
+# time request latency results of an experiment from the per step logs of every federate, aggregated like the timing results
+LATENCY_COLUMNS = ['grant latency p50 (s)','grant latency p90 (s)','grant latency p99 (s)','grant latency max (s)','straggler work time (s)','main loop time (s)']
+
+# throughput of an experiment derived from its workload and the main loop time, aggregated like the timing results
+THROUGHPUT_COLUMNS = ['messages per second','payload bytes per second','time steps per second']
+
+# environment the experiments ran in, recorded with every trial in the results store
+ENVIRONMENT_COLUMNS = ['host','cpu model','cores','kernel','helics version','fncs version','git revision']
+
+# log output of an experiment (the log files of the broker and federates), aggregated like the timing results
+LOG_COLUMNS = ['log bytes total','log bytes per process','log bytes max','truncated logs']
+
+# hardware and software counters perf stat collects for the profiled processes of an experiment
+PERF_EVENTS = ['cycles','instructions','context-switches','cache-misses']
+
+# counters of the profiled processes, summed over the brokers and averaged over the profiled federate processes, aggregated like the timing results
+PROFILE_COLUMNS = ['broker cycles','broker instructions','broker instructions per cycle','broker context switches','broker cache misses','federate cycles','federate instructions','federate instructions per cycle','federate context switches','federate cache misses','profiled federates']
+
+# experiment parameters that make up the experiment hash
+PARAMETER_COLUMNS = ['co-simulation platform','experiment type','core type','federates','messages','bytes','update interval','simulation time','log level','log files','uninterruptible','core tick','core timeout','simulation timeout','broker fan out','placement','topology','cpu placement','federate processes','interface','workload','profile']
+
+# every trial in the results store has the full set of parameters, its results, and the environment it ran in
+STORE_COLUMNS = ['recorded','sweep','experiment hash','trial','outlier','status'] + PARAMETER_COLUMNS + ['launcher'] + TIME_COLUMNS + RESOURCE_COLUMNS + LATENCY_COLUMNS + THROUGHPUT_COLUMNS + LOG_COLUMNS + PROFILE_COLUMNS + ['straggler','failed process','exit code','signal','stalled','timeout (s)'] + ENVIRONMENT_COLUMNS
+
+# results the regression gate compares by default, larger is worse for all of them
+GATE_METRICS = TIME_COLUMNS[:6] + RESOURCE_COLUMNS + LATENCY_COLUMNS[:4]
+
+# stages of the test suite itself timed by the harness benchmark, these are compared when two harness benchmarks are gated
+HARNESS_COLUMNS = ['config generation (wall)','spawn time (wall)','launch time (wall)','result parsing (wall)','settle time (wall)','run experiment (wall)']
+
+# first port of a broker hierarchy when no broker port is given, clear of the HELICS default ports
+HIERARCHY_PORT = 30000
+
+# settings of the sweep that runs without a sweep spec, a spec only lists what differs from these (see load_sweep_spec)
+SWEEP_DEFAULTS = {'outFolder': 'test_HELICS', 'federateNumber': [100, 200], 'messageNumber': [1, 10], 'bytesNumber': [1, 10], 'coreType': ['zmq', 'tcp'],
+                  'updateInterval': 10., 'simTime': 100., 'logLevel': 'INFO', 'logFiles': True, 'uninterruptible': False, 'coreTick': '30s',
+                  'coreTimeout': '30s', 'simulationTimeout': 120, 'coSimPlatform': 'HELICS', 'experimentType': 'ManyToOne', 'workers': 1,
+                  'coresPerExperiment': None, 'repeats': 1, 'adaptive': False, 'resultsStore': 'results_store', 'brokerFanOut': None, 'topology': None}
+
+# settings a sweep spec can sweep over, in the order run_search nests them
+SWEEP_AXES = ['federateNumber', 'messageNumber', 'bytesNumber', 'coreType']
+
+# comparisons an exclude rule of a sweep spec can make between an axis and a value
+EXCLUDE_OPERATORS = {'==': lambda value, limit: value == limit, '!=': lambda value, limit: value != limit, '<': lambda value, limit: value < limit,
+                     '<=': lambda value, limit: value <= limit, '>': lambda value, limit: value > limit, '>=': lambda value, limit: value >= limit,
+                     'in': lambda value, limit: value in limit, 'not in': lambda value, limit: value not in limit}
+
+# ways the federates exchange data, values are publications and subscriptions, the others send messages between
+# endpoints, either directly or through a delay filter or a cloning filter that copies every message to a tap endpoint
+INTERFACES = ['value', 'endpoint', 'delay', 'clone']
+
+# clock ticks per second used for the cpu times in /proc
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK')
+
+# templates for the entries that are repeated for every publication and subscription in the generated configs
+HELICS_SUBSCRIPTION = '{"key":"%s","type":"string","unit":"#","required":true}'
+HELICS_PUBLICATION = '{"key":"%s","type":"string","unit":"#","global":false}'
+# the info of an endpoint lists the destinations the federate sends a message to every step
+HELICS_ENDPOINT = '{"name":"%s","global":false,"info":"%s"}'
+HELICS_DELAY_FILTER = '{"name":"%s","sourcetargets":["%s"],"operation":"delay","properties":{"name":"delay","value":%s}}'
+HELICS_CLONE_FILTER = '{"name":"%s","sourcetargets":["%s"],"delivery":[%s],"operation":"clone","cloning":true}'
+FNCS_VALUE = "    %s:\n        default: ''\n        list: false\n        topic: %s\n        type: string\n"
+
 def log_level_int(log_level):
     """
     This function returns the integer log level from a string. Used for compatibility across HELICS and FNCS
@@ -42,13 +138,235 @@ def log_level_int(log_level):
         return 2
 
 
-def write_launch_script(outFolder, logLevel, federateNumber, simTime, updateInterval, bytesNumber, coreTick, coreTimeout, coreType, coSim, typeSim):
+def broker_hierarchy(federateNames, brokerFanOut, placement='block', brokerPort=None):
+    """
+    This function lays out a tree of HELICS brokers and places the federates on its leaves. The root broker is at the
+    top, every level below it multiplies the number of brokers by its fan out, and every broker gets its own port plus a
+    range of ports for the cores it assigns ports to
+    
+    Inputs
+        federateNames - list of the federate names in the federation
+        brokerFanOut - list with the number of children of the brokers on each level, e.g. [4] for a root with 4
+            sub-brokers or [2, 4] for a root with 2 sub-brokers that have 4 sub-brokers each
+        placement - block to give each leaf broker a contiguous range of federates (ring neighbours mostly share a broker)
+            or roundrobin to deal the federates out over the leaf brokers (ring neighbours are on different brokers)
+        brokerPort - port of the root broker, the other brokers and cores use the ports after it (None uses HIERARCHY_PORT)
+
+    Outputs
+        brokers - list of dictionaries with the name, port, parent port, port start, number of children, and number of
+            federates below each broker, parents before their children
+        federatePorts - dictionary of federate name -> port of the leaf broker it connects to
+    """
+
+    if not brokerFanOut or min(brokerFanOut) < 1:
+        raise Exception('every level of the broker hierarchy needs at least one broker')
+
+    # levels of the tree, the root broker is the only one on the first level
+    levels = [[{'name': 'broker', 'parent': None}]]
+    for level, fanOut in enumerate(brokerFanOut):
+        children = []
+        for parent in levels[-1]:
+            parent['children'] = fanOut
+            for _ in range(0, fanOut):
+                children.append({'name': 'broker_' + str(level+1) + '_' + str(len(children)), 'parent': parent})
+        levels.append(children)
+    leaves = levels[-1]
+    for leaf in leaves:
+        leaf['children'] = 0
+
+    if len(leaves) > len(federateNames):
+        raise Exception('broker hierarchy has more leaf brokers (' + str(len(leaves)) + ') than federates (' + str(len(federateNames)) + ')')
+
+    if placement == 'block':
+        assignment = np.repeat(np.arange(len(leaves)), [len(chunk) for chunk in np.array_split(np.arange(len(federateNames)), len(leaves))])
+    elif placement == 'roundrobin':
+        assignment = np.arange(len(federateNames)) % len(leaves)
+    else:
+        raise Exception('unknown federate placement specified (' + str(placement) + ')')
+
+    brokers = [broker for level in levels for broker in level]
+    for broker in brokers:
+        broker['federates'] = 0
+    for leafIdx in assignment:
+        broker = leaves[leafIdx]
+        while broker is not None:
+            broker['federates'] += 1
+            broker = broker['parent']
+
+    # the brokers take the ports right after the root, each leaf then gets a range for the cores of its federates
+    basePort = brokerPort if brokerPort is not None else HIERARCHY_PORT
+    nextPort = basePort
+    for broker in brokers:
+        broker['port'] = nextPort
+        nextPort += 1
+    for broker in brokers:
+        broker['portStart'] = None
+        if broker['children'] == 0:
+            broker['portStart'] = nextPort
+            nextPort += 2 * broker['federates'] + 4
+
+    federatePorts = {name: leaves[leafIdx]['port'] for name, leafIdx in zip(federateNames, assignment)}
+    brokers = [{'name': broker['name'], 'port': broker['port'], 'parent': broker['parent']['port'] if broker['parent'] is not None else None,
+                'portStart': broker['portStart'], 'children': broker['children'], 'federates': broker['federates']} for broker in brokers]
+
+    return brokers, federatePorts
+
+
+def pack_federates(federateNames, federateProcesses, federatePorts=None):
+    """
+    This function packs the federates of an experiment into processes that run them as threads and share a core. The
+    federates are split into contiguous blocks, and with a broker hierarchy a process only gets federates of one leaf
+    broker as its core connects to a single broker. Every leaf broker gets processes in proportion to its federates
+    
+    Inputs
+        federateNames - list of the federate names in launch order
+        federateProcesses - number of processes to pack the federates into (more than the federates gives every
+            federate its own process)
+        federatePorts - dictionary of federate name -> port of the leaf broker it connects to (None for a single broker)
+
+    Outputs
+        packs - list with the names of the federates of every process
+    """
+
+    if federateProcesses < 1:
+        raise Exception('at least one process is needed to pack the federates into')
+    federateProcesses = min(federateProcesses, len(federateNames))
+
+    groups = dict()
+    for name in federateNames:
+        groups.setdefault(None if federatePorts is None else federatePorts[name], []).append(name)
+    groups = list(groups.values())
+    if len(groups) > federateProcesses:
+        raise Exception('the federates of ' + str(len(groups)) + ' leaf brokers can not be packed into ' + str(federateProcesses) + ' processes')
+
+    # every group gets a process, the rest go one at a time to the group with the most federates per process
+    counts = [1] * len(groups)
+    for _ in range(len(groups), federateProcesses):
+        groupIdx = max(range(0, len(groups)), key=lambda idx: len(groups[idx]) / counts[idx])
+        counts[groupIdx] += 1
+
+    packs = []
+    for group, count in zip(groups, counts):
+        packs += [[group[idx] for idx in chunk] for chunk in np.array_split(np.arange(len(group)), count)]
+
+    return packs
+
+
+def launch_processes(logLevel, logFiles, federateNumber, simTime, updateInterval, bytesNumber, coreTick, coreTimeout, coreType, coSim, typeSim, brokerPort=None, brokers=None, packs=None):
+    """
+    This function lists the processes that make up an experiment, the broker first and then every federate
+    
+    Inputs
+        logLevel - log level for the federates
+        logFiles - flag to determine if log files are created
+        federateNumber - number of federates in the federation
+        simTime - total simulation time
+        updateInterval - interval between sending messages
+        bytesNumber - number of bytes in each message 
+        coreTick - HELICS setting for federates
+        coreTimeout - HELICS setting for federates
+        coreType - HELICS setting for federates
+        coSim - FNCS, HELICS, or NOOP (stand-in broker and federates that only report to the broker when they are done)
+        typeSim - either ManyToOne or Meshed
+        brokerPort - port the broker listens on (None uses the platform default)
+        brokers - HELICS or NOOP broker hierarchy from broker_hierarchy (None for a single broker)
+        packs - list with the names of the federates every federate process runs, see pack_federates (None for a process
+            per federate)
+
+    Outputs
+        list of dictionaries with the name, command, extra environment, and log file (None for no log) of each process,
+            packed processes also have the lines of their pack file
+    """
+
+    if typeSim == 'ManyToOne':
+        brokerFederates = federateNumber+1
+    else:
+        brokerFederates = federateNumber
+
+    brokerEnv = dict()
+    if coSim == 'FNCS':
+        broker = ['fncs_broker', str(brokerFederates)]
+        # the FNCS broker picks its endpoint up from the environment, only the broker gets it so the federates use their config
+        if brokerPort is not None:
+            brokerEnv['FNCS_BROKER'] = 'tcp://*:' + str(brokerPort)
+        federate, extension = 'testFedFNCS', '.yaml'
+    elif coSim == 'NOOP':
+        # the stand-ins take the HELICS configs and command line but never connect to each other, the federates only tell
+        # the broker when they are done
+        broker = ['noop_broker', '--federates=' + str(brokerFederates)]
+        if brokerPort is not None:
+            broker += ['--port=' + str(brokerPort)]
+        federate, extension = 'testFedNoop', '.json'
+    else:
+        broker = ['helics_broker', '--federates=' + str(brokerFederates), '--tick=' + str(coreTick), '--timeout=' + str(coreTimeout), '--log_level=' + str(log_level_int(logLevel)), '--coretype=' + str(coreType)]
+        if brokerPort is not None:
+            # automatic port assignments for the cores start right after the broker port so concurrent experiments do not overlap
+            broker += ['--port=' + str(brokerPort), '--portstart=' + str(brokerPort+1)]
+        federate, extension = 'testFedHELICS', '.json'
+
+    processes = [{'name': 'broker', 'command': broker, 'env': brokerEnv, 'log': 'broker.out' if logFiles else None}]
+
+    # a hierarchy replaces the single broker, every broker only waits for the federates and brokers below it
+    if brokers is not None:
+        if coSim == 'FNCS':
+            raise Exception('broker hierarchies are only supported by HELICS and NOOP')
+        processes = []
+        for node in brokers:
+            command = [broker[0], '--federates=' + str(node['federates']), '--tick=' + str(coreTick), '--timeout=' + str(coreTimeout), '--log_level=' + str(log_level_int(logLevel)), '--coretype=' + str(coreType), '--port=' + str(node['port'])]
+            if node['children'] > 0:
+                command.append('--minbrokers=' + str(node['children']))
+            if node['parent'] is not None:
+                command.append('--brokerport=' + str(node['parent']))
+            if node['portStart'] is not None:
+                command.append('--portstart=' + str(node['portStart']))
+            processes.append({'name': node['name'], 'command': command, 'env': dict(), 'log': node['name'] + '.out' if logFiles else None})
+
+    # the arguments are <config> <log time> <federate type> <stop time> <delta time> <message size>
+    if typeSim == 'ManyToOne':
+        federates = [('echo', 1, 0)] + [('send' + str(i), 0, 1) for i in range(0, federateNumber)]
+    else:
+        federates = [('fed' + str(i), 1 if i == 0 else 0, 1) for i in range(0, federateNumber)]
+    if packs is None:
+        for name, logTime, simType in federates:
+            processes.append({'name': name,
+                              'command': [federate, name + extension, str(logTime), str(simType), str(simTime), str(updateInterval), str(bytesNumber)],
+                              'env': dict(),
+                              'log': name + '.out' if logFiles else None})
+        return processes
+
+    if coSim == 'FNCS':
+        raise Exception('packing federates into processes is only supported by HELICS')
+
+    # a packed process runs the federates listed in its pack file, the arguments are <pack> <stop time> <delta time> <message size>
+    federateArgs = {name: (logTime, simType) for name, logTime, simType in federates}
+    packProcesses = []
+    for packIdx, pack in enumerate(packs):
+        name = 'pack' + str(packIdx)
+        packProcesses.append({'name': name,
+                              'command': [federate, name + '.pack', str(simTime), str(updateInterval), str(bytesNumber)],
+                              'env': dict(),
+                              'log': name + '.out' if logFiles else None,
+                              'pack': [fed + extension + ' ' + str(federateArgs[fed][0]) + ' ' + str(federateArgs[fed][1]) for fed in pack]})
+
+    # inproc cores only reach a broker in their own process, so the broker moves into the single federate process
+    if coreType == 'inproc':
+        if len(packs) != 1 or brokers is not None:
+            raise Exception('an inproc core needs every federate packed into a single process with a single broker')
+        packProcesses[0]['pack'].insert(0, 'broker --federates=' + str(brokerFederates) + ' --tick=' + str(coreTick) + ' --timeout=' + str(coreTimeout) + ' --log_level=' + str(log_level_int(logLevel)))
+        processes = []
+
+    return processes + packProcesses
+
+
+def write_launch_script(outFolder, logLevel, logFiles, federateNumber, simTime, updateInterval, bytesNumber, coreTick, coreTimeout, coreType, coSim, typeSim, brokerPort=None, brokers=None, messagesPerStep=None, packs=None, replayTotals=None):
     """
-    This function writes a launch script for the experiment to disk
+    This function writes the launch manifest (launch.json) used by launch_experiment and a launch script (run.sh) that
+    can be used to reproduce the experiment by hand to disk
     
     Inputs
         outFolder - Folder that the experiment was created in
         logLevel - log level for the federates
+        logFiles - flag to determine if log files are created
         federateNumber - number of federates in the federation
         simTime - total simulation time
         updateInterval - interval between sending messages
@@ -56,13 +374,34 @@ def write_launch_script(outFolder, logLevel, federateNumber, simTime, updateInte
         coreTick - HELICS setting for federates
         coreTimeout - HELICS setting for federates
         coreType - HELICS setting for federates
-        coSim - either FNCS or HELICS
+        coSim - FNCS, HELICS, or NOOP (stand-in broker and federates that only report to the broker when they are done)
         typeSim - either ManyToOne or Meshed
+        brokerPort - port the broker listens on (None uses the platform default)
+        brokers - HELICS or NOOP broker hierarchy from broker_hierarchy (None for a single broker)
+        messagesPerStep - number of messages delivered to subscribers in every time step, used for the throughput results
+        packs - list with the names of the federates every federate process runs, see pack_federates (None for a process
+            per federate)
+        replayTotals - dictionary with the messages and payload bytes delivered over a replayed workload, used for the
+            throughput results instead of the messages per step (None when every message is sent on every step)
 
     Outputs
         None
     """ 
 
+    processes = launch_processes(logLevel, logFiles, federateNumber, simTime, updateInterval, bytesNumber, coreTick, coreTimeout, coreType, coSim, typeSim, brokerPort, brokers, packs)
+
+    # every packed process reads the federates it runs from its pack file
+    for process in processes:
+        if 'pack' in process:
+            with open(outFolder / process['command'][1], 'w') as outfile:
+                outfile.write('\n'.join(process['pack']) + '\n')
+
+    workload = {'messages per step': messagesPerStep, 'bytes': bytesNumber, 'steps': math.ceil(simTime / updateInterval)}
+    if replayTotals is not None:
+        workload.update(replayTotals)
+    with open(outFolder / 'launch.json', 'w') as outfile:
+        json.dump({'env': {'LOG_LEVEL': logLevel}, 'processes': processes, 'workload': workload}, outfile, separators=(',', ':'))
+
         # create launch script
     file = open(outFolder / 'run.sh', "w")
     file.write('#!/bin/bash\n\n')
@@ -70,11 +409,12 @@ def write_launch_script(outFolder, logLevel, federateNumber, simTime, updateInte
     file.write('set -m\n\n')
 
     file.write('catchFailures() {\n')
-    file.write('    rv=`jobs -n | grep -v \'Running \\| Done\'`\n')
+    file.write('    rv=`jobs -ln | grep -v \'Running \\| Done\'`\n')
     file.write('    if [ ! -z "$rv" ]\n')
     file.write('    then\n')
     file.write('        echo "found an error"\n')
     file.write('        echo "$rv"\n')
+    file.write('        echo "$rv" > failures.out\n')
     file.write('        kill $( jobs -p ) > /dev/null 2>&1\n')
     file.write('        exit 1\n')
     file.write('    fi\n')
@@ -84,55 +424,14 @@ def write_launch_script(outFolder, logLevel, federateNumber, simTime, updateInte
 
     file.write('export LOG_LEVEL=%s\n\n' %(logLevel))
 
-    if coSim == 'FNCS':
-        if typeSim == 'ManyToOne':
-            file.write('fncs_broker %s' %(federateNumber+1))
-        else:
-            file.write('fncs_broker %s' %(federateNumber))
-    else:
-        if typeSim == 'ManyToOne':
-            file.write('helics_broker --federates=%s --tick=%s --timeout=%s --log_level=%s --coretype=%s' %(federateNumber+1, coreTick, coreTimeout, log_level_int(logLevel), coreType))  
-        else:
-            file.write('helics_broker --federates=%s --tick=%s --timeout=%s --log_level=%s --coretype=%s' %(federateNumber, coreTick, coreTimeout, log_level_int(logLevel), coreType))  
-    if logFiles:
-        file.write(' &> broker.out &\n')
-    else:
-        file.write(' > /dev/null 2>&1 &\n')
-    
-    if typeSim == 'ManyToOne':
-        if coSim == 'FNCS':
-            file.write('testFedFNCS echo.yaml %s %s %s %s %s' %(1, 0, simTime, updateInterval, bytesNumber))
-        else:
-            file.write('testFedHELICS echo.json %s %s %s %s %s' %(1, 0, simTime, updateInterval, bytesNumber))
-        if logFiles:
-            file.write(' &> echo.out &\n')
+    for process in processes:
+        for key, value in process['env'].items():
+            file.write('%s="%s" ' %(key, value))
+        file.write(' '.join(process['command']))
+        if process['log'] is not None:
+            file.write(' &> %s &\n' %(process['log']))
         else:
             file.write(' > /dev/null 2>&1 &\n')
-        for i in range (0, federateNumber):
-            if coSim == 'FNCS':
-                file.write('testFedFNCS send%s.yaml %s %s %s %s %s' %(i, 0, 1, simTime, updateInterval, bytesNumber))
-            else:
-                file.write('testFedHELICS send%s.json %s %s %s %s %s' %(i, 0, 1, simTime, updateInterval, bytesNumber))      
-            if logFiles:
-                file.write(' &> send%s.out &\n' %(i))
-            else:
-                file.write(' > /dev/null 2>&1 &\n')
-    else:
-        for i in range (0, federateNumber):
-            if coSim == 'FNCS':
-                if i == 0:
-                    file.write('testFedFNCS fed%s.yaml %s %s %s %s %s' %(i, 1, 1, simTime, updateInterval, bytesNumber))
-                else:
-                    file.write('testFedFNCS fed%s.yaml %s %s %s %s %s' %(i, 0, 1, simTime, updateInterval, bytesNumber))
-            else:
-                if i == 0:
-                    file.write('testFedHELICS fed%s.json %s %s %s %s %s' %(i, 1, 1, simTime, updateInterval, bytesNumber))
-                else:
-                    file.write('testFedHELICS fed%s.json %s %s %s %s %s' %(i, 0, 1, simTime, updateInterval, bytesNumber))          
-            if logFiles:
-                file.write(' &> fed%s.out &\n' %(i))
-            else:
-                file.write(' > /dev/null 2>&1 &\n')
 
     file.write('\necho "Waiting for it to finish"\n') 
     file.write('wait\n')   
@@ -143,572 +442,4176 @@ def write_launch_script(outFolder, logLevel, federateNumber, simTime, updateInte
         raise Exception('something went wrong when doing "chmod" on run.sh')
 
 
-def write_config(configString, type):
+def write_config_files(configFiles, writeThreads=1, batchSize=64):
     """
-    This function writes the Co-Simulation configuration file to disk
+    This function writes generated configuration files to disk. The files are consumed in batches so the text of a
+    large federation never has to be held in memory at once, and each batch can be written by several threads while
+    the next one is being generated
     
     Inputs
-        configString - Python dictionary that hold the JSON config information to write to disk
-        type - either JSON or YAML
+        configFiles - iterable of (path, text) tuples
+        writeThreads - number of threads writing files (1 writes them in the calling thread)
+        batchSize - number of files handed to the writer threads at a time
 
     Outputs
-        None
-    """ 
+        total number of bytes written
+    """
 
-    # the config dictionary contains the output folder. This will read it and the delete as it should not be part of the config
-    outFolder = configString['outputFolder']
-    del configString['outputFolder']
-
-    if type == 'JSON':
-        # write the JSON config to disk
-        with open(outFolder, 'w') as outfile:
-            json.dump(configString, outfile, ensure_ascii=False, indent = 4)
-    elif type == 'YAML':
-        with open(outFolder, 'w') as outfile:
-            yaml.dump(configString, outfile, default_flow_style=False, indent=4, Dumper=Dumper)
-    else:
-        print("WARNING: unknown configuration file format")
+    def write_file(configFile):
+        path, text = configFile
+        data = text.encode()
+        with open(path, 'wb') as outfile:
+            outfile.write(data)
+        return len(data)
 
+    if writeThreads <= 1:
+        return sum(write_file(configFile) for configFile in configFiles)
 
-def create_meshed_experiment_helics(outFolder, federateNumber, exchangeNumber, messageNumber, bytesNumber, updateInterval, simTime, logLevel, logFiles, uninterruptible, coreType, coreTick, coreTimeout):
+    from concurrent.futures import ThreadPoolExecutor
+
+    bytesWritten = 0
+    configFiles = iter(configFiles)
+    pending = []
+    with ThreadPoolExecutor(max_workers=writeThreads) as executor:
+        while True:
+            batch = list(itertools.islice(configFiles, batchSize))
+            # only one batch is written while the next one is generated, which bounds the memory used
+            bytesWritten += sum(future.result() for future in pending)
+            if not batch:
+                break
+            pending = [executor.submit(write_file, configFile) for configFile in batch]
+
+    return bytesWritten
+
+
+def helics_config_text(name, settings, publications, subscriptions, compact, endpoints='', filters=''):
     """
-    This function creates the HELICS configuration file and shell scripts for the Meshed use case
+    This function assembles the JSON configuration of a HELICS federate from its settings and the pre-serialized
+    publication, subscription, endpoint, and filter entries
     
     Inputs
-        outFolder - Folder that the experiment will be created in
-        federateNumber - number of federates in the federation
-        exchangeNumber - number of other federates to talk to (ring talk topology)
-        messageNumber - number of messages per sender
-        bytesNumber - number of bytes in each message 
-        updateInterval - interval between sending messages
-        simTime - total simulation time
-        logLevel - log level for the federates
-        logFiles - flag to determine if log files are created
-        uninterruptible - HELICS setting for federates
-        coreType - HELICS setting for federates
-        coreTick - HELICS setting for federates
-        coreTimeout - HELICS setting for federates
+        name - name of the federate
+        settings - dictionary with the federate settings (everything except the name and interfaces)
+        publications - comma separated JSON publication entries
+        subscriptions - comma separated JSON subscription entries
+        compact - flag to write the JSON without indentation
+        endpoints - comma separated JSON endpoint entries (left out of the config when empty)
+        filters - comma separated JSON filter entries (left out of the config when empty)
 
     Outputs
-        None
+        configuration file text
     """
 
-    if exchangeNumber >= federateNumber or exchangeNumber == 0:
-        raise Exception("Unable to create case as you are have specified either no or to many exchanges")
-
-    # We need to create the experiment folder. If it already exists we delete it and then create it
-    if os.path.isdir(outFolder):
-        print("experiment folder already exists, deleting and moving on...")
-        shutil.rmtree(outFolder)
-    os.makedirs(outFolder)
-
-    # create the senders
-    for fed in range (0, federateNumber):
-        name = 'fed' + str(fed)
-
-        configData = dict()
-        configData['outputFolder'] = outFolder / str(name + '.json')
-        configData['name'] = name
-        configData['log_level'] = log_level_int(logLevel)
-        configData['uninterruptible'] = uninterruptible
-        configData['coreType'] = coreType
-        configData['coreName'] = ''
-        configData['coreInit'] = '--federates=1 --tick=' + coreTick + ' --timeout=' + coreTimeout
-        configData['maxIterations'] = 1
-        configData['period'] =  updateInterval
-        configData['timeDelta'] = updateInterval
-
-        configData['publications'] = []
-        configData['subscriptions'] = []
-
-        # loop through all subscriptions
-        for exchange in range (1, exchangeNumber+1):
-            if fed+exchange > federateNumber-1:
-                tempName = 'fed' + str(fed+exchange-federateNumber)
-            else:
-                tempName = 'fed' + str(fed+exchange)   
-
-            #print('current fed ->', name, 'subs ->',tempName)
-            for subs in range (0, messageNumber):
-                temp = {'key': tempName + '/m' + str(subs),
-                        'type': 'string',
-                        'unit': '#',
-                        'required': True}
-                configData['subscriptions'].append(temp)
-
-        # loop through all publications
-        for pubs in range (0, messageNumber):
-            temp = {'key':  'm' + str(pubs),
-                    'type': 'string',
-                    'unit': '#',
-                    'global': False}
-            configData['publications'].append(temp) 
-
-        # writen the config to disk
-        write_config(configData, 'JSON')
+    config = {'name': name}
+    config.update(settings)
+    header = json.dumps(config, ensure_ascii=False, separators=(',', ':'))
+    text = header[:-1] + ',"publications":[' + publications + '],"subscriptions":[' + subscriptions + ']'
+    if endpoints:
+        text += ',"endpoints":[' + endpoints + ']'
+    if filters:
+        text += ',"filters":[' + filters + ']'
+    text += '}'
+    if not compact:
+        text = json.dumps(json.loads(text), ensure_ascii=False, indent = 4)
 
-    # create launch script
-    write_launch_script(outFolder, logLevel, federateNumber, simTime, updateInterval, bytesNumber, coreTick, coreTimeout, coreType, 'HELICS', 'Meshed')
+    return text
 
 
-def create_many_to_one_experiment_helics(outFolder, federateNumber, messageNumber, bytesNumber, updateInterval, simTime, logLevel, logFiles, uninterruptible, coreType, coreTick, coreTimeout):
+def helics_filter_entries(endpoint, interface, updateInterval, taps):
     """
-    This function creates the HELICS configuration file and shell scripts for the Many to One use case
+    This function serializes the filter of an endpoint for the message interfaces
     
     Inputs
-        outFolder - Folder that the experiment will be created in
-        federateNumber - number of senders in the federation
-        messageNumber - number of messages per sender
-        bytesNumber - number of bytes in each message 
+        endpoint - global name of the endpoint the filter is on
+        interface - one of INTERFACES, delay holds every message for half an update interval and clone copies every
+            message to the taps
         updateInterval - interval between sending messages
-        simTime - total simulation time
-        logLevel - log level for the federates
-        logFiles - flag to determine if log files are created
-        uninterruptible - HELICS setting for federates
-        coreType - HELICS setting for federates
-        coreTick - HELICS setting for federates
-        coreTimeout - HELICS setting for federates
+        taps - list of the global names of the tap endpoints the clones are delivered to
 
     Outputs
-        None
+        JSON filter entry (empty without a filter)
     """
 
-    # We need to create the experiment folder. If it already exists we delete it and then create it
-    if os.path.isdir(outFolder):
-        print("experiment folder already exists, deleting and moving on...")
-        shutil.rmtree(outFolder)
-    os.makedirs(outFolder)
+    filterName = endpoint.replace('/', '_') + '_' + interface
+    if interface == 'delay':
+        return HELICS_DELAY_FILTER %(filterName, endpoint, updateInterval / 2.)
+    if interface == 'clone':
+        return HELICS_CLONE_FILTER %(filterName, endpoint, ','.join(['"' + tap + '"' for tap in taps]))
+    return ''
+
+
+def fncs_config_text(name, brokerAddress, updateInterval, values):
+    """
+    This function assembles the YAML configuration of a FNCS federate from the pre-serialized value entries
     
-    topicList = [[],[]] 
-
-    # create the senders
-    for fed in range (0, federateNumber):
-        name = 'send' + str(fed)
-
-        configData = dict()
-        configData['outputFolder'] = outFolder / str(name + '.json')
-        configData['name'] = name
-        configData['log_level'] = log_level_int(logLevel)
-        configData['uninterruptible'] = uninterruptible
-        configData['coreType'] = coreType
-        configData['coreName'] = ''
-        configData['coreInit'] = '--federates=1 --tick=' + coreTick + ' --timeout=' + coreTimeout
-        configData['maxIterations'] = 1
-        configData['period'] =  updateInterval
-        configData['timeDelta'] = updateInterval
-
-        configData['publications'] = []
-        configData['subscriptions'] = []
-
-        # loop through all subscriptions
-        for subs in range (0, messageNumber):
-            temp = {'key': 'echo/' + name + '_m' + str(subs),
-                    'type': 'string',
-                    'unit': '#',
-                    'required': True}
-            configData['subscriptions'].append(temp)
-
-        # loop through all publications
-        for pubs in range (0, messageNumber):
-            topicList[0].append(name + '/' + name + '_m' + str(pubs))
-            topicList[1].append(name + '_m' + str(pubs))
-            temp = {'key':  name + '_m' + str(pubs),
-                    'type': 'string',
-                    'unit': '#',
-                    'global': False}
-            configData['publications'].append(temp) 
-
-        # writen the config to disk
-        write_config(configData, 'JSON')       
-     
-    # create the echoer
-    name = 'echo'
-
-    configData = dict()
-    configData['outputFolder'] = outFolder / str(name + '.json')
-    configData['name'] = name
-    configData['log_level'] = log_level_int(logLevel)
-    configData['uninterruptible'] = uninterruptible
-    configData['coreType'] = coreType
-    configData['coreName'] = ''
-    configData['coreInit'] = '--federates=1 --tick=' + coreTick + ' --timeout=' + coreTimeout
-    configData['maxIterations'] = 1
-    configData['period'] =  updateInterval
-    configData['timeDelta'] = updateInterval
-
-    configData['publications'] = []
-    configData['subscriptions'] = []
-
-    # loop through all subscriptions
-    for top in topicList[0]:
-        temp = {'key': top,
-                'type': 'string',
-                'unit': '#',
-                'required': True}
-        configData['subscriptions'].append(temp)
-
-    # loop through all publications
-    for top in topicList[1]:
-        temp = {'key': top,
-                'type': 'string',
-                'unit': '#',
-                'global': False}
-        configData['publications'].append(temp) 
-
-    # writen the config to disk
-    write_config(configData, 'JSON')
+    Inputs
+        name - name of the federate
+        brokerAddress - address of the FNCS broker
+        updateInterval - interval between sending messages
+        values - YAML value entries (already indented below the values key)
 
-    # create launch script
-    write_launch_script(outFolder, logLevel, federateNumber, simTime, updateInterval, bytesNumber, coreTick, coreTimeout, coreType, 'HELICS', 'ManyToOne')
+    Outputs
+        configuration file text
+    """
 
+    text = 'broker: ' + brokerAddress + '\nname: ' + name + '\ntime_delta: ' + str(int(updateInterval)) + 's\n'
+    if values:
+        return text + 'values:\n' + values
+    return text + 'values: {}\n'
 
-def create_meshed_experiment_fncs(outFolder, federateNumber, exchangeNumber, messageNumber, bytesNumber, updateInterval, simTime, logLevel, logFiles):
+
+def communication_graph(federateNumber, graph='ring', degree=None, seed=0, communities=4, mixing=0.1, edgeList=None):
     """
-    This function creates the HELICS configuration file and shell scripts for the Meshed use case
+    This function generates the communication graph of a Meshed federation, i.e. the federates every federate subscribes
+    to. The ring is directed, in all other graphs two linked federates subscribe to each other
     
     Inputs
-        outFolder - Folder that the experiment will be created in
         federateNumber - number of federates in the federation
-        exchangeNumber - number of other federates to talk to (ring talk topology)
-        messageNumber - number of messages per sender
-        bytesNumber - number of bytes in each message 
-        updateInterval - interval between sending messages
-        simTime - total simulation time
-        logLevel - log level for the federates
-        logFiles - flag to determine if log files are created
+        graph - ring (each federate subscribes to the next degree federates), regular (random graph where every federate
+            has degree neighbours), erdos-renyi (random graph with an average degree of degree), scale-free (Barabasi-
+            Albert graph where every new federate links to degree/2 federates), clustered (communities that are densely
+            linked inside with a fraction mixing of the links between them), or edgelist (links read from edgeList)
+        degree - number of neighbours of each federate (the average for the random graphs), None links everyone
+        seed - seed of the random graphs so the same graph is generated every time
+        communities - number of communities of the clustered graph, they are contiguous ranges of federates
+        mixing - fraction of the links of the clustered graph that go between communities
+        edgeList - file with one link per line given as two federate indices or names (e.g. 0 5 or fed0 fed5)
 
     Outputs
-        None
+        neighbours - list with the indices (a list for the ring, an array for the other graphs) of the federates each
+            federate subscribes to
     """
-    if exchangeNumber >= federateNumber or exchangeNumber == 0:
-        raise Exception("Unable to create case as you are have specified either no or to many exchanges")
 
-    # We need to create the experiment folder. If it already exists we delete it and then create it
-    if os.path.isdir(outFolder):
-        print("experiment folder already exists, deleting and moving on...")
-        shutil.rmtree(outFolder)
-    os.makedirs(outFolder)
+    if degree is None:
+        degree = federateNumber - 1
+    if graph != 'edgelist' and (degree < 1 or degree >= federateNumber):
+        raise Exception('invalid degree for a communication graph of ' + str(federateNumber) + ' federates (' + str(degree) + ')')
+
+    if graph == 'ring':
+        # the ring is kept in subscription order, which is what the original meshed experiments used. It is built without
+        # numpy so generating the default meshed experiments does not have to load it
+        return [[(fed + offset) % federateNumber for offset in range(1, degree+1)] for fed in range(0, federateNumber)]
+
+    rng = np.random.default_rng(seed)
 
-    # create the senders
-    for fed in range (0, federateNumber):
-        name = 'fed' + str(fed)
-
-        configData = dict()
-        configData['outputFolder'] = outFolder / str(name + '.yaml')
-        configData['name'] = name
-        configData['time_delta'] = str(int(updateInterval)) + 's'
-        configData['broker'] = 'tcp://localhost:5570'
-        configData['values'] = {}
-
-        # loop through and add subscriptions
-        for exchange in range (1, exchangeNumber+1):
-            if fed+exchange > federateNumber-1:
-                tempName = 'fed' + str(fed+exchange-federateNumber)
+    def unique_links(links):
+        # links as (low, high) pairs without self links and duplicates
+        links = np.sort(links, axis=1)
+        return np.unique(links[links[:, 0] != links[:, 1]], axis=0)
+
+    def random_links(count, draw):
+        # draws candidate pairs until there are enough distinct links, then keeps a random subset of them
+        links = np.empty((0, 2), dtype=int)
+        while len(links) < count:
+            links = unique_links(np.vstack([links, draw(2 * (count - len(links)) + 16)]))
+        return links[rng.permutation(len(links))[:count]]
+
+    if graph == 'regular':
+        if federateNumber * degree % 2:
+            raise Exception('a regular graph needs an even number of links (federates x degree)')
+        if degree == federateNumber - 1:
+            links = np.argwhere(np.tri(federateNumber, k=-1, dtype=bool))
+        else:
+            # configuration model, the stubs of self and duplicate links are shuffled again with as many random links
+            # until the graph is simple
+            stubs = rng.permutation(np.repeat(np.arange(federateNumber), degree)).reshape(-1, 2)
+            for _ in range(0, 1000):
+                pairs = np.sort(stubs, axis=1)
+                _, first = np.unique(pairs[:, 0] * federateNumber + pairs[:, 1], return_index=True)
+                bad = np.ones(len(pairs), dtype=bool)
+                bad[first] = False
+                bad |= pairs[:, 0] == pairs[:, 1]
+                if not bad.any():
+                    break
+                redo = np.union1d(np.flatnonzero(bad), rng.choice(len(stubs), min(len(stubs), int(bad.sum())), replace=False))
+                stubs[redo] = rng.permutation(stubs[redo].ravel()).reshape(-1, 2)
             else:
-                tempName = 'fed' + str(fed+exchange)   
+                raise Exception('unable to generate a regular graph with ' + str(federateNumber) + ' federates and degree ' + str(degree))
+            links = stubs
+    elif graph == 'erdos-renyi':
+        pairs = federateNumber * (federateNumber - 1) // 2
+        count = rng.binomial(pairs, degree / (federateNumber - 1))
+        links = random_links(count, lambda size: rng.integers(0, federateNumber, (size, 2)))
+    elif graph == 'scale-free':
+        # preferential attachment, every link end is in the list once so drawing from it favours well linked federates
+        attach = max(1, degree // 2)
+        generator = random.Random(seed)
+        links = [(new, old) for new in range(1, attach+1) for old in range(0, new)]
+        ends = [fed for link in links for fed in link]
+        for new in range(attach+1, federateNumber):
+            targets = set()
+            while len(targets) < attach:
+                targets.add(ends[generator.randrange(len(ends))])
+            for target in targets:
+                links.append((new, target))
+                ends += [new, target]
+        links = np.array(links)
+    elif graph == 'clustered':
+        if communities < 1 or communities > federateNumber:
+            raise Exception('invalid number of communities for ' + str(federateNumber) + ' federates (' + str(communities) + ')')
+        community = np.repeat(np.arange(communities), [len(chunk) for chunk in np.array_split(np.arange(federateNumber), communities)])
+        starts = np.searchsorted(community, np.arange(communities))
+        sizes = np.bincount(community)
+        links = []
+        for start, size in zip(starts, sizes):
+            if size > 1:
+                count = rng.binomial(size * (size - 1) // 2, min(1., degree * (1 - mixing) / (size - 1)))
+                links.append(random_links(count, lambda draws: start + rng.integers(0, size, (draws, 2))))
+        if communities > 1:
+            def between(draws):
+                pairs = rng.integers(0, federateNumber, (draws, 2))
+                return pairs[community[pairs[:, 0]] != community[pairs[:, 1]]]
+            links.append(random_links(int(round(federateNumber * degree * mixing / 2)), between))
+        links = np.vstack(links) if links else np.empty((0, 2), dtype=int)
+    elif graph == 'edgelist':
+        if edgeList is None:
+            raise Exception('an edge list file is needed for the edgelist communication graph')
+        links = []
+        with open(edgeList) as infile:
+            for line in infile:
+                tokens = line.split('#')[0].split()
+                if not tokens:
+                    continue
+                if len(tokens) != 2:
+                    raise Exception('invalid line in edge list ' + str(edgeList) + ' (' + line.strip() + ')')
+                links.append([int(token[3:]) if token.startswith('fed') else int(token) for token in tokens])
+        links = np.array(links, dtype=int).reshape(-1, 2)
+        if len(links) and (links.min() < 0 or links.max() >= federateNumber):
+            raise Exception('edge list ' + str(edgeList) + ' links federates outside of the ' + str(federateNumber) + ' federates')
+        links = unique_links(links)
+    else:
+        raise Exception('unknown communication graph specified (' + str(graph) + ')')
 
-            #print('current fed ->', name, 'subs ->',tempName)
-            for subs in range (0, messageNumber):
-                # <message name>::<from federate>
-                configData['values']['m' + str(subs) + '::' + tempName] = {'topic': tempName + '/m' + str(subs),
-                                               'default': '',
-                                               'type': 'string',
-                                               'list': False}
+    # adjacency lists, both ends of a link subscribe to each other
+    subscribers = np.concatenate([links[:, 0], links[:, 1]])
+    publishers = np.concatenate([links[:, 1], links[:, 0]])
+    order = np.lexsort((publishers, subscribers))
+    neighbours = np.split(publishers[order], np.cumsum(np.bincount(subscribers, minlength=federateNumber))[:-1])
 
-        # writen the config to disk
-        write_config(configData, 'YAML')
+    isolated = sum(len(fed) == 0 for fed in neighbours)
+    if isolated:
+        print('WARNING: ' + str(isolated) + ' federates have no neighbours in the ' + graph + ' communication graph')
 
-    # create launch script
-    write_launch_script(outFolder, logLevel, federateNumber, simTime, updateInterval, bytesNumber, coreTick, coreTimeout, coreType, 'FNCS', 'Meshed')
+    return neighbours
 
 
-def create_many_to_one_experiment_fncs(outFolder, federateNumber, messageNumber, bytesNumber, updateInterval, simTime, logLevel, logFiles):
+def topology_label(topology):
     """
-    This function creates the FNCS configuration file and shell scripts for the Many to One use case
+    This function turns the settings of a communication graph into the string used in the experiment parameters and
+    results. Edge lists are labelled by the hash of their content so an edited file is a new experiment
     
     Inputs
-        outFolder - Folder that the experiment will be created in
-        federateNumber - number of senders in the federation
-        messageNumber - number of messages per sender
-        bytesNumber - number of bytes in each message 
-        updateInterval - interval between sending messages
-        simTime - total simulation time
-        logLevel - log level for the federates
-        logFiles - flag to determine if log files are created
+        topology - dictionary with the communication_graph settings
 
     Outputs
-        None
+        label string, e.g. graph=scale-free degree=4 seed=0
     """
 
-    # We need to create the experiment folder. If it already exists we delete it and then create it
-    if os.path.isdir(outFolder):
-        print("experiment folder already exists, deleting and moving on...")
-        shutil.rmtree(outFolder)
-    os.makedirs(outFolder)
-
-    topicList = [[],[]] 
-
-    # create the senders
-    for fed in range (0, federateNumber):
-        name = 'send' + str(fed)
-
-        configData = dict()
-        configData['outputFolder'] = outFolder / str(name + '.yaml')
-        configData['name'] = name
-        configData['time_delta'] = str(int(updateInterval)) + 's'
-        configData['broker'] = 'tcp://localhost:5570'
-        configData['values'] = {}
-
-        # loop through all feeders and add subscriptions for feeder load
-        for subs in range (0, messageNumber):
-            topicList[0].append(name + '/' + name + '_m' + str(subs))
-            topicList[1].append(name + '_m' + str(subs))
-            configData['values'][name + '_m' + str(subs)] = {'topic': 'echo/' + name + '_m' + str(subs),
-                                               'default': '',
-                                               'type': 'string',
-                                               'list': False}
-
-        # writen the config to disk
-        write_config(configData, 'YAML')      
-     
-    # create the echoer
-    name = 'echo'
-
-    configData = dict()
-    configData['outputFolder'] = outFolder / str(name + '.yaml')
-    configData['name'] = name
-    configData['time_delta'] = str(int(updateInterval)) + 's'
-    configData['broker'] = 'tcp://localhost:5570'
-    configData['values'] = {}
-
-    # loop through all feeders and add subscriptions for feeder load
-    for idx, _ in enumerate(topicList[0]):
-        configData['values'][topicList[1][idx]] = {'topic': topicList[0][idx],
-                                               'default': '',
-                                               'type': 'string',
-                                               'list': False}
-
-    # writen the config to disk
-    write_config(configData, 'YAML')
-
-    # create launch script
-    write_launch_script(outFolder, logLevel, federateNumber, simTime, updateInterval, bytesNumber, coreTick, coreTimeout, coreType, 'FNCS', 'ManyToOne')
+    settings = dict(topology)
+    if settings.get('edgeList') is not None:
+        with open(settings['edgeList'], 'rb') as infile:
+            settings['edgeList'] = hashlib.sha1(infile.read()).hexdigest()[:16]
+    return ' '.join([key + '=' + str(settings[key]) for key in sorted(settings)])
 
 
-def run_experiment(experimentFolder, simulationTimeout):
+def draw_value(rng, setting):
     """
-    This function executes an experiment and collects the results
+    This function draws a value of a workload setting, either a fixed number or a distribution given as a dictionary
     
     Inputs
-        experimentFolder - Folder that the experiment exist in
-        simulationTimeout - Timeout value before we consider the experiment failed
+        rng - random.Random instance the value is drawn from
+        setting - number, or dictionary with the distribution and its parameters: constant (value), uniform (low, high),
+            exponential (mean), lognormal (median, sigma), pareto (scale, alpha), or choice (values, optional weights)
 
     Outputs
-        Status - 0 if successfull, 1 if failed, and 2 if timed out
-        Initialization time (cpu)
-        Execution time (cpu)
-        Closing time (cpu)
-        Initialization time (wall)
-        Execution time (wall)
-        Closing time (wall)
+        value
     """
-    
-    currentPath = os.getcwd()
-    os.chdir(experimentFolder)
-    time.sleep( 1 )
-    logFile = open("sim.out", "w")
-    try:
-        processReturn = subprocess.run(['./run.sh'], stdout=logFile, timeout=simulationTimeout)
-    except subprocess.TimeoutExpired:
-        os.chdir(currentPath)
-        processReturn = subprocess.run(['pkill','-9','_broker'], stdout=logFile) # this will kill any HELICS or FNCS broker
-        processReturn = subprocess.run(['pkill','-9','testFed'], stdout=logFile) # this will kill any HELICS of FNCS federate
-        logFile.close
-        return 2, 0., 0., 0., 0., 0., 0.
-        
-    logFile.close
-    if processReturn.returncode == 0:
-        data = pd.read_csv('timeDataLogging.csv')
-        os.chdir(currentPath)
-        return 0, data.iloc[0]['Initialization time'], data.iloc[0]['Execution time'], data.iloc[0]['Closing time'], data.iloc[1]['Initialization time'], data.iloc[1]['Execution time'], data.iloc[1]['Closing time']
+
+    if not isinstance(setting, dict):
+        return float(setting)
+
+    distribution = setting.get('distribution', 'constant')
+    if distribution == 'constant':
+        return float(setting['value'])
+    elif distribution == 'uniform':
+        return rng.uniform(setting['low'], setting['high'])
+    elif distribution == 'exponential':
+        return rng.expovariate(1. / setting['mean'])
+    elif distribution == 'lognormal':
+        return rng.lognormvariate(math.log(setting['median']), setting['sigma'])
+    elif distribution == 'pareto':
+        return setting['scale'] * rng.paretovariate(setting['alpha'])
+    elif distribution == 'choice':
+        return float(rng.choices(setting['values'], weights=setting.get('weights'))[0])
     else:
-        os.chdir(currentPath)
-        return 1, 0., 0., 0., 0., 0., 0.
+        raise Exception('unknown distribution specified (' + str(distribution) + ')')
 
 
-def run_search(outFolder, federateNumber, messageNumber, bytesNumber, updateInterval, simTime, logLevel, logFiles, uninterruptible, coreType, coreTick, coreTimeout, simulationTimeout, coSimPlatform, experimentType):
+def workload_schedule(names, messageNumber, bytesNumber, updateInterval, simTime, workload):
     """
-    This function runs all combinations of the specified senders, messages, bytes, and core types and returns the results in a dataframe
+    This function expands a workload into the messages every federate sends. A workload either replays a recorded trace
+    or draws the traffic of every federate from its settings:
+
+        trace - CSV file with a time,federate,message,bytes line per message, the federate given by its index or name
+        period - time between the messages of a federate, drawn once per federate (default updateInterval)
+        bytes - payload size of a message, drawn for every message (default bytesNumber)
+        on, off - length of the bursts a federate sends in and of the quiet periods between them, drawn for every burst
+            (default always on)
+    The period, on, and off draws have to be larger than 0
+        seed - seed of the random draws (default 0)
+
+    The settings are numbers or distributions, see draw_value. Every federate starts at a random point of its period
+    (and of a quiet period) so the federates do not run in lock-step. The update interval is the time resolution of the
+    replay, a message is sent on the step it falls in and a message sent more than once in a step is only sent once
     
     Inputs
-        outFolder - Folder that the experiment will be created in
-        federateNumber - number of senders in the federation
-        messageNumber - number of messages per sender
-        bytesNumber - number of bytes in each message 
-        updateInterval - interval between sending messages
-        simTime - total simulation time
-        logLevel - log level for the federates
-        logFiles - flag to determine if log files are created
-        uninterruptible - HELICS setting for federates
-        coreType - HELICS setting for federates
-        coreTick - HELICS setting for federates
-        coreTimeout - HELICS setting for federates
-        simulationTimeout - Timeout value before we consider the experiment failed
-        coSimPlatform - Co-Simulation platform used. FNCS and HELICS supported
-        experimentType - Type of experiment Meshed or ManyToOne
+        names - list with the names of the federates that send messages
+        messageNumber - number of messages (publications or endpoints) of every federate
+        bytesNumber - number of bytes in each message when the workload does not set them
+        updateInterval - time resolution of the replay
+        simTime - total simulation time, later messages are dropped
+        workload - dictionary with the workload settings
 
     Outputs
-        results - pandas dataframe with results
-
+        dictionary with a list of (step, message, bytes) tuples in time order for every federate
     """
 
-    df = pd.DataFrame(columns=['experiment type','co-simulation platform','core type','status','federates','messages','bytes','initialization time (cpu)','execution time (cpu)','closing time (cpu)','initialization time (wall)','execution time (wall)','closing time (wall)'])
-    
-    if coSimPlatform == 'FNCS':
-        coSimType = 0
-    elif coSimPlatform == 'HELICS':
-        coSimType = 1
-    else:
-        print("ERROR: unknown Co-Simulation platform specified")
-        return df
+    unknown = [key for key in workload if key not in ['trace', 'period', 'bytes', 'on', 'off', 'seed']]
+    if unknown:
+        raise Exception('unknown workload settings: ' + ', '.join(unknown))
+
+    steps = math.ceil(simTime / updateInterval)
+    events = {name: {} for name in names}
 
-    if experimentType == 'ManyToOne':
-        expType = 0
-    elif experimentType == 'Meshed':
-        expType = 1
+    def add_event(name, time, message, size):
+        # the small offset keeps a time on a step boundary (0.3 with an interval of 0.1) from rounding into the step before
+        step = int(time / updateInterval + 1e-9)
+        if 0 <= step < steps:
+            events[name][(step, message)] = max(int(round(size)), 1)
+
+    if workload.get('trace') is not None:
+        with open(workload['trace']) as infile:
+            for line in infile:
+                fields = line.strip().split(',')
+                if len(fields) < 4 or fields[0] == 'time':
+                    continue
+                name = names[int(fields[1])] if fields[1].isdigit() and int(fields[1]) < len(names) else fields[1]
+                message = int(fields[2])
+                if name not in events or message >= messageNumber:
+                    raise Exception('trace ' + str(workload['trace']) + ' sends a message no federate has (' + line.strip() + ')')
+                add_event(name, float(fields[0]), message, float(fields[3]))
     else:
-        print("ERROR: unknown Co-Simulation experiment type specified")
-        return df
-
-    count = 1
-    totalTestNum = len(federateNumber) * len(messageNumber) * len(bytesNumber) * len(coreType)
-    for fedNum in federateNumber:
-        for messNum in messageNumber:
-            for bytesNum in bytesNumber:
-                for coreNum in coreType:    
-                    tempFolder = outFolder / coreNum / str('test_f_' + str(fedNum) + '_m_' + str(messNum) + '_b_' + str(bytesNum))
-                    if coSimType == 0:
-                        if expType == 0:
-                            create_many_to_one_experiment_fncs(tempFolder, fedNum, messNum, bytesNum, updateInterval, simTime, logLevel, logFiles)
-                        else:
-                            create_meshed_experiment_fncs(tempFolder, fedNum, fedNum-1, messNum, bytesNum, updateInterval, simTime, logLevel, logFiles)
-                    else:
-                        if expType == 0:
-                            create_many_to_one_experiment_helics(tempFolder, fedNum, messNum, bytesNum, updateInterval, simTime, logLevel, logFiles, uninterruptible, coreNum, coreTick, coreTimeout)
-                        else:
-                            create_meshed_experiment_helics(tempFolder, fedNum, fedNum-1, messNum, bytesNum, updateInterval, simTime, logLevel, logFiles, uninterruptible, coreNum, coreTick, coreTimeout) 
-                    print("running", coSimPlatform, "test", count, "of", totalTestNum, "with federates=" + str(fedNum), "messages=" + str(messNum), "bytes=" + str(bytesNum), "core=" + str(coreNum), "status=", end='', flush=True)
-                    result, initTime, execTime, closeTime , initTimeWall, execTimeWall, closeTimeWall = run_experiment(tempFolder, simulationTimeout) 
-                    if result == 0:
-                        simStatus = 'success'
-                        print(colored(simStatus, 'green'), flush=True)
-                    elif result == 1:
-                        simStatus = 'failure'
-                        print(colored(simStatus, 'red'), flush=True)
-                    else:
-                        simStatus = 'timeout'
-                        print(colored(simStatus, 'yellow'), flush=True)
-
-                    df = df.append(pd.DataFrame([[experimentType, coSimPlatform, coreNum, simStatus, fedNum, messNum, bytesNum, initTime, execTime, closeTime, initTimeWall, execTimeWall, closeTimeWall]], columns=['experiment type','co-simulation platform','core type','status','federates','messages','bytes','initialization time (cpu)','execution time (cpu)','closing time (cpu)','initialization time (wall)','execution time (wall)','closing time (wall)']), ignore_index=True)
-                    count += 1
-
-    # save the data from the runs
-    df.to_csv(outFolder / 'data.csv', index_label='experiment')
+        if ('on' in workload) != ('off' in workload):
+            raise Exception('a bursty workload needs both the on and the off periods')
+        rng = random.Random(workload.get('seed', 0))
 
-    return df
+        def draw_time(key, default=None):
+            # a period or burst that is not positive would never move the replay forward
+            value = draw_value(rng, workload.get(key, default))
+            if not value > 0:
+                raise Exception('the ' + key + ' of a workload has to be larger than 0 (drew ' + str(value) + ' from ' + str(workload.get(key, default)) + ')')
+            return value
+
+        for name in names:
+            period = max(draw_time('period', updateInterval), updateInterval)
+            time, burstEnd = 0., math.inf
+            if 'on' in workload:
+                time = rng.random() * draw_time('off')
+                burstEnd = time + draw_time('on')
+            time += rng.random() * period
+            while time < simTime:
+                if time >= burstEnd:
+                    time = burstEnd + draw_time('off')
+                    burstEnd = time + draw_time('on')
+                    continue
+                for message in range(0, messageNumber):
+                    add_event(name, time, message, draw_value(rng, workload.get('bytes', bytesNumber)))
+                time += period
+
+    return {name: sorted((step, message, size) for (step, message), size in events[name].items()) for name in names}
 
 
-def plot_data(df):
+def schedule_text(schedule, updateInterval):
     """
-    This function plots the wall clock time results from the experiment
+    This function serializes the messages of a federate into its schedule file, which the test federates replay instead
+    of sending every message on every step
     
     Inputs
-        df - Pandas data frame with experiment data 
+        schedule - list of (step, message, bytes) tuples from workload_schedule
+        updateInterval - time resolution of the replay
 
     Outputs
-        results - pandas dataframe with results
-
-    """ 
+        schedule file text with a <time> <message> <bytes> line per message
+    """
 
-    # get a list of unique core types
-    coreUnique = df['core type'].unique()
+    return ''.join(['%.9f %d %d\n' %(step * updateInterval, message, size) for step, message, size in schedule])
 
-    # create a list of experiments in the data
-    plotLabels = []
-    for index, row in df[df['core type'].isin([coreUnique[0]])].iterrows():
-        plotLabels.append('f-' + str(row['federates']) + '-m-' + str(row['messages']) + '-b-' + str(row['bytes']))
 
-    # create plot
-    fig, (ax1, ax2, ax3) = plt.subplots(3, sharex=True)
+def workload_label(workload):
+    """
+    This function turns the settings of a workload into the string used in the experiment parameters and results. Traces
+    are labelled by the hash of their content so an edited trace is a new experiment
+    
+    Inputs
+        workload - dictionary with the workload_schedule settings
+
+    Outputs
+        label string, e.g. bytes={"distribution":"lognormal","median":100,"sigma":1} off=5 on=1 period=0.5
+    """
+
+    settings = dict(workload)
+    if settings.get('trace') is not None:
+        with open(settings['trace'], 'rb') as infile:
+            settings['trace'] = hashlib.sha1(infile.read()).hexdigest()[:16]
+    return ' '.join([key + '=' + (json.dumps(settings[key], sort_keys=True, separators=(',', ':')) if isinstance(settings[key], dict) else str(settings[key]))
+                     for key in sorted(settings)])
+
+
+def create_meshed_experiment_helics(outFolder, federateNumber, exchangeNumber, messageNumber, bytesNumber, updateInterval, simTime, logLevel, logFiles, uninterruptible, coreType, coreTick, coreTimeout, brokerPort=None, compact=True, writeThreads=1, brokerFanOut=None, placement='block', topology=None, coSimPlatform='HELICS', federateProcesses=None, interface='value', workload=None):
+    """
+    This function creates the HELICS configuration file and shell scripts for the Meshed use case
+    
+    Inputs
+        outFolder - Folder that the experiment will be created in
+        federateNumber - number of federates in the federation
+        exchangeNumber - number of other federates to talk to (ring talk topology)
+        messageNumber - number of messages per sender
+        bytesNumber - number of bytes in each message 
+        updateInterval - interval between sending messages
+        simTime - total simulation time
+        logLevel - log level for the federates
+        logFiles - flag to determine if log files are created
+        uninterruptible - HELICS setting for federates
+        coreType - HELICS setting for federates
+        coreTick - HELICS setting for federates
+        coreTimeout - HELICS setting for federates
+        brokerPort - port the broker listens on (None uses the platform default)
+        compact - flag to write the JSON configs without indentation
+        writeThreads - number of threads writing the config files
+        brokerFanOut - list with the number of sub-brokers per broker on each level of a broker hierarchy (None for a
+            single broker), see broker_hierarchy
+        placement - how the federates are placed on the leaf brokers of the hierarchy (block or roundrobin)
+        topology - dictionary with the communication_graph settings of the federation (None for the ring of
+            exchangeNumber)
+        coSimPlatform - platform the launch script is written for, NOOP runs the HELICS configs with the stand-in
+            executables
+        federateProcesses - number of processes the federates are packed into, the federates of a process share a
+            core, see pack_federates (None for a process per federate)
+        interface - one of INTERFACES, value federates publish to the federates that subscribe to them, the others
+            send messages from their endpoints to the same endpoints of those federates
+        workload - dictionary with the workload_schedule settings the federates replay instead of sending every message
+            on every step (None for the fixed workload)
+
+    Outputs
+        number of bytes written for the configuration files
+    """
+
+    if topology is None:
+        if exchangeNumber >= federateNumber or exchangeNumber == 0:
+            raise Exception("Unable to create case as you are have specified either no or to many exchanges")
+        # ring talk topology, each federate subscribes to the next exchangeNumber federates
+        neighbours = communication_graph(federateNumber, 'ring', exchangeNumber)
+    else:
+        neighbours = communication_graph(federateNumber, **topology)
+
+    # We need to create the experiment folder. If it already exists we delete it and then create it
+    if os.path.isdir(outFolder):
+        print("experiment folder already exists, deleting and moving on...")
+        shutil.rmtree(outFolder)
+    os.makedirs(outFolder)
+
+    coreInit = '--federates=1 --tick=' + coreTick + ' --timeout=' + coreTimeout
+    if brokerPort is not None:
+        coreInit += ' --brokerport=' + str(brokerPort)
+
+    settings = {'log_level': log_level_int(logLevel), 'uninterruptible': uninterruptible, 'coreType': coreType, 'coreName': '',
+                'coreInit': coreInit, 'maxIterations': 1, 'period': updateInterval, 'timeDelta': updateInterval}
+
+    names = ['fed' + str(fed) for fed in range(0, federateNumber)]
+
+    # with a broker hierarchy every federate connects its core to the leaf broker it is placed on
+    brokers = None
+    federateSettings = dict.fromkeys(names, settings)
+    if brokerFanOut is not None:
+        brokers, federatePorts = broker_hierarchy(names, brokerFanOut, placement, brokerPort)
+        leafSettings = {port: dict(settings, coreInit='--federates=1 --tick=' + coreTick + ' --timeout=' + coreTimeout + ' --brokerport=' + str(port)) for port in set(federatePorts.values())}
+        federateSettings = {name: leafSettings[federatePorts[name]] for name in names}
+
+    # the federates of a packed process share a core named after the process, the first one to start creates it
+    packs = None
+    if federateProcesses is not None:
+        packs = pack_federates(names, federateProcesses, federatePorts if brokerFanOut is not None else None)
+        federateSettings = {name: dict(federateSettings[name], coreName='pack' + str(packIdx), coreInit=federateSettings[name]['coreInit'].replace('--federates=1', '--federates=' + str(len(pack)), 1))
+                            for packIdx, pack in enumerate(packs) for name in pack}
+
+    if interface not in INTERFACES:
+        raise Exception('unknown interface specified (' + str(interface) + ')')
+
+    # everyone subscribing to a federate subscribes to the same messages, so those entries are serialized once per federate
+    subscriptionBlocks = [','.join([HELICS_SUBSCRIPTION %(name + '/m' + str(subs)) for subs in range(0, messageNumber)]) for name in names]
+    publicationBlock = ','.join([HELICS_PUBLICATION %('m' + str(pubs)) for pubs in range(0, messageNumber)])
+
+    # a federate sends its messages to every federate that would have subscribed to its publications
+    destinations = [[] for _ in names]
+    for fed in range(0, federateNumber):
+        for idx in neighbours[fed]:
+            destinations[idx].append(fed)
+
+    def endpoint_entries(fed, name):
+        endpoints = [HELICS_ENDPOINT %('m' + str(subs), ','.join([names[idx] + '/m' + str(subs) for idx in destinations[fed]])) for subs in range(0, messageNumber)]
+        filters = [helics_filter_entries(name + '/m' + str(subs), interface, updateInterval, [names[idx] + '/tap' for idx in destinations[fed]]) for subs in range(0, messageNumber)]
+        if interface == 'clone':
+            endpoints.append(HELICS_ENDPOINT %('tap', ''))
+        return ','.join(endpoints), ','.join([entry for entry in filters if entry])
+
+    # a replayed workload is delivered to the same federates the fixed one is, and the clones once more to the taps
+    schedules, replayTotals = None, None
+    if workload is not None:
+        schedules = workload_schedule(names, messageNumber, bytesNumber, updateInterval, simTime, workload)
+        copies = [len(destinations[fed]) * (2 if interface == 'clone' else 1) for fed in range(0, federateNumber)]
+        replayTotals = {'messages': sum(len(schedules[name]) * copies[fed] for fed, name in enumerate(names)),
+                        'payload bytes': sum(sum(size for _, _, size in schedules[name]) * copies[fed] for fed, name in enumerate(names))}
+
+    def config_files():
+        for fed, name in enumerate(names):
+            if schedules is not None:
+                yield outFolder / str(name + '.schedule'), schedule_text(schedules[name], updateInterval)
+            if interface == 'value':
+                subscriptions = ','.join([subscriptionBlocks[idx] for idx in neighbours[fed]])
+                yield outFolder / str(name + '.json'), helics_config_text(name, federateSettings[name], publicationBlock, subscriptions, compact)
+            else:
+                endpoints, filters = endpoint_entries(fed, name)
+                yield outFolder / str(name + '.json'), helics_config_text(name, federateSettings[name], '', '', compact, endpoints, filters)
+
+    bytesWritten = write_config_files(config_files(), writeThreads)
+
+    # create launch script
+    write_launch_script(outFolder, logLevel, logFiles, federateNumber, simTime, updateInterval, bytesNumber, coreTick, coreTimeout, coreType, coSimPlatform, 'Meshed', brokerPort, brokers,
+                        messageNumber * sum(len(neighbour) for neighbour in neighbours) * (2 if interface == 'clone' else 1), packs, replayTotals)
+
+    return bytesWritten
+
+
+def create_many_to_one_experiment_helics(outFolder, federateNumber, messageNumber, bytesNumber, updateInterval, simTime, logLevel, logFiles, uninterruptible, coreType, coreTick, coreTimeout, brokerPort=None, compact=True, writeThreads=1, brokerFanOut=None, placement='block', coSimPlatform='HELICS', federateProcesses=None, interface='value', workload=None):
+    """
+    This function creates the HELICS configuration file and shell scripts for the Many to One use case
+    
+    Inputs
+        outFolder - Folder that the experiment will be created in
+        federateNumber - number of senders in the federation
+        messageNumber - number of messages per sender
+        bytesNumber - number of bytes in each message 
+        updateInterval - interval between sending messages
+        simTime - total simulation time
+        logLevel - log level for the federates
+        logFiles - flag to determine if log files are created
+        uninterruptible - HELICS setting for federates
+        coreType - HELICS setting for federates
+        coreTick - HELICS setting for federates
+        coreTimeout - HELICS setting for federates
+        brokerPort - port the broker listens on (None uses the platform default)
+        compact - flag to write the JSON configs without indentation
+        writeThreads - number of threads writing the config files
+        brokerFanOut - list with the number of sub-brokers per broker on each level of a broker hierarchy (None for a
+            single broker), see broker_hierarchy
+        placement - how the federates are placed on the leaf brokers of the hierarchy (block or roundrobin)
+        coSimPlatform - platform the launch script is written for, NOOP runs the HELICS configs with the stand-in
+            executables
+        federateProcesses - number of processes the federates are packed into, the federates of a process share a
+            core, see pack_federates (None for a process per federate)
+        interface - one of INTERFACES, value federates publish to the federates that subscribe to them, the others
+            send messages from their endpoints to the same endpoints of those federates
+        workload - dictionary with the workload_schedule settings the federates replay instead of sending every message
+            on every step (None for the fixed workload)
+
+    Outputs
+        number of bytes written for the configuration files
+    """
+
+    # We need to create the experiment folder. If it already exists we delete it and then create it
+    if os.path.isdir(outFolder):
+        print("experiment folder already exists, deleting and moving on...")
+        shutil.rmtree(outFolder)
+    os.makedirs(outFolder)
+
+    coreInit = '--federates=1 --tick=' + coreTick + ' --timeout=' + coreTimeout
+    if brokerPort is not None:
+        coreInit += ' --brokerport=' + str(brokerPort)
+
+    settings = {'log_level': log_level_int(logLevel), 'uninterruptible': uninterruptible, 'coreType': coreType, 'coreName': '',
+                'coreInit': coreInit, 'maxIterations': 1, 'period': updateInterval, 'timeDelta': updateInterval}
+
+    names = ['send' + str(fed) for fed in range(0, federateNumber)]
+    messages = ['_m' + str(subs) for subs in range(0, messageNumber)]
+
+    # with a broker hierarchy every federate connects its core to the leaf broker it is placed on, the echoer on the first one
+    brokers = None
+    federateSettings = dict.fromkeys(['echo'] + names, settings)
+    if brokerFanOut is not None:
+        brokers, federatePorts = broker_hierarchy(['echo'] + names, brokerFanOut, placement, brokerPort)
+        leafSettings = {port: dict(settings, coreInit='--federates=1 --tick=' + coreTick + ' --timeout=' + coreTimeout + ' --brokerport=' + str(port)) for port in set(federatePorts.values())}
+        federateSettings = {name: leafSettings[federatePorts[name]] for name in federatePorts}
+
+    # the federates of a packed process share a core named after the process, the first one to start creates it
+    packs = None
+    if federateProcesses is not None:
+        packs = pack_federates(['echo'] + names, federateProcesses, federatePorts if brokerFanOut is not None else None)
+        federateSettings = {name: dict(federateSettings[name], coreName='pack' + str(packIdx), coreInit=federateSettings[name]['coreInit'].replace('--federates=1', '--federates=' + str(len(pack)), 1))
+                            for packIdx, pack in enumerate(packs) for name in pack}
+
+    if interface not in INTERFACES:
+        raise Exception('unknown interface specified (' + str(interface) + ')')
+
+    # the echoer has an empty schedule, it replies whenever a message arrives, so every message is delivered twice (and
+    # cloned once more to the tap)
+    schedules, replayTotals = None, None
+    if workload is not None:
+        if uninterruptible:
+            raise Exception('the echoer can only reply to a replayed workload when the federates are interruptible')
+        schedules = workload_schedule(names, messageNumber, bytesNumber, updateInterval, simTime, workload)
+        copies = 3 if interface == 'clone' else 2
+        replayTotals = {'messages': copies * sum(len(schedule) for schedule in schedules.values()),
+                        'payload bytes': copies * sum(size for schedule in schedules.values() for _, _, size in schedule)}
+        schedules['echo'] = []
+
+    def config_files():
+        if schedules is not None:
+            for name in ['echo'] + names:
+                yield outFolder / str(name + '.schedule'), schedule_text(schedules[name], updateInterval)
+
+        if interface != 'value':
+            # the senders send to an endpoint of the echoer for each of their messages, the echoer replies to the sender
+            for name in names:
+                endpoints = ','.join([HELICS_ENDPOINT %(message[1:], 'echo/' + name + message) for message in messages])
+                filters = ','.join([helics_filter_entries(name + '/' + message[1:], interface, updateInterval, ['echo/tap']) for message in messages if interface in ['delay', 'clone']])
+                yield outFolder / str(name + '.json'), helics_config_text(name, federateSettings[name], '', '', compact, endpoints, filters)
+
+            endpoints = [HELICS_ENDPOINT %(name + message, '') for name in names for message in messages]
+            if interface == 'clone':
+                endpoints.append(HELICS_ENDPOINT %('tap', ''))
+            yield outFolder / 'echo.json', helics_config_text('echo', federateSettings['echo'], '', '', compact, ','.join(endpoints))
+            return
+
+        # create the senders
+        for name in names:
+            subscriptions = ','.join([HELICS_SUBSCRIPTION %('echo/' + name + message) for message in messages])
+            publications = ','.join([HELICS_PUBLICATION %(name + message) for message in messages])
+            yield outFolder / str(name + '.json'), helics_config_text(name, federateSettings[name], publications, subscriptions, compact)
+
+        # create the echoer, it subscribes to everything the senders publish and echoes it back
+        subscriptions = ','.join([HELICS_SUBSCRIPTION %(name + '/' + name + message) for name in names for message in messages])
+        publications = ','.join([HELICS_PUBLICATION %(name + message) for name in names for message in messages])
+        yield outFolder / 'echo.json', helics_config_text('echo', federateSettings['echo'], publications, subscriptions, compact)
+
+    bytesWritten = write_config_files(config_files(), writeThreads)
+
+    # create launch script
+    write_launch_script(outFolder, logLevel, logFiles, federateNumber, simTime, updateInterval, bytesNumber, coreTick, coreTimeout, coreType, coSimPlatform, 'ManyToOne', brokerPort, brokers,
+                        (3 if interface == 'clone' else 2) * federateNumber * messageNumber, packs, replayTotals)
+
+    return bytesWritten
+
+
+def create_meshed_experiment_fncs(outFolder, federateNumber, exchangeNumber, messageNumber, bytesNumber, updateInterval, simTime, logLevel, logFiles, brokerPort=None, writeThreads=1, topology=None):
+    """
+    This function creates the FNCS configuration file and shell scripts for the Meshed use case
+    
+    Inputs
+        outFolder - Folder that the experiment will be created in
+        federateNumber - number of federates in the federation
+        exchangeNumber - number of other federates to talk to (ring talk topology)
+        messageNumber - number of messages per sender
+        bytesNumber - number of bytes in each message 
+        updateInterval - interval between sending messages
+        simTime - total simulation time
+        logLevel - log level for the federates
+        logFiles - flag to determine if log files are created
+        brokerPort - port the broker listens on (None uses the platform default)
+        writeThreads - number of threads writing the config files
+        topology - dictionary with the communication_graph settings of the federation (None for the ring of
+            exchangeNumber)
+
+    Outputs
+        number of bytes written for the configuration files
+    """
+    if topology is None:
+        if exchangeNumber >= federateNumber or exchangeNumber == 0:
+            raise Exception("Unable to create case as you are have specified either no or to many exchanges")
+        # ring talk topology, each federate subscribes to the next exchangeNumber federates
+        neighbours = communication_graph(federateNumber, 'ring', exchangeNumber)
+    else:
+        neighbours = communication_graph(federateNumber, **topology)
+
+    # We need to create the experiment folder. If it already exists we delete it and then create it
+    if os.path.isdir(outFolder):
+        print("experiment folder already exists, deleting and moving on...")
+        shutil.rmtree(outFolder)
+    os.makedirs(outFolder)
+
+    if brokerPort is not None:
+        brokerAddress = 'tcp://localhost:' + str(brokerPort)
+    else:
+        brokerAddress = 'tcp://localhost:5570'
+
+    names = ['fed' + str(fed) for fed in range(0, federateNumber)]
+
+    # <message name>::<from federate>, serialized once per message and federate
+    valueEntries = [[FNCS_VALUE %('m' + str(subs) + '::' + name, name + '/m' + str(subs)) for name in names] for subs in range(0, messageNumber)]
+
+    def config_files():
+        for fed, name in enumerate(names):
+            # the values are grouped by message so the federate sees the keys of one message next to each other
+            values = ''.join([''.join([entries[idx] for idx in neighbours[fed]]) for entries in valueEntries])
+            yield outFolder / str(name + '.yaml'), fncs_config_text(name, brokerAddress, updateInterval, values)
+
+    bytesWritten = write_config_files(config_files(), writeThreads)
+
+    # create launch script
+    write_launch_script(outFolder, logLevel, logFiles, federateNumber, simTime, updateInterval, bytesNumber, None, None, None, 'FNCS', 'Meshed', brokerPort,
+                        messagesPerStep=messageNumber * sum(len(neighbour) for neighbour in neighbours))
+
+    return bytesWritten
+
+
+def create_many_to_one_experiment_fncs(outFolder, federateNumber, messageNumber, bytesNumber, updateInterval, simTime, logLevel, logFiles, brokerPort=None, writeThreads=1):
+    """
+    This function creates the FNCS configuration file and shell scripts for the Many to One use case
+    
+    Inputs
+        outFolder - Folder that the experiment will be created in
+        federateNumber - number of senders in the federation
+        messageNumber - number of messages per sender
+        bytesNumber - number of bytes in each message 
+        updateInterval - interval between sending messages
+        simTime - total simulation time
+        logLevel - log level for the federates
+        logFiles - flag to determine if log files are created
+        brokerPort - port the broker listens on (None uses the platform default)
+        writeThreads - number of threads writing the config files
+
+    Outputs
+        number of bytes written for the configuration files
+    """
+
+    # We need to create the experiment folder. If it already exists we delete it and then create it
+    if os.path.isdir(outFolder):
+        print("experiment folder already exists, deleting and moving on...")
+        shutil.rmtree(outFolder)
+    os.makedirs(outFolder)
+
+    if brokerPort is not None:
+        brokerAddress = 'tcp://localhost:' + str(brokerPort)
+    else:
+        brokerAddress = 'tcp://localhost:5570'
+
+    names = ['send' + str(fed) for fed in range(0, federateNumber)]
+    messages = ['_m' + str(subs) for subs in range(0, messageNumber)]
+
+    def config_files():
+        # create the senders
+        for name in names:
+            values = ''.join([FNCS_VALUE %(name + message, 'echo/' + name + message) for message in messages])
+            yield outFolder / str(name + '.yaml'), fncs_config_text(name, brokerAddress, updateInterval, values)
+
+        # create the echoer, it subscribes to everything the senders publish and echoes it back
+        values = ''.join([FNCS_VALUE %(name + message, name + '/' + name + message) for name in names for message in messages])
+        yield outFolder / 'echo.yaml', fncs_config_text('echo', brokerAddress, updateInterval, values)
+
+    bytesWritten = write_config_files(config_files(), writeThreads)
+
+    # create launch script
+    write_launch_script(outFolder, logLevel, logFiles, federateNumber, simTime, updateInterval, bytesNumber, None, None, None, 'FNCS', 'ManyToOne', brokerPort,
+                        messagesPerStep=2 * federateNumber * messageNumber)
+
+    return bytesWritten
+
+
+def create_experiment(outFolder, coSimPlatform, experimentType, federateNumber, messageNumber, bytesNumber, updateInterval, simTime, logLevel, logFiles, uninterruptible, coreType, coreTick, coreTimeout, brokerPort=None, compact=True, writeThreads=1, brokerFanOut=None, placement='block', topology=None, federateProcesses=None, interface='value', workload=None):
+    """
+    This function creates a single experiment by dispatching to the create function of the co-simulation platform and
+    experiment type. Meshed experiments are fully connected unless a communication graph is given
+    
+    Inputs
+        outFolder - Folder that the experiment will be created in
+        coSimPlatform - Co-Simulation platform used. FNCS, HELICS, and NOOP (stand-ins that do not exchange data) supported
+        experimentType - Type of experiment Meshed or ManyToOne
+        federateNumber - number of senders in the federation
+        messageNumber - number of messages per sender
+        bytesNumber - number of bytes in each message 
+        updateInterval - interval between sending messages
+        simTime - total simulation time
+        logLevel - log level for the federates
+        logFiles - flag to determine if log files are created
+        uninterruptible - HELICS setting for federates
+        coreType - HELICS setting for federates
+        coreTick - HELICS setting for federates
+        coreTimeout - HELICS setting for federates
+        brokerPort - port the broker listens on (None uses the platform default)
+        compact - flag to write the JSON configs without indentation
+        writeThreads - number of threads writing the config files
+        brokerFanOut - list with the number of sub-brokers per broker on each level of a HELICS broker hierarchy (None
+            for a single broker), see broker_hierarchy
+        placement - how the federates are placed on the leaf brokers of the hierarchy (block or roundrobin)
+        topology - dictionary with the communication_graph settings of Meshed experiments (None for fully connected)
+        federateProcesses - number of processes the HELICS federates are packed into, see pack_federates (None for a
+            process per federate)
+        interface - one of INTERFACES, how the HELICS federates exchange data (FNCS only has values)
+        workload - dictionary with the workload_schedule settings the HELICS federates replay (None for the fixed workload)
+
+    Outputs
+        number of bytes written for the configuration files
+    """
+
+    if topology is not None and experimentType != 'Meshed':
+        raise Exception('communication graphs are only supported by Meshed experiments')
+
+    if coSimPlatform == 'FNCS':
+        if brokerFanOut is not None:
+            raise Exception('broker hierarchies are only supported by HELICS and NOOP')
+        if federateProcesses is not None:
+            # the FNCS library keeps a single federate per process
+            raise Exception('packing federates into processes is only supported by HELICS')
+        if interface != 'value':
+            raise Exception('endpoints and filters are only supported by HELICS')
+        if workload is not None:
+            raise Exception('replaying workloads is only supported by HELICS')
+        if experimentType == 'ManyToOne':
+            return create_many_to_one_experiment_fncs(outFolder, federateNumber, messageNumber, bytesNumber, updateInterval, simTime, logLevel, logFiles, brokerPort, writeThreads)
+        elif experimentType == 'Meshed':
+            return create_meshed_experiment_fncs(outFolder, federateNumber, federateNumber-1, messageNumber, bytesNumber, updateInterval, simTime, logLevel, logFiles, brokerPort, writeThreads, topology)
+        else:
+            raise Exception('unknown Co-Simulation experiment type specified (' + str(experimentType) + ')')
+    elif coSimPlatform in ['HELICS', 'NOOP']:
+        if experimentType == 'ManyToOne':
+            return create_many_to_one_experiment_helics(outFolder, federateNumber, messageNumber, bytesNumber, updateInterval, simTime, logLevel, logFiles, uninterruptible, coreType, coreTick, coreTimeout, brokerPort, compact, writeThreads, brokerFanOut, placement, coSimPlatform, federateProcesses, interface, workload)
+        elif experimentType == 'Meshed':
+            return create_meshed_experiment_helics(outFolder, federateNumber, federateNumber-1, messageNumber, bytesNumber, updateInterval, simTime, logLevel, logFiles, uninterruptible, coreType, coreTick, coreTimeout, brokerPort, compact, writeThreads, brokerFanOut, placement, topology, coSimPlatform, federateProcesses, interface, workload)
+        else:
+            raise Exception('unknown Co-Simulation experiment type specified (' + str(experimentType) + ')')
+    else:
+        raise Exception('unknown Co-Simulation platform specified (' + str(coSimPlatform) + ')')
+
+
+def benchmark_config_generation(outFolder, federateNumber, messageNumber, coSimPlatform=['HELICS', 'FNCS'], experimentType=['ManyToOne', 'Meshed'], compact=True, writeThreads=1, keepFiles=False):
+    """
+    This function measures how long it takes to generate the configuration files and launch script of experiments and
+    how many bytes are written for them. The results are saved to config_generation_benchmark.csv in the output folder
+    
+    Inputs
+        outFolder - Folder that the experiments will be created in
+        federateNumber - list of number of federates to generate
+        messageNumber - list of number of messages per federate to generate
+        coSimPlatform - list of Co-Simulation platforms to generate configs for
+        experimentType - list of experiment types to generate
+        compact - flag to write the JSON configs without indentation
+        writeThreads - number of threads writing the config files
+        keepFiles - flag to keep the generated experiments instead of deleting them after they are measured
+
+    Outputs
+        results - pandas dataframe with the generation time and bytes written per experiment
+    """
+
+    rows = []
+    for coSim in coSimPlatform:
+        for typeSim in experimentType:
+            for fedNum in federateNumber:
+                for messNum in messageNumber:
+                    tempFolder = outFolder / coSim / typeSim / str('gen_f_' + str(fedNum) + '_m_' + str(messNum))
+                    startTime = time.perf_counter()
+                    configBytes = create_experiment(tempFolder, coSim, typeSim, fedNum, messNum, 1, 10., 100., 'INFO', False, False, 'zmq', '30s', '30s', compact=compact, writeThreads=writeThreads)
+                    generationTime = time.perf_counter() - startTime
+                    launchBytes = os.path.getsize(tempFolder / 'run.sh')
+                    print('generated', coSim, typeSim, 'federates=' + str(fedNum), 'messages=' + str(messNum), 'in', '%.3f' %(generationTime), 's', flush=True)
+                    rows.append({'co-simulation platform': coSim, 'experiment type': typeSim, 'federates': fedNum, 'messages': messNum,
+                                 'compact': compact, 'write threads': writeThreads, 'generation time (s)': generationTime,
+                                 'config bytes': configBytes, 'launch script bytes': launchBytes,
+                                 'bytes per second': (configBytes + launchBytes) / generationTime})
+                    if not keepFiles:
+                        shutil.rmtree(tempFolder)
+
+    results = pd.DataFrame(rows)
+    os.makedirs(outFolder, exist_ok=True)
+    results.to_csv(outFolder / 'config_generation_benchmark.csv', index=False)
+
+    return results
+
+
+def benchmark_harness(outFolder, federateNumber=[10, 100, 1000, 10000], experimentType=['ManyToOne', 'Meshed'], launcher=['python', 'bash'], repeats=3, messageNumber=1, updateInterval=10., simTime=100., topology={'graph': 'ring', 'degree': 4}, simulationTimeout=600, sampleInterval=1.):
+    """
+    This function measures the overhead of the test suite itself by running experiments on the NOOP platform, whose
+    stand-in broker and federates (noop_broker and testFedNoop) honour the command line of the real ones but only tell
+    the broker when they are done. Every stage of an experiment is timed: generating the configs, spawning the processes, the lifetime of
+    the processes, parsing the results, and the rest of run_experiment (e.g. removing the files of an earlier run). The trials are written to
+    harness_trials.csv so two benchmarks can be compared with regression_gate, and the median of every stage is written
+    to harness_benchmark.csv
+    
+    Inputs
+        outFolder - Folder that the experiments will be created in
+        federateNumber - list of number of federates to benchmark
+        experimentType - list of experiment types to benchmark
+        launcher - list of launchers to benchmark (python and/or bash)
+        repeats - number of trials per configuration
+        messageNumber - number of messages per federate
+        updateInterval - interval between time updates of the federates
+        simTime - total simulation time of the federates
+        topology - communication_graph settings of the Meshed experiments (None for fully connected, which gets very
+            large for thousands of federates)
+        simulationTimeout - Timeout value before we consider an experiment failed
+        sampleInterval - time between resource samples of the running processes (None disables the sampling)
+
+    Outputs
+        summary - pandas dataframe with the trial counts and median time of every stage per configuration
+    """
+
+    outFolder = Path(outFolder)
+    trials = []
+    for typeSim in experimentType:
+        for fedNum in federateNumber:
+            for launch in launcher:
+                parameters = {'benchmark': 'harness', 'experiment type': typeSim, 'federates': fedNum, 'messages': messageNumber,
+                              'update interval': updateInterval, 'simulation time': simTime, 'launcher': launch,
+                              'topology': topology_label(topology) if typeSim == 'Meshed' and topology is not None else None}
+                hashKey = experiment_hash(parameters)
+                description = {'experiment hash': hashKey, 'experiment type': typeSim, 'co-simulation platform': 'NOOP', 'core type': None,
+                               'launcher': launch, 'federates': fedNum, 'messages': messageNumber, 'bytes': 1}
+                experimentFolder = outFolder / typeSim / str('f_' + str(fedNum) + '_' + launch)
+                configTrials = []
+                for trial in range(0, repeats):
+                    startTime = time.perf_counter()
+                    create_experiment(experimentFolder, 'NOOP', typeSim, fedNum, messageNumber, 1, updateInterval, simTime, 'WARNING', False, False, 'zmq', '30s', '30s',
+                                      topology=topology if typeSim == 'Meshed' else None)
+                    configTime = time.perf_counter() - startTime
+
+                    startTime = time.perf_counter()
+                    results = run_experiment(experimentFolder, simulationTimeout, launcher=launch, sampleInterval=sampleInterval)
+                    runTime = time.perf_counter() - startTime
+
+                    # the results are parsed again on their own to time that stage separately
+                    parseTime = np.nan
+                    if results['status'] == 0:
+                        startTime = time.perf_counter()
+                        pd.read_csv(experimentFolder / 'timeDataLogging.csv')
+                        load_latency(experimentFolder)
+                        parseTime = time.perf_counter() - startTime
+
+                    record = dict(description, trial=trial, status=['success', 'failure', 'timeout'][results['status']])
+                    record.update({'config generation (wall)': configTime, 'spawn time (wall)': results['spawn time (wall)'],
+                                   'launch time (wall)': results['launch time (wall)'], 'result parsing (wall)': parseTime,
+                                   'settle time (wall)': runTime - results['launch time (wall)'] - (parseTime if results['status'] == 0 else 0.),
+                                   'run experiment (wall)': runTime})
+                    configTrials.append(record)
+                    print('harness benchmark', typeSim, 'federates=' + str(fedNum), 'launcher=' + launch, 'trial=' + str(trial), 'status=' + format_status(record['status'], results),
+                          'run experiment=' + '%.3f' %(runTime) + 's', flush=True)
+
+                _, outliers = summarize_trials(configTrials, HARNESS_COLUMNS)
+                for record, outlier in zip(configTrials, outliers):
+                    record['outlier'] = outlier
+                trials += configTrials
+
+    summary = []
+    for hashKey in dict.fromkeys([trial['experiment hash'] for trial in trials]):
+        configTrials = [trial for trial in trials if trial['experiment hash'] == hashKey]
+        statistics, _ = summarize_trials(configTrials, HARNESS_COLUMNS)
+        row = {key: configTrials[0][key] for key in ['experiment hash', 'experiment type', 'launcher', 'federates', 'messages']}
+        row.update({key: statistics[key] for key in ['trials', 'successful trials', 'outlier trials'] + HARNESS_COLUMNS})
+        summary.append(row)
+
+    summary = pd.DataFrame(summary)
+    pd.DataFrame(trials).to_csv(outFolder / 'harness_trials.csv', index=False)
+    summary.to_csv(outFolder / 'harness_benchmark.csv', index=False)
+
+    return summary
+
+
+def find_session_processes(sessionId):
+    """
+    This function finds every process on the host that belongs to a session. Each experiment is started in its own
+    session so this lets us find its broker and federates without touching anything else running on the host
+    
+    Inputs
+        sessionId - session id to search for (the pid of the process that started the session)
+
+    Outputs
+        list of pids in the session
+    """
+
+    pids = []
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open('/proc/' + entry + '/stat', 'r') as statFile:
+                stat = statFile.read()
+        except OSError:
+            # the process exited while we were looking at it
+            continue
+        # the process name is in brackets and can contain spaces, so only split what comes after it
+        fields = stat[stat.rfind(')')+2:].split()
+        # zombies have exited already, they only wait to be reaped by their parent
+        if int(fields[3]) == sessionId and fields[0] != 'Z':
+            pids.append(int(entry))
+
+    return pids
+
+
+def track_session_processes(sessionId, processes, startTime):
+    """
+    This function records every process currently in a session. Processes seen before get their command and last seen
+    time updated
+    
+    Inputs
+        sessionId - session id to track (the pid of the process that started the session)
+        processes - dictionary of pid -> [command, first seen, last seen] that is updated in place
+        startTime - monotonic time the experiment was started, seen times are relative to it
+
+    Outputs
+        None
+    """
+
+    now = time.monotonic() - startTime
+    for pid in find_session_processes(sessionId):
+        # the command is read again every time, a process seen between its fork and exec still has the command of its parent
+        try:
+            with open('/proc/' + str(pid) + '/cmdline', 'rb') as cmdFile:
+                command = cmdFile.read().replace(b'\0', b' ').decode(errors='replace').strip()
+        except OSError:
+            continue
+        if pid in processes:
+            processes[pid][0] = command or processes[pid][0]
+            processes[pid][2] = now
+        else:
+            processes[pid] = [command, now, now]
+
+
+def terminate_session(sessionId, terminateTimeout):
+    """
+    This function tears down every process that belongs to a session. The processes are asked to terminate first and
+    anything still alive after the timeout is killed
+    
+    Inputs
+        sessionId - session id to tear down (the pid of the process that started the session)
+        terminateTimeout - time the processes get to exit after SIGTERM before they are killed
+
+    Outputs
+        number of processes that had to be killed
+    """
+
+    for pid in find_session_processes(sessionId):
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+    deadline = time.monotonic() + terminateTimeout
+    remaining = find_session_processes(sessionId)
+    while remaining and time.monotonic() < deadline:
+        time.sleep(0.1)
+        remaining = find_session_processes(sessionId)
+
+    for pid in remaining:
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+    return len(remaining)
+
+
+def process_name(command):
+    """
+    This function derives the name used in the results for a process from its command line
+    
+    Inputs
+        command - command line of the process as a string
+
+    Outputs
+        config or pack file name for federates, broker for brokers, and the executable name for anything else
+    """
+
+    tokens = command.split()
+    if not tokens:
+        return command
+    if os.path.basename(tokens[0]).endswith('_broker'):
+        return 'broker'
+    for token in tokens[1:]:
+        if token.endswith('.json') or token.endswith('.yaml') or token.endswith('.pack'):
+            return token.rsplit('.', 1)[0]
+    return os.path.basename(tokens[0])
+
+
+def read_process_sample(pid):
+    """
+    This function reads the resource usage of a process from /proc
+    
+    Inputs
+        pid - process id to read
+
+    Outputs
+        dictionary with the cpu time (s), rss (MB), peak rss (MB), voluntary and involuntary context switches, threads,
+        and open fds of the process (None if the process is gone)
+    """
+
+    try:
+        with open('/proc/' + str(pid) + '/stat', 'r') as statFile:
+            stat = statFile.read()
+        with open('/proc/' + str(pid) + '/status', 'r') as statusFile:
+            status = statusFile.read()
+        fds = len(os.listdir('/proc/' + str(pid) + '/fd'))
+    except OSError:
+        return None
+
+    # the process name is in brackets and can contain spaces, so only split what comes after it
+    fields = stat[stat.rfind(')')+2:].split()
+    sample = {'cpu time (s)': (int(fields[11]) + int(fields[12])) / CLOCK_TICKS, 'threads': int(fields[17]), 'fds': fds,
+              'rss (MB)': 0., 'peak rss (MB)': 0., 'voluntary context switches': 0, 'involuntary context switches': 0}
+    for line in status.splitlines():
+        key, _, value = line.partition(':')
+        if key == 'VmRSS':
+            sample['rss (MB)'] = int(value.split()[0]) / 1024.
+        elif key == 'VmHWM':
+            sample['peak rss (MB)'] = int(value.split()[0]) / 1024.
+        elif key == 'voluntary_ctxt_switches':
+            sample['voluntary context switches'] = int(value)
+        elif key == 'nonvoluntary_ctxt_switches':
+            sample['involuntary context switches'] = int(value)
+
+    return sample
+
+
+def sample_processes(getProcesses, sampleInterval, stopEvent, startTime, samples):
+    """
+    This function samples the resource usage of the processes of an experiment until it is told to stop. It is meant to
+    run in its own thread
+    
+    Inputs
+        getProcesses - function returning a dictionary of pid -> name of the processes to sample
+        sampleInterval - time between samples
+        stopEvent - threading event that stops the sampling
+        startTime - monotonic time the experiment was started, sample times are relative to it
+        samples - list the samples are appended to, one dictionary per process and sample
+
+    Outputs
+        None
+    """
+
+    lastCpu = dict()
+    while True:
+        now = time.monotonic() - startTime
+        for pid, name in getProcesses().items():
+            sample = read_process_sample(pid)
+            if sample is None:
+                continue
+            # cpu percentage since the previous sample of the process
+            if pid in lastCpu:
+                lastTime, lastCpuTime = lastCpu[pid]
+                sample['cpu (%)'] = 100. * (sample['cpu time (s)'] - lastCpuTime) / max(now - lastTime, 1e-6)
+            else:
+                sample['cpu (%)'] = np.nan
+            lastCpu[pid] = (now, sample['cpu time (s)'])
+            sample.update({'time (s)': now, 'name': name, 'pid': pid})
+            samples.append(sample)
+        if stopEvent.wait(sampleInterval):
+            break
+
+
+def summarize_resources(finalStats, samples):
+    """
+    This function turns the resource usage of the processes of an experiment into result columns
+    
+    Inputs
+        finalStats - dictionary of pid -> dictionary with the name, cpu time (s), peak rss (MB), voluntary and involuntary
+            context switches of each process when it finished
+        samples - list of samples taken while the experiment ran
+
+    Outputs
+        dictionary with the RESOURCE_COLUMNS results
+    """
+
+    summary = {column: np.nan for column in RESOURCE_COLUMNS}
+    # a broker hierarchy counts as the broker
+    broker = [stats for stats in finalStats.values() if stats['name'].startswith('broker')]
+    federates = [stats for stats in finalStats.values() if not stats['name'].startswith('broker')]
+
+    # the peak memory is not known for processes that were never sampled
+    brokerPeaks = [stats['peak rss (MB)'] for stats in broker if not np.isnan(stats['peak rss (MB)'])]
+    federatePeaks = [stats['peak rss (MB)'] for stats in federates if not np.isnan(stats['peak rss (MB)'])]
+
+    if broker:
+        summary['broker cpu time (s)'] = sum(stats['cpu time (s)'] for stats in broker)
+    if brokerPeaks:
+        summary['broker peak rss (MB)'] = max(brokerPeaks)
+    if federates:
+        summary['federate cpu time (s)'] = sum(stats['cpu time (s)'] for stats in federates)
+    if federatePeaks:
+        summary['federate peak rss max (MB)'] = max(federatePeaks)
+        summary['federate peak rss total (MB)'] = sum(federatePeaks)
+    if finalStats:
+        summary['voluntary context switches'] = sum(stats['voluntary context switches'] for stats in finalStats.values())
+        summary['involuntary context switches'] = sum(stats['involuntary context switches'] for stats in finalStats.values())
+
+    brokerSamples = [sample for sample in samples if sample['name'].startswith('broker')]
+    if brokerSamples:
+        summary['broker cpu max (%)'] = np.nanmax([sample['cpu (%)'] for sample in brokerSamples] + [0.])
+        summary['broker threads max'] = max(sample['threads'] for sample in brokerSamples)
+    if samples:
+        summary['open fds max'] = max(sample['fds'] for sample in samples)
+
+    return summary
+
+
+def write_resource_samples(experimentFolder, samples):
+    """
+    This function writes the resource time series of an experiment to resources.csv in the experiment folder
+    
+    Inputs
+        experimentFolder - Folder that the experiment exist in
+        samples - list of samples taken while the experiment ran
+
+    Outputs
+        None
+    """
+
+    columns = ['time (s)', 'name', 'pid', 'cpu (%)', 'cpu time (s)', 'rss (MB)', 'peak rss (MB)', 'voluntary context switches', 'involuntary context switches', 'threads', 'fds']
+    pd.DataFrame(samples, columns=columns).to_csv(Path(experimentFolder) / 'resources.csv', index=False)
+
+
+def reap_process(pid, block=False):
+    """
+    This function collects the exit status and resource usage of a child process if it has exited
+    
+    Inputs
+        pid - process id of the child process
+        block - wait for the process to exit instead of returning right away
+
+    Outputs
+        None if the process is still running, otherwise
+        return code (negative signal number if it was killed by a signal like subprocess uses)
+        dictionary with the cpu time (s), peak rss (MB), voluntary and involuntary context switches of the process
+    """
+
+    try:
+        reapedPid, status, usage = os.wait4(pid, 0 if block else os.WNOHANG)
+    except ChildProcessError:
+        return None
+    if reapedPid == 0:
+        return None
+
+    stats = {'cpu time (s)': usage.ru_utime + usage.ru_stime, 'peak rss (MB)': usage.ru_maxrss / 1024.,
+             'voluntary context switches': usage.ru_nvcsw, 'involuntary context switches': usage.ru_nivcsw}
+    return os.waitstatus_to_exitcode(status), stats
+
+
+def parse_job_failure(jobLine):
+    """
+    This function parses a failed job reported by the launch script (the output of "jobs -l")
+    
+    Inputs
+        jobLine - line describing the job, for example "[3]+  Exit 255    testFedHELICS send1.json 0 1 ..."
+
+    Outputs
+        name of the process (config file name for federates, broker for brokers)
+        exit code (None if it was killed by a signal)
+        signal number (None if it exited)
+    """
+
+    # bash only lists the pid for jobs that are still around, so it is optional
+    match = re.match(r'^\[\d+\][+-]?\s+(?:\d+\s+)?(.+?)\s{2,}(.+)$', jobLine.strip())
+    if match is None:
+        return jobLine.strip(), None, None
+    status, command = match.groups()
+    if command.startswith('(core dumped)'):
+        status, command = status + ' (core dumped)', command[len('(core dumped)'):].strip()
+
+    name = process_name(command)
+
+    if status.startswith('Exit'):
+        return name, int(status.split()[1]), None
+
+    # anything else is the description bash uses for the signal that killed the job
+    description = status.replace('(core dumped)', '').strip()
+    for sig in signal.Signals:
+        if signal.strsignal(sig) == description:
+            return name, None, int(sig)
+    return name, None, None
+
+
+def capped_command(command):
+    """
+    This function wraps a command so it ignores SIGXFSZ, which is inherited through the exec and by everything the
+    process starts, and waits for its stdin to close before it runs the command. It is started with a stdin pipe and
+    released by cap_file_size once the cap is set, so nothing is written before it. Writes past the cap then fail
+    instead of killing the process, so a runaway log is truncated while the process carries on. A preexec_fn would do
+    the same but is not safe while other threads run, which they do when experiments run in parallel
+    
+    Inputs
+        command - list with the command of the process
+
+    Outputs
+        list with the wrapped command
+    """
+
+    return ['sh', '-c', 'trap "" XFSZ; read gate; exec "$@"', 'sh'] + command
+
+
+def cap_file_size(popen, maxBytes):
+    """
+    This function caps the size of every file a process started with capped_command (and the processes it starts) writes
+    and then lets the process run its command by closing its stdin
+    
+    Inputs
+        popen - subprocess.Popen of the process, started with stdin=subprocess.PIPE
+        maxBytes - largest size in bytes a file may grow to
+
+    Outputs
+        None
+    """
+
+    try:
+        resource.prlimit(popen.pid, resource.RLIMIT_FSIZE, (maxBytes, maxBytes))
+    except ProcessLookupError:
+        # the process is already gone, there is nothing left to cap
+        pass
+    popen.stdin.close()
+
+
+def parse_cpu_list(cpuList):
+    """
+    This function parses a kernel cpu list (e.g. 0-3,8-11 from sysfs)
+    
+    Inputs
+        cpuList - text with the cpu list
+
+    Outputs
+        cpus - sorted list of the cpus
+    """
+
+    cpus = []
+    for part in cpuList.strip().split(','):
+        if '-' in part:
+            first, last = part.split('-')
+            cpus += range(int(first), int(last)+1)
+        elif part:
+            cpus.append(int(part))
+    return sorted(cpus)
+
+
+def format_cpu_list(cpus):
+    """
+    This function formats cpus as a kernel cpu list (e.g. 0-3,8-11)
+    
+    Inputs
+        cpus - list of cpus
+
+    Outputs
+        cpuList - text with the cpu list
+    """
+
+    ranges = []
+    for cpu in sorted(set(cpus)):
+        if ranges and ranges[-1][1] == cpu - 1:
+            ranges[-1][1] = cpu
+        else:
+            ranges.append([cpu, cpu])
+    return ','.join(str(first) if first == last else str(first) + '-' + str(last) for first, last in ranges)
+
+
+def numa_nodes():
+    """
+    This function reads the NUMA nodes of the machine and their cpus from sysfs. Machines without NUMA information are
+    one node with every cpu
+    
+    Inputs
+        None
+
+    Outputs
+        nodes - list with the sorted cpus of every NUMA node
+    """
+
+    nodes = []
+    for nodeFolder in sorted(Path('/sys/devices/system/node').glob('node[0-9]*'), key=lambda folder: int(folder.name[4:])):
+        try:
+            with open(nodeFolder / 'cpulist') as infile:
+                cpus = parse_cpu_list(infile.read())
+        except OSError:
+            continue
+        if cpus:
+            nodes.append(cpus)
+    if not nodes:
+        nodes = [sorted(os.sched_getaffinity(0))]
+    return nodes
+
+
+def cpu_placement(processNames, cpuSet=None, policy='compact', brokerCores=1, coresPerFederate=None):
+    """
+    This function decides the cpus every process of an experiment is pinned to. The brokers get cores of their own on
+    the first NUMA node, and the federates are either packed onto the remaining cores NUMA node by NUMA node (compact) or
+    dealt out to the NUMA nodes in turn (spread)
+    
+    Inputs
+        processNames - names of the processes of the experiment in launch order, the brokers start with broker
+        cpuSet - list of cpus the experiment may use (None for every cpu the test suite may run on)
+        policy - compact or spread
+        brokerCores - number of cores dedicated to the brokers (0 lets the brokers share the cores of the federates)
+        coresPerFederate - number of cores every federate is pinned to, below one several federates share a core (0.25
+            puts four federates on every core). None pins the federates to every federate core of the experiment
+            (compact) or of their NUMA node (spread)
+
+    Outputs
+        cpus - list with the cpus of every process
+    """
+
+    if policy not in ['compact', 'spread']:
+        raise Exception('unknown cpu placement ' + str(policy) + ' (compact or spread)')
+
+    allowed = set(cpuSet if cpuSet is not None else os.sched_getaffinity(0))
+    nodes = [[cpu for cpu in node if cpu in allowed] for node in numa_nodes()]
+    # cpus the kernel did not list under a node still belong to the experiment
+    listed = set(cpu for node in nodes for cpu in node)
+    nodes = [node for node in nodes if node] + ([sorted(allowed - listed)] if allowed - listed else [])
+    if brokerCores >= len(allowed):
+        raise Exception(str(brokerCores) + ' broker cores leave none of the ' + str(len(allowed)) + ' cores for the federates')
+
+    # the broker cores come off the front of the nodes so a single socket machine keeps the broker on the first cores
+    federateCpus = [cpu for node in nodes for cpu in node]
+    brokerCpus = federateCpus[:brokerCores] if brokerCores > 0 else federateCpus
+    nodes = [[cpu for cpu in node if cpu not in brokerCpus or brokerCores == 0] for node in nodes]
+    nodes = [node for node in nodes if node]
+    pools = [[cpu for node in nodes for cpu in node]] if policy == 'compact' else nodes
+
+    federateCount = sum(1 for name in processNames if not name.startswith('broker'))
+    if coresPerFederate is not None:
+        if coresPerFederate <= 0:
+            raise Exception('cores per federate has to be positive')
+        # federates that share a core and cores that a federate spans, one of them is always 1
+        share = max(1, int(round(1. / coresPerFederate)))
+        width = max(1, int(round(coresPerFederate)))
+        for poolIdx, pool in enumerate(pools):
+            poolFederates = len(range(poolIdx, federateCount, len(pools)))
+            needed = -(-poolFederates // share) * width
+            if needed > len(pool):
+                raise Exception('placing ' + str(federateCount) + ' federates with ' + str(coresPerFederate) + ' cores each needs ' + str(needed) + ' cores on ' +
+                                ('the experiment' if policy == 'compact' else 'NUMA node ' + str(poolIdx)) + ' but only ' + str(len(pool)) + ' are left for the federates')
+
+    cpus = []
+    federateIdx = 0
+    for name in processNames:
+        if name.startswith('broker'):
+            cpus.append(brokerCpus)
+            continue
+        pool = pools[federateIdx % len(pools)]
+        slot = federateIdx // len(pools)
+        if coresPerFederate is None:
+            cpus.append(pool)
+        else:
+            cpus.append(pool[(slot // share) * width:(slot // share + 1) * width])
+        federateIdx += 1
+
+    return cpus
+
+
+def progress_watchdog(experimentFolder, getPids, stallWindow, stallCpu=0.05, checkInterval=1.):
+    """
+    This function makes a watchdog that tells when a running experiment has stopped advancing. The experiment advances
+    while the heartbeat of any federate changes (its granted time in <name>.progress, see LOG_PROGRESS), a process
+    starts or exits, or the processes keep using more than stallCpu cores, which covers the initialization before the
+    first time is granted
+    
+    Inputs
+        experimentFolder - Folder that the experiment runs in
+        getPids - function that returns the pids of the running processes of the experiment
+        stallWindow - time in seconds the experiment may go without advancing before it is considered stalled
+        stallCpu - number of cores the processes have to keep busy to count as advancing without a heartbeat
+        checkInterval - minimum time between looking at the heartbeats and processes, the checks are skipped until then
+
+    Outputs
+        check - function that returns the time in seconds the experiment has not advanced for once that reaches the
+            stall window, None otherwise
+    """
+
+    experimentFolder = Path(experimentFolder)
+    state = {'next check': 0., 'last change': time.monotonic(), 'heartbeats': None, 'pids': None, 'cpu time': 0.}
+
+    def cpu_time(pid):
+        try:
+            with open('/proc/' + str(pid) + '/stat', 'r') as statFile:
+                stat = statFile.read()
+        except OSError:
+            return 0.
+        fields = stat[stat.rfind(')')+2:].split()
+        return (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+
+    def check():
+        now = time.monotonic()
+        if now < state['next check']:
+            return None
+        state['next check'] = now + checkInterval
+
+        heartbeats = []
+        for progressFile in sorted(experimentFolder.glob('*.progress')):
+            try:
+                with open(progressFile, 'rb') as infile:
+                    heartbeats.append(infile.read())
+            except OSError:
+                continue
+        pids = set(getPids())
+        cpuTime = sum(cpu_time(pid) for pid in pids)
+
+        if heartbeats != state['heartbeats'] or pids != state['pids'] or cpuTime - state['cpu time'] > stallCpu * (now - state['last change']):
+            state.update({'last change': now, 'heartbeats': heartbeats, 'pids': pids, 'cpu time': cpuTime})
+            return None
+        if now - state['last change'] >= stallWindow:
+            return now - state['last change']
+        return None
+
+    return check
+
+
+def profiled_processes(processNames, profileFederates):
+    """
+    This function picks the processes of an experiment that are profiled, every broker and a sample of the federate
+    processes spread evenly over the federation so the profiling overhead stays bounded at high federate counts
+    
+    Inputs
+        processNames - list with the names of the processes of the experiment, the brokers first
+        profileFederates - number of federate processes to profile (more than there are profiles all of them)
+
+    Outputs
+        set with the names of the processes to profile
+    """
+
+    brokers = [name for name in processNames if name.startswith('broker')]
+    federates = [name for name in processNames if not name.startswith('broker')]
+    sampled = min(max(int(profileFederates), 0), len(federates))
+    # evenly spaced from the first federate on, which is the echoer of a ManyToOne experiment
+    return set(brokers + [federates[(idx * len(federates)) // sampled] for idx in range(0, sampled)])
+
+
+def profile_command(command, name, profileRecord=False, profileFrequency=99):
+    """
+    This function wraps the command of a process in perf stat, which writes the PERF_EVENTS counters of the process and
+    all of its threads to <name>.perfstat, and optionally in perf record, which samples its call stacks into
+    <name>.perf.data
+    
+    Inputs
+        command - list with the command of the process
+        name - name of the process
+        profileRecord - flag to also sample the call stacks of the process
+        profileFrequency - samples per second perf record takes
+
+    Outputs
+        list with the wrapped command
+    """
+
+    wrapped = ['perf', 'stat', '-x', ',', '-e', ','.join(PERF_EVENTS), '-o', name + '.perfstat', '--'] + command
+    if profileRecord:
+        # perf stat goes inside so its counters only count the process, perf record samples it and its children
+        wrapped = ['perf', 'record', '-q', '-g', '-F', str(profileFrequency), '-o', name + '.perf.data', '--'] + wrapped
+    return wrapped
+
+
+def profiled_child(pid):
+    """
+    This function finds the process a profiled process runs under its perf wrappers (see profile_command), perf record
+    and perf stat both start the command they measure as a child process
+    
+    Inputs
+        pid - process id of the outermost perf process
+
+    Outputs
+        process id of the measured process, None while perf has not started it yet
+    """
+
+    wrappers = 0
+    while True:
+        try:
+            with open('/proc/' + str(pid) + '/comm', 'r') as commFile:
+                if commFile.read().strip() != 'perf':
+                    # the launched process is not perf yet while it waits to be released (see capped_command)
+                    return pid if wrappers else None
+            with open('/proc/' + str(pid) + '/task/' + str(pid) + '/children', 'r') as childrenFile:
+                children = childrenFile.read().split()
+        except OSError:
+            return None
+        if not children:
+            return None
+        pid = int(children[0])
+        wrappers += 1
+
+
+def read_perf_stat(statFile):
+    """
+    This function reads the counters perf stat wrote in CSV mode (perf stat -x ,)
+    
+    Inputs
+        statFile - path to the <name>.perfstat file
+
+    Outputs
+        dictionary with the value of every counter by its event name (NaN for counters that were not counted)
+    """
+
+    counters = dict()
+    if not os.path.isfile(statFile):
+        return counters
+    with open(statFile) as infile:
+        for line in infile:
+            fields = line.strip().split(',')
+            if line.startswith('#') or len(fields) < 3:
+                continue
+            # the events of an unprivileged run carry a :u suffix
+            event = fields[2].split(':')[0]
+            try:
+                counters[event] = float(fields[0])
+            except ValueError:
+                counters[event] = np.nan
+    return counters
+
+
+def collect_profile(experimentFolder):
+    """
+    This function collects the counters of the profiled processes of an experiment into profile.csv and summarizes them
+    
+    Inputs
+        experimentFolder - Folder that the experiment ran in
+
+    Outputs
+        results - dictionary with the PROFILE_COLUMNS results
+    """
+
+    rows = []
+    for statFile in sorted(Path(experimentFolder).glob('*.perfstat')):
+        counters = read_perf_stat(statFile)
+        rows.append(dict({event: counters.get(event, np.nan) for event in PERF_EVENTS}, name=statFile.name[:-len('.perfstat')]))
+    profile = pd.DataFrame(rows, columns=['name'] + PERF_EVENTS)
+    profile.to_csv(Path(experimentFolder) / 'profile.csv', index=False)
+
+    results = {'profiled federates': int((~profile['name'].str.startswith('broker')).sum())}
+    for role, data in [('broker', profile[profile['name'].str.startswith('broker')].sum(numeric_only=True, min_count=1)),
+                       ('federate', profile[~profile['name'].str.startswith('broker')].mean(numeric_only=True))]:
+        results[role + ' cycles'] = data.get('cycles', np.nan)
+        results[role + ' instructions'] = data.get('instructions', np.nan)
+        results[role + ' instructions per cycle'] = data.get('instructions', np.nan) / data.get('cycles', np.nan) if data.get('cycles', 0) > 0 else np.nan
+        results[role + ' context switches'] = data.get('context-switches', np.nan)
+        results[role + ' cache misses'] = data.get('cache-misses', np.nan)
+    return results
+
+
+def collapse_stacks(dataFile):
+    """
+    This function folds the call stacks perf record sampled for a process into <name>.folded, a line with the frames
+    from the outermost to the innermost separated by semicolons and the number of samples per stack, and renders them
+    into <name>.svg when flamegraph.pl is on the PATH. The perf data is removed once it is folded
+    
+    Inputs
+        dataFile - path to the <name>.perf.data file
+
+    Outputs
+        number of samples folded
+    """
+
+    dataFile = Path(dataFile)
+    name = str(dataFile)[:-len('.perf.data')]
+    script = subprocess.run(['perf', 'script', '-i', str(dataFile)], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, universal_newlines=True)
+    if script.returncode != 0:
+        print("WARNING: could not read the stacks in " + str(dataFile))
+        return 0
+
+    stacks = dict()
+    # every sample is a header line with the command followed by a line per frame, innermost first, and a blank line
+    for sample in script.stdout.split('\n\n'):
+        lines = [line for line in sample.split('\n') if line.strip()]
+        if not lines:
+            continue
+        frames = []
+        for line in lines[1:]:
+            parts = line.strip().split(' ', 1)
+            frames.append(parts[1].rsplit(' (', 1)[0].split('+0x')[0] if len(parts) > 1 else parts[0])
+        stack = ';'.join([lines[0].split()[0]] + frames[::-1])
+        stacks[stack] = stacks.get(stack, 0) + 1
+
+    with open(name + '.folded', 'w') as outfile:
+        for stack, count in sorted(stacks.items()):
+            outfile.write(stack + ' ' + str(count) + '\n')
+    if shutil.which('flamegraph.pl') is not None:
+        with open(name + '.svg', 'w') as outfile:
+            subprocess.run(['flamegraph.pl', '--title', os.path.basename(name), name + '.folded'], stdout=outfile, stderr=subprocess.DEVNULL)
+    os.remove(dataFile)
+    return sum(stacks.values())
+
+
+def launch_experiment(experimentFolder, simulationTimeout, cpuSet=None, startBatchSize=None, startBatchDelay=0., terminateTimeout=5., sampleInterval=1., logLatency=True, cpuPlacement=None, brokerCores=1, coresPerFederate=None, logCap=None, stallWindow=None, stallCpu=0.05, profileFederates=None, profileRecord=False, profileFrequency=99):
+    """
+    This function launches the broker and federates of an experiment from its launch manifest (launch.json) and waits for
+    them in a single loop. The first process that exits with a non-zero status or signal stops the experiment right away.
+    Every process runs in its own session and only those processes are torn down when the experiment fails or times out.
+    With a stall window a watchdog also stops the experiment as soon as it has not advanced for that long, see
+    progress_watchdog. The resource usage of every process is sampled while it runs (resources.csv) and taken from the
+    kernel when it is reaped. With profiling the brokers and a sample of the federates run under perf, see
+    profiled_processes and profile_command. Their samples are taken from the process perf runs (see profiled_child),
+    while the usage taken when they are reaped includes perf
+    
+    Inputs
+        experimentFolder - Folder that the experiment exist in
+        simulationTimeout - Timeout value before we consider the experiment failed
+        cpuSet - list of cpus the experiment is pinned to (None runs it on any cpu)
+        startBatchSize - number of federates started at a time (None starts them all at once)
+        startBatchDelay - time between starting batches of federates
+        terminateTimeout - time processes get to exit after SIGTERM before they are killed during teardown
+        sampleInterval - time between resource samples of the running processes (None disables the sampling)
+        logLatency - flag to have every federate log the work time and time request latency of each step
+        cpuPlacement - compact or spread to pin every broker and federate to its own cpus within the cpu set, see
+            cpu_placement (None runs them on any cpu of the cpu set)
+        brokerCores - number of cores dedicated to the brokers with a cpu placement
+        coresPerFederate - number of cores every federate gets with a cpu placement (None for every core of the pool)
+        logCap - size in bytes every file written by a process is truncated at, see capped_command and cap_file_size (None for no cap)
+        stallWindow - time in seconds the experiment may go without advancing before it is stopped (None for no watchdog)
+        stallCpu - number of cores the processes have to keep busy to count as advancing without a heartbeat
+        profileFederates - number of federate processes profiled together with the brokers (None for no profiling)
+        profileRecord - flag to also sample the call stacks of the profiled processes with perf record
+        profileFrequency - samples per second perf record takes
+
+    Outputs
+        results - dictionary with
+            status - 0 if successfull, 1 if failed, and 2 if timed out or stalled
+            stalled - flag that the watchdog stopped the experiment
+            failed process - name of the first process that failed (None if nothing failed)
+            exit code - exit code of the first process that failed (None if it was signaled)
+            signal - signal that killed the first process that failed (None if it exited)
+            spawn time (wall) - time spent starting processes, not counting the delay between batches
+            launch time (wall) - time from starting the first process until the last one exited
+            RESOURCE_COLUMNS - cpu, memory, and context switches of the broker and federates
+    """
+
+    experimentFolder = Path(experimentFolder)
+    with open(experimentFolder / 'launch.json', 'r') as infile:
+        manifest = json.load(infile)
+    processes = manifest['processes']
+
+    baseEnv = dict(os.environ)
+    baseEnv.update(manifest['env'])
+    baseEnv['LOG_LATENCY'] = '1' if logLatency else '0'
+    baseEnv['LOG_PROGRESS'] = '1' if stallWindow is not None else '0'
+
+    results = {'status': 1, 'failed process': None, 'exit code': None, 'signal': None, 'stalled': False, 'spawn time (wall)': 0., 'launch time (wall)': 0.}
+
+    # the profiled processes are wrapped before anything starts so a missing perf does not leave a half started experiment
+    profiled = set()
+    if profileFederates is not None:
+        if shutil.which('perf') is None:
+            raise Exception('profiling needs perf on the PATH')
+        profiled = profiled_processes([process['name'] for process in processes], profileFederates)
+        for process in processes:
+            if process['name'] in profiled:
+                process['command'] = profile_command(process['command'], process['name'], profileRecord, profileFrequency)
+
+    # the affinity of the launching thread is inherited by every process it starts
+    if cpuSet is not None or cpuPlacement is not None:
+        previousAffinity = os.sched_getaffinity(0)
+    if cpuSet is not None:
+        os.sched_setaffinity(0, cpuSet)
+    if cpuPlacement is not None:
+        for process, cpus in zip(processes, cpu_placement([process['name'] for process in processes], cpuSet, cpuPlacement, brokerCores, coresPerFederate)):
+            process['cpus'] = cpus
+
+    running = dict()
+    alive = set()
+    openFiles = []
+    spawnTime = 0.
+    startTime = time.monotonic()
+
+    # the samples and the watchdog look at the process a perf wrapper measures instead of at perf
+    measuredPids = dict()
+
+    def measured_processes():
+        processes = dict()
+        for pid in list(alive):
+            if running[pid]['name'] in profiled and pid not in measuredPids:
+                child = profiled_child(pid)
+                if child is None:
+                    continue
+                measuredPids[pid] = child
+            processes[measuredPids.get(pid, pid)] = running[pid]['name']
+        return processes
+
+    samples = []
+    stopSampling = threading.Event()
+    if sampleInterval is not None:
+        sampler = threading.Thread(target=sample_processes, args=(measured_processes, sampleInterval, stopSampling, startTime, samples), daemon=True)
+        sampler.start()
+
+    try:
+        # the brokers go first, the federates follow in batches
+        brokerCount = next((idx for idx, process in enumerate(processes) if not process['name'].startswith('broker')), len(processes))
+        batches = [processes[:brokerCount]]
+        federates = processes[brokerCount:]
+        if startBatchSize is None or startBatchSize < 1:
+            batches.append(federates)
+        else:
+            batches += [federates[idx:idx+startBatchSize] for idx in range(0, len(federates), startBatchSize)]
+
+        for batchNumber, batch in enumerate(batches):
+            if batchNumber > 1 and startBatchDelay > 0:
+                time.sleep(startBatchDelay)
+            for process in batch:
+                env = baseEnv
+                if process['env']:
+                    env = dict(baseEnv)
+                    env.update(process['env'])
+                if process['log'] is not None:
+                    logFile = open(experimentFolder / process['log'], 'w')
+                    openFiles.append(logFile)
+                else:
+                    logFile = subprocess.DEVNULL
+                if cpuPlacement is not None:
+                    os.sched_setaffinity(0, process['cpus'])
+                spawnStart = time.monotonic()
+                popen = subprocess.Popen(process['command'] if logCap is None else capped_command(process['command']), cwd=experimentFolder, env=env, stdout=logFile,
+                                         stderr=subprocess.STDOUT, start_new_session=True, stdin=None if logCap is None else subprocess.PIPE)
+                if logCap is not None:
+                    cap_file_size(popen, logCap)
+                spawnStop = time.monotonic()
+                spawnTime += spawnStop - spawnStart
+                running[popen.pid] = {'name': process['name'], 'popen': popen, 'start': spawnStart - startTime, 'spawn': spawnStop - spawnStart, 'stop': None, 'stats': None, 'cpus': process.get('cpus', cpuSet)}
+                alive.add(popen.pid)
+    finally:
+        if cpuSet is not None or cpuPlacement is not None:
+            os.sched_setaffinity(0, previousAffinity)
+    results['spawn time (wall)'] = spawnTime
+
+    # a single wait loop, pidfds let us sleep until any of the processes exits
+    poller = None
+    pidfds = dict()
+    if hasattr(os, 'pidfd_open'):
+        poller = select.poll()
+        for pid in running:
+            try:
+                pidfd = os.pidfd_open(pid)
+            except OSError:
+                continue
+            pidfds[pid] = pidfd
+            poller.register(pidfd, select.POLLIN)
+    pidfdPids = {pidfd: pid for pid, pidfd in pidfds.items()}
+    # the loop only sleeps on the pidfds when every process has one, otherwise it polls
+    pollPidfds = poller is not None and len(pidfds) == len(running)
+
+    def close_pidfd(pid):
+        # a reaped process stays readable forever, so its pidfd has to leave the poller or the loop spins
+        pidfd = pidfds.pop(pid, None)
+        if pidfd is not None:
+            poller.unregister(pidfd)
+            os.close(pidfd)
+
+    # the watchdog wakes the loop up a few times per stall window, a deadlocked federation does not exit on its own
+    watchdog = None
+    waitInterval = simulationTimeout
+    if stallWindow is not None:
+        waitInterval = min(max(stallWindow / 4., 0.1), 5.)
+        watchdog = progress_watchdog(experimentFolder, lambda: list(measured_processes()), stallWindow, stallCpu, waitInterval)
+
+    timedOut = False
+    while alive:
+        remaining = simulationTimeout - (time.monotonic() - startTime)
+        if remaining <= 0:
+            timedOut = True
+            break
+        if pollPidfds:
+            ready = [pidfdPids[fd] for fd, _ in poller.poll(min(remaining, waitInterval) * 1000.)]
+        else:
+            time.sleep(min(0.05, remaining))
+            ready = list(alive)
+
+        for pid in ready:
+            if pid not in alive:
+                continue
+            reaped = reap_process(pid)
+            if reaped is None:
+                continue
+            # wait4 is used instead of the popen so the resource usage of the process comes back with its status
+            running[pid]['popen'].returncode, running[pid]['stats'] = reaped
+            alive.discard(pid)
+            close_pidfd(pid)
+            running[pid]['stop'] = time.monotonic() - startTime
+            returnCode = running[pid]['popen'].returncode
+            if returnCode != 0 and results['failed process'] is None:
+                results['failed process'] = running[pid]['name']
+                if returnCode < 0:
+                    results['signal'] = -returnCode
+                else:
+                    results['exit code'] = returnCode
+        if results['failed process'] is not None:
+            break
+        if watchdog is not None and alive and watchdog() is not None:
+            results['stalled'] = True
+            timedOut = True
+            break
+
+    # whatever is still running after a failure or timeout is torn down, only the processes we started are touched
+    for pid in alive:
+        try:
+            os.killpg(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+    deadline = time.monotonic() + terminateTimeout
+    for pid in list(alive):
+        reaped = reap_process(pid)
+        while reaped is None and time.monotonic() < deadline:
+            time.sleep(0.05)
+            reaped = reap_process(pid)
+        if reaped is None:
+            try:
+                os.killpg(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            reaped = reap_process(pid, block=True)
+        if reaped is not None:
+            running[pid]['popen'].returncode, running[pid]['stats'] = reaped
+        alive.discard(pid)
+        close_pidfd(pid)
+    stopSampling.set()
+    # each process leads its own session, so this also takes care of anything it left behind
+    for pid in running:
+        try:
+            os.killpg(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+    for pid in list(pidfds):
+        close_pidfd(pid)
+    for openFile in openFiles:
+        openFile.close()
+
+    results['launch time (wall)'] = time.monotonic() - startTime
+    if timedOut:
+        results['status'] = 2
+    elif results['failed process'] is None:
+        results['status'] = 0
+
+    if sampleInterval is not None:
+        sampler.join()
+        write_resource_samples(experimentFolder, samples)
+    finalStats = {pid: dict(process['stats'], name=process['name']) for pid, process in running.items() if process['stats'] is not None}
+    # the kernel's maxrss includes the memory of the forked python before exec, the sampled high water mark does not
+    peakRss = dict()
+    for sample in samples:
+        peakRss[sample['name']] = max(peakRss.get(sample['name'], 0.), sample['peak rss (MB)'])
+    for stats in finalStats.values():
+        stats['peak rss (MB)'] = peakRss.get(stats['name'], np.nan)
+    results.update(summarize_resources(finalStats, samples))
+
+    rows = []
+    for pid, process in running.items():
+        returnCode = process['popen'].returncode
+        rows.append([process['name'], pid, process['start'], process['spawn'], process['stop'],
+                     returnCode if returnCode is not None and returnCode >= 0 else None,
+                     -returnCode if returnCode is not None and returnCode < 0 else None,
+                     process['stop'] is None, None if process['cpus'] is None else format_cpu_list(process['cpus'])])
+    launchData = pd.DataFrame(rows, columns=['name', 'pid', 'start (s)', 'spawn (s)', 'stop (s)', 'exit code', 'signal', 'torn down', 'cpus'])
+    launchData.astype({'exit code': 'Int64', 'signal': 'Int64'}).to_csv(experimentFolder / 'launch.csv', index=False)
+
+    return results
+
+
+def run_launch_script(experimentFolder, simulationTimeout, cpuSet=None, pollInterval=0.5, terminateTimeout=5., sampleInterval=1., logLatency=True, logCap=None, stallWindow=None, stallCpu=0.05):
+    """
+    This function runs the launch script (run.sh) of an experiment. The script is started in its own session, every
+    process in it is tracked and only that session is torn down on a timeout or failure. The processes are not children of
+    this one, so their resource usage only comes from sampling them (the last sample of each process is its final usage)
+    
+    Inputs
+        experimentFolder - Folder that the experiment exist in
+        simulationTimeout - Timeout value before we consider the experiment failed
+        cpuSet - list of cpus the experiment is pinned to (None runs it on any cpu)
+        pollInterval - interval between looking for new processes in the experiment
+        terminateTimeout - time processes get to exit after SIGTERM before they are killed during teardown
+        sampleInterval - time between resource samples of the running processes (None disables the sampling)
+        logLatency - flag to have every federate log the work time and time request latency of each step
+        logCap - size in bytes every file written by the launch script and its processes is truncated at (None for no cap)
+        stallWindow - time in seconds the experiment may go without advancing before it is stopped, see progress_watchdog
+            (None for no watchdog)
+        stallCpu - number of cores the processes have to keep busy to count as advancing without a heartbeat
+
+    Outputs
+        results - dictionary with
+            status - 0 if successfull, 1 if failed, and 2 if timed out or stalled
+            stalled - flag that the watchdog stopped the experiment
+            failed process - name of the first process that failed (None if nothing failed)
+            exit code - exit code of the first process that failed (None if it was signaled)
+            signal - signal that killed the first process that failed (None if it exited)
+            spawn time (wall) - not known for the launch script
+            launch time (wall) - time the launch script ran for
+            RESOURCE_COLUMNS - cpu, memory, and context switches of the broker and federates
+    """
+
+    experimentFolder = Path(experimentFolder)
+    results = {'status': 1, 'failed process': None, 'exit code': None, 'signal': None, 'stalled': False, 'spawn time (wall)': np.nan, 'launch time (wall)': 0.}
+
+    # the launch script writes the jobs that failed to this file, remove any left over from a previous run
+    failureFile = experimentFolder / 'failures.out'
+    if os.path.isfile(failureFile):
+        os.remove(failureFile)
+
+    command = ['./run.sh']
+    if cpuSet is not None:
+        # the affinity is inherited by the broker and every federate started by the launch script
+        command = ['taskset', '-c', ','.join(str(cpu) for cpu in cpuSet)] + command
+
+    logFile = open(experimentFolder / "sim.out", "w")
+    startTime = time.monotonic()
+    # the launch script does not set the latency logging or heartbeat so the federates pick them up from here
+    env = dict(os.environ, LOG_LATENCY='1' if logLatency else '0', LOG_PROGRESS='1' if stallWindow is not None else '0')
+    process = subprocess.Popen(command if logCap is None else capped_command(command), cwd=experimentFolder, env=env, stdout=logFile, start_new_session=True,
+                               stdin=None if logCap is None else subprocess.PIPE)
+    if logCap is not None:
+        cap_file_size(process, logCap)
+
+    # keep track of every process in the session until the launch script exits or we run out of time
+    processes = dict()
+    returnCode = None
+
+    samples = []
+    stopSampling = threading.Event()
+    if sampleInterval is not None:
+        # the shells of the launch script are not part of the experiment
+        getProcesses = lambda: {pid: process_name(entry[0]) for pid, entry in list(processes.items()) if 'run.sh' not in entry[0] and not entry[0].startswith('taskset')}
+        sampler = threading.Thread(target=sample_processes, args=(getProcesses, sampleInterval, stopSampling, startTime, samples), daemon=True)
+        sampler.start()
+
+    watchdog = None
+    if stallWindow is not None:
+        watchdog = progress_watchdog(experimentFolder, lambda: find_session_processes(process.pid), stallWindow, stallCpu, min(max(stallWindow / 4., pollInterval), 5.))
+
+    while returnCode is None:
+        track_session_processes(process.pid, processes, startTime)
+        remaining = simulationTimeout - (time.monotonic() - startTime)
+        if remaining <= 0:
+            break
+        if watchdog is not None and watchdog() is not None:
+            results['stalled'] = True
+            break
+        try:
+            returnCode = process.wait(timeout=min(pollInterval, remaining))
+        except subprocess.TimeoutExpired:
+            pass
+    results['launch time (wall)'] = time.monotonic() - startTime
+
+    # anything left in the session is either still running after a timeout or was orphaned by a failure
+    terminate_session(process.pid, terminateTimeout)
+    if returnCode is None:
+        process.wait()
+    logFile.close()
+
+    stopSampling.set()
+    finalStats = dict()
+    if sampleInterval is not None:
+        sampler.join()
+        write_resource_samples(experimentFolder, samples)
+        for sample in samples:
+            finalStats[sample['pid']] = sample
+    results.update(summarize_resources(finalStats, samples))
+
+    pd.DataFrame([[pid] + processes[pid] for pid in sorted(processes)], columns=['pid', 'command', 'first seen (s)', 'last seen (s)']).to_csv(experimentFolder / 'processes.csv', index=False)
+
+    if returnCode is None:
+        results['status'] = 2
+    elif returnCode == 0:
+        results['status'] = 0
+    elif os.path.isfile(failureFile) and os.path.getsize(failureFile) > 0:
+        with open(failureFile, 'r') as failures:
+            results['failed process'], results['exit code'], results['signal'] = parse_job_failure(failures.readline())
+    elif returnCode < 0:
+        results['failed process'], results['signal'] = 'run.sh', -returnCode
+    else:
+        results['failed process'], results['exit code'] = 'run.sh', returnCode
+
+    return results
+
+
+def run_experiment(experimentFolder, simulationTimeout, cpuSet=None, launcher='python', startBatchSize=None, startBatchDelay=0., terminateTimeout=5., sampleInterval=1., logLatency=True, cpuPlacement=None, brokerCores=1, coresPerFederate=None, stagingFolder=None, compressLogs=False, logCap=None, stallWindow=None, stallCpu=0.05, profileFederates=None, profileRecord=False, profileFrequency=99):
+    """
+    This function executes an experiment and collects the results. With a staging folder (e.g. on tmpfs) the experiment
+    runs in a copy there so the logs are written to memory, and its outputs are moved back once the processes are done
+    
+    Inputs
+        experimentFolder - Folder that the experiment exist in
+        simulationTimeout - Timeout value before we consider the experiment failed
+        cpuSet - list of cpus the experiment is pinned to (None runs it on any cpu)
+        launcher - python to start the processes with launch_experiment, bash to run the exported run.sh
+        startBatchSize - number of federates started at a time by the python launcher (None starts them all at once)
+        startBatchDelay - time between starting batches of federates for the python launcher
+        terminateTimeout - time processes get to exit after SIGTERM before they are killed during teardown
+        sampleInterval - time between resource samples of the running processes (None disables the sampling)
+        logLatency - flag to have every federate log the work time and time request latency of each step
+        cpuPlacement - compact or spread to pin every process to its own cpus with the python launcher, see cpu_placement
+        brokerCores - number of cores dedicated to the brokers with a cpu placement
+        coresPerFederate - number of cores every federate gets with a cpu placement (None for every core of the pool)
+        stagingFolder - folder the experiment is copied to and run in, e.g. /dev/shm (None runs it in place)
+        compressLogs - flag to gzip the logs (*.out) once the experiment is done
+        logCap - size in bytes every log (and any other file the processes write) is truncated at (None for no cap)
+        stallWindow - time in seconds the experiment may go without advancing before it is stopped, the federates then
+            keep their granted time in <name>.progress, see progress_watchdog (None for no watchdog)
+        stallCpu - number of cores the processes have to keep busy to count as advancing without a heartbeat
+        profileFederates - number of federate processes profiled with perf together with the brokers by the python
+            launcher, the counters of every profiled process go to profile.csv (None for no profiling)
+        profileRecord - flag to also sample the call stacks of the profiled processes, they are folded into
+            <name>.folded (and <name>.svg flame graphs with flamegraph.pl) once the experiment is done
+        profileFrequency - samples per second perf record takes
+
+    Outputs
+        results - dictionary with
+            status - 0 if successfull, 1 if failed, and 2 if timed out or stalled
+            stalled - flag that the watchdog stopped the experiment
+            timeout (s) - simulation timeout the experiment ran with
+            initialization/execution/closing time (cpu) and (wall)
+            spawn time (wall) and launch time (wall)
+            RESOURCE_COLUMNS - cpu, memory, and context switches of the broker and federates
+            LATENCY_COLUMNS - time request latency percentiles over every step of every federate
+            THROUGHPUT_COLUMNS - messages, payload bytes, and time steps per second of the main loop
+            LOG_COLUMNS - bytes written to the logs and the number of logs that hit the cap
+            PROFILE_COLUMNS - counters of the brokers and the profiled federates (only with profiling)
+            straggler - federate with the most work time (None without latency logging)
+            failed process - name of the first process that failed (None if nothing failed)
+            exit code - exit code of the first process that failed (None if it was signaled)
+            signal - signal that killed the first process that failed (None if it exited)
+    """
+    
+    experimentFolder = Path(experimentFolder)
+
+    results = {'status': 1,
+               'initialization time (cpu)': 0., 'execution time (cpu)': 0., 'closing time (cpu)': 0.,
+               'initialization time (wall)': 0., 'execution time (wall)': 0., 'closing time (wall)': 0.,
+               'failed process': None, 'exit code': None, 'signal': None, 'stalled': False, 'timeout (s)': simulationTimeout}
+
+    # remove the timing files left over when an experiment is run more than once
+    if os.path.isfile(experimentFolder / 'timeDataLogging.csv'):
+        os.remove(experimentFolder / 'timeDataLogging.csv')
+    for stepFile in itertools.chain(experimentFolder.glob('*.latency'), experimentFolder.glob('*.progress'), experimentFolder.glob('*.perfstat'),
+                                    experimentFolder.glob('*.perf.data'), experimentFolder.glob('*.folded'), experimentFolder.glob('*.svg')):
+        os.remove(stepFile)
+
+    # only the inputs of the experiment are staged, everything the run writes is new in the staging folder
+    runFolder = experimentFolder
+    if stagingFolder is not None:
+        os.makedirs(stagingFolder, exist_ok=True)
+        runFolder = Path(tempfile.mkdtemp(prefix=experimentFolder.name + '_', dir=stagingFolder))
+        shutil.copytree(experimentFolder, runFolder, dirs_exist_ok=True, ignore=shutil.ignore_patterns('*.out', '*.gz', '*.csv', '*.latency', '*.progress', '*.perfstat', '*.perf.data', '*.folded', '*.svg'))
+        stagedFiles = set(os.listdir(runFolder))
+
+    try:
+        if launcher == 'python':
+            results.update(launch_experiment(runFolder, simulationTimeout, cpuSet, startBatchSize, startBatchDelay, terminateTimeout, sampleInterval, logLatency, cpuPlacement, brokerCores, coresPerFederate, logCap, stallWindow, stallCpu,
+                                             profileFederates, profileRecord, profileFrequency))
+        elif launcher == 'bash':
+            if cpuPlacement is not None:
+                raise Exception('cpu placement is only supported by the python launcher')
+            if profileFederates is not None:
+                raise Exception('profiling is only supported by the python launcher')
+            results.update(run_launch_script(runFolder, simulationTimeout, cpuSet, terminateTimeout=terminateTimeout, sampleInterval=sampleInterval, logLatency=logLatency, logCap=logCap, stallWindow=stallWindow, stallCpu=stallCpu))
+        else:
+            raise Exception('unknown launcher specified (' + str(launcher) + ')')
+        results.update(collect_results(runFolder, results['status'], logCap))
+        if profileFederates is not None:
+            results.update(collect_profile(runFolder))
+    finally:
+        if stagingFolder is not None:
+            for name in os.listdir(runFolder):
+                if name not in stagedFiles:
+                    shutil.move(runFolder / name, experimentFolder / name)
+            shutil.rmtree(runFolder, ignore_errors=True)
+
+    # the stacks are folded after the processes are done for the same reason
+    for dataFile in experimentFolder.glob('*.perf.data'):
+        collapse_stacks(dataFile)
+
+    # the logs are compressed after the processes are done so it does not count against the experiment
+    if compressLogs:
+        for logFile in experimentFolder.glob('*.out'):
+            with open(logFile, 'rb') as infile, gzip.open(str(logFile) + '.gz', 'wb', compresslevel=1) as outfile:
+                shutil.copyfileobj(infile, outfile, 1 << 20)
+            os.remove(logFile)
+
+    return results
+
+
+def collect_results(experimentFolder, status, logCap=None):
+    """
+    This function collects the results the federates of an experiment wrote (their times, step logs, and log files)
+    once the experiment is done. The size of every log is written to logs.csv
+    
+    Inputs
+        experimentFolder - Folder that the experiment ran in
+        status - 0 if the experiment was successfull, 1 if it failed, and 2 if it timed out
+        logCap - size in bytes the logs were truncated at (None if they were not)
+
+    Outputs
+        results - dictionary with the initialization/execution/closing times, LATENCY_COLUMNS, straggler,
+            THROUGHPUT_COLUMNS, and LOG_COLUMNS results
+    """
+
+    results = dict()
+    if status == 0:
+        data = pd.read_csv(experimentFolder / 'timeDataLogging.csv')
+        results['initialization time (cpu)'] = data.iloc[0]['Initialization time']
+        results['execution time (cpu)'] = data.iloc[0]['Execution time']
+        results['closing time (cpu)'] = data.iloc[0]['Closing time']
+        results['initialization time (wall)'] = data.iloc[1]['Initialization time']
+        results['execution time (wall)'] = data.iloc[1]['Execution time']
+        results['closing time (wall)'] = data.iloc[1]['Closing time']
+        results.update(load_latency(experimentFolder))
+    else:
+        results.update({column: np.nan for column in LATENCY_COLUMNS})
+        results['straggler'] = None
+
+    # the wall clock of the federates only counts whole seconds, so the main loop time of the step logs is used when it is there
+    with open(experimentFolder / 'launch.json', 'r') as infile:
+        manifest = json.load(infile)
+    loopTime = results['main loop time (s)'] if not np.isnan(results['main loop time (s)']) else results.get('execution time (wall)', np.nan)
+    results.update(throughput_metrics(manifest.get('workload'), loopTime if status == 0 else np.nan))
+
+    # a log at the cap was cut short, the processes that do not write a log count as writing nothing
+    logs = pd.DataFrame([[process['name'], process['log']] for process in manifest['processes'] if process['log'] is not None], columns=['name', 'log'])
+    logs['bytes'] = [os.path.getsize(experimentFolder / log) if os.path.isfile(experimentFolder / log) else 0 for log in logs['log']]
+    logs['truncated'] = logs['bytes'] >= logCap if logCap is not None else False
+    logs.to_csv(experimentFolder / 'logs.csv', index=False)
+    results['log bytes total'] = logs['bytes'].sum()
+    results['log bytes per process'] = logs['bytes'].sum() / len(manifest['processes']) if manifest['processes'] else np.nan
+    results['log bytes max'] = logs['bytes'].max() if len(logs) else 0
+    results['truncated logs'] = int(logs['truncated'].sum())
+
+    return results
+
+
+def throughput_metrics(workload, loopTime):
+    """
+    This function derives the throughput of an experiment from its workload (see write_launch_script) and the time its
+    main loop took
+    
+    Inputs
+        workload - dictionary with the messages per step, bytes per message, and number of steps of the experiment, and
+            the total messages and payload bytes of a replayed workload (None for experiments generated before the
+            workload was recorded)
+        loopTime - time in seconds the main loop of the federation took
+
+    Outputs
+        dictionary with the THROUGHPUT_COLUMNS results (NaN when the workload or loop time is not known)
+    """
+
+    if workload is None or workload.get('messages per step') is None or not loopTime > 0:
+        return {column: np.nan for column in THROUGHPUT_COLUMNS}
+
+    # a replayed workload does not send every message on every step, so it records what it delivers
+    if workload.get('messages') is not None:
+        return {'messages per second': workload['messages'] / loopTime, 'payload bytes per second': workload['payload bytes'] / loopTime,
+                'time steps per second': workload['steps'] / loopTime}
+
+    messages = workload['messages per step'] * workload['steps']
+    return {'messages per second': messages / loopTime, 'payload bytes per second': messages * workload['bytes'] / loopTime,
+            'time steps per second': workload['steps'] / loopTime}
+
+
+def load_latency(experimentFolder):
+    """
+    This function loads the per step logs written by every federate (<federate>.latency, pairs of 32 bit floats with the
+    work time and time request latency of each step) and summarizes the time request latency of the experiment. The
+    straggler is the federate with the most work time, the one the rest of the federation ends up waiting on. The main
+    loop time is the longest sum of the work time and latency of all steps of a federate, the execution time of the
+    federation with a far better resolution than the wall clock of the federates
+    
+    Inputs
+        experimentFolder - Folder that the experiment exist in
+
+    Outputs
+        dictionary with the LATENCY_COLUMNS results and the straggler (NaN and None if no federate logged its steps)
+    """
+
+    experimentFolder = Path(experimentFolder)
+    results = {column: np.nan for column in LATENCY_COLUMNS}
+    results['straggler'] = None
+
+    names = []
+    steps = []
+    for latencyFile in sorted(experimentFolder.glob('*.latency')):
+        names.append(latencyFile.stem)
+        values = np.fromfile(latencyFile, dtype='<f4')
+        # a step log cut short by the file size cap can end half way through a step
+        steps.append(values[:len(values) - len(values) % 2].reshape(-1, 2))
+    if not names:
+        return results
+
+    stepCounts = np.array([len(step) for step in steps])
+    allSteps = np.concatenate(steps)
+    latency = allSteps[:, 1].astype(float)
+    work = np.array([step[:, 0].sum(dtype=float) for step in steps])
+    loopTime = max(step.sum(dtype=float) for step in steps)
+
+    if len(latency):
+        p50, p90, p99 = np.percentile(latency, [50, 90, 99])
+        results.update({'grant latency p50 (s)': p50, 'grant latency p90 (s)': p90, 'grant latency p99 (s)': p99, 'grant latency max (s)': latency.max()})
+    straggler = int(np.argmax(work))
+    results['straggler'] = names[straggler]
+    results['straggler work time (s)'] = work[straggler]
+    results['main loop time (s)'] = loopTime
+
+    # the per federate view is kept next to the experiment for digging into a slow run
+    quantiles = [np.percentile(step[:, 1], [50, 99]) if len(step) else [np.nan, np.nan] for step in steps]
+    pd.DataFrame({'name': names, 'steps': stepCounts, 'work time (s)': work,
+                  'grant latency p50 (s)': [quantile[0] for quantile in quantiles],
+                  'grant latency p99 (s)': [quantile[1] for quantile in quantiles],
+                  'grant latency max (s)': [step[:, 1].max() if len(step) else np.nan for step in steps]}).to_csv(experimentFolder / 'latency.csv', index=False)
+
+    return results
+
+
+def experiment_hash(parameters):
+    """
+    This function creates the key results are stored under. It is a hash of every parameter that defines the experiment
+    
+    Inputs
+        parameters - dictionary with the full set of experiment parameters
+
+    Outputs
+        hex string hash of the parameters
+    """
+
+    return hashlib.sha1(json.dumps(parameters, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def load_results(resultsFile):
+    """
+    This function loads the results that have been persisted for a sweep. Each experiment can have several trials, a
+    record for trial 0 starts a new series of trials for the experiment and replaces any earlier ones
+    
+    Inputs
+        resultsFile - JSON lines file the results are appended to
+
+    Outputs
+        dictionary of experiment hash -> list of result records for the trials
+    """
+
+    records = dict()
+    if not os.path.isfile(resultsFile):
+        return records
+
+    with open(resultsFile, 'r') as infile:
+        for line in infile:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # a crash while appending can leave a partial line at the end of the file
+                print("WARNING: skipping corrupted result record in", resultsFile)
+                continue
+            if record.get('trial', 0) == 0:
+                records[record['hash']] = []
+            records.setdefault(record['hash'], []).append(record)
+
+    return records
+
+
+def append_result(resultsFile, record):
+    """
+    This function appends a single result record to disk and makes sure it is there before returning
+    
+    Inputs
+        resultsFile - JSON lines file the results are appended to
+        record - dictionary with the hash, trial number, parameters, and results of the experiment
+
+    Outputs
+        None
+    """
+
+    # numpy scalars come out of the parsed timing files and json does not know about them
+    line = json.dumps(record, default=lambda value: value.item()) + '\n'
+    with open(resultsFile, 'ab+') as outfile:
+        # a crash while appending can leave a partial line, start a new one so this record does not get lost with it
+        outfile.seek(0, os.SEEK_END)
+        if outfile.tell() > 0:
+            outfile.seek(-1, os.SEEK_END)
+            if outfile.read(1) != b'\n':
+                line = '\n' + line
+        outfile.write(line.encode())
+        outfile.flush()
+        os.fsync(outfile.fileno())
+
+
+def drop_results(resultsFile, hashKey, count):
+    """
+    This function removes the last records of an experiment from disk, e.g. the trials a worker sent before it died
+    
+    Inputs
+        resultsFile - JSON lines file the results are appended to
+        hashKey - experiment hash of the records
+        count - number of records of the experiment to remove from the end of the file
+
+    Outputs
+        None
+    """
+
+    if count < 1 or not os.path.isfile(resultsFile):
+        return
+
+    with open(resultsFile, 'r') as infile:
+        lines = infile.readlines()
+    matches = []
+    for idx, line in enumerate(lines):
+        try:
+            if json.loads(line)['hash'] == hashKey:
+                matches.append(idx)
+        except ValueError:
+            # a partial line is left for load_results to skip
+            continue
+    dropped = set(matches[-count:])
+
+    # the file is replaced in one step so a crash leaves either the old or the new records
+    tempFile = str(resultsFile) + '.tmp'
+    with open(tempFile, 'w') as outfile:
+        outfile.writelines([line for idx, line in enumerate(lines) if idx not in dropped])
+        outfile.flush()
+        os.fsync(outfile.fileno())
+    os.replace(tempFile, resultsFile)
+
+
+def command_output(command, cwd=None):
+    """
+    This function runs a command and returns the first line it prints, used to find out the versions of the tools
+    
+    Inputs
+        command - command as a list of arguments
+        cwd - folder to run the command in
+
+    Outputs
+        first line of the output (None if the command is not available or failed)
+    """
+
+    try:
+        process = subprocess.run(command, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, timeout=10)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if process.returncode != 0:
+        return None
+    lines = process.stdout.decode(errors='replace').strip().splitlines()
+    if not lines:
+        return None
+    return lines[0].strip()
+
+
+def environment_metadata():
+    """
+    This function collects the environment the experiments run in so results from different machines and releases can
+    be told apart in the results store
+    
+    Inputs
+        None
+
+    Outputs
+        dictionary with the ENVIRONMENT_COLUMNS
+    """
+
+    cpuModel = platform.processor() or None
+    try:
+        with open('/proc/cpuinfo', 'r') as cpuInfo:
+            for line in cpuInfo:
+                if line.startswith('model name'):
+                    cpuModel = line.split(':', 1)[1].strip()
+                    break
+    except OSError:
+        pass
+
+    return {'host': socket.gethostname(), 'cpu model': cpuModel, 'cores': os.cpu_count(), 'kernel': platform.release(),
+            'helics version': command_output(['helics_broker', '--version']),
+            # FNCS has no version flag, pkg-config knows about it when it was installed with its pkg-config file
+            'fncs version': command_output(['pkg-config', '--modversion', 'fncs']),
+            'git revision': command_output(['git', 'describe', '--always', '--dirty'], cwd=os.path.dirname(os.path.abspath(__file__)))}
+
+
+def store_results(resultsStore, records):
+    """
+    This function appends trial records to the columnar results store. The store is a folder of parquet files
+    partitioned by month, every call adds a file so concurrent sweeps never write to the same file
+    
+    Inputs
+        resultsStore - folder of the results store
+        records - list of dictionaries with the STORE_COLUMNS of each trial
+
+    Outputs
+        None
+    """
+
+    if not records:
+        return
+
+    data = pd.DataFrame(records, columns=STORE_COLUMNS)
+    # fixed types keep the schema of every file in the store the same, even when a column is empty in a sweep
+    for column in STORE_COLUMNS:
+        if column == 'recorded':
+            data[column] = pd.to_datetime(data[column], utc=True).astype('datetime64[us, UTC]')
+        elif column in ['federates', 'messages', 'bytes', 'trial', 'cores', 'exit code', 'signal', 'federate processes']:
+            data[column] = data[column].astype('Int64')
+        elif column in ['outlier', 'log files', 'uninterruptible', 'stalled']:
+            data[column] = data[column].astype('boolean')
+        elif column in ['update interval', 'simulation time', 'simulation timeout', 'timeout (s)'] + TIME_COLUMNS + RESOURCE_COLUMNS + LATENCY_COLUMNS + THROUGHPUT_COLUMNS + LOG_COLUMNS + PROFILE_COLUMNS:
+            data[column] = data[column].astype(float)
+        else:
+            data[column] = data[column].astype('string')
+
+    for month, monthData in data.groupby(data['recorded'].dt.strftime('%Y-%m')):
+        monthFolder = Path(resultsStore) / str('month=' + month)
+        os.makedirs(monthFolder, exist_ok=True)
+        monthData.to_parquet(monthFolder / str(uuid.uuid4().hex + '.parquet'), index=False)
+
+
+def query_results(resultsStore, filters=None, since=None, until=None, columns=None):
+    """
+    This function loads trials from the columnar results store. The filters are pushed down to the parquet reader so only
+    the matching months and row groups are read, for example the zmq ManyToOne runs with 200 federates of the last six
+    months are query_results(store, {'core type': 'zmq', 'experiment type': 'ManyToOne', 'federates': 200}, since=pd.Timestamp.now(tz='UTC') - pd.DateOffset(months=6))
+    
+    Inputs
+        resultsStore - folder of the results store
+        filters - dictionary of column -> value or list of values to keep (None keeps everything)
+        since - only keep trials recorded at or after this time (anything pandas can turn into a timestamp)
+        until - only keep trials recorded before this time
+        columns - list of columns to load (None loads all of them)
+
+    Outputs
+        pandas dataframe with the matching trials
+    """
+
+    if not os.path.isdir(resultsStore) or not any(Path(resultsStore).glob('month=*/*.parquet')):
+        return pd.DataFrame(columns=columns if columns is not None else STORE_COLUMNS)
+
+    conditions = []
+    for column, value in (filters or dict()).items():
+        values = list(value) if isinstance(value, (list, tuple, set)) else [value]
+        conditions.append((column, 'in', values))
+    # the month partitions let the reader skip whole folders before it looks at the recorded time
+    if since is not None:
+        since = pd.Timestamp(since, tz='UTC') if pd.Timestamp(since).tzinfo is None else pd.Timestamp(since)
+        conditions += [('month', '>=', since.strftime('%Y-%m')), ('recorded', '>=', since)]
+    if until is not None:
+        until = pd.Timestamp(until, tz='UTC') if pd.Timestamp(until).tzinfo is None else pd.Timestamp(until)
+        conditions += [('month', '<=', until.strftime('%Y-%m')), ('recorded', '<', until)]
+
+    data = pd.read_parquet(resultsStore, columns=columns, filters=conditions if conditions else None)
+    if 'month' in data.columns and (columns is None or 'month' not in columns):
+        data = data.drop(columns='month')
+    return data.reset_index(drop=True)
+
+
+def compare_versions(resultsStore, baseline, candidate, metrics=['execution time (wall)'], filters=None, versionColumn='helics version', since=None):
+    """
+    This function compares two releases on the configurations both of them were run with. Configurations are matched on
+    the experiment hash, which covers every experiment parameter, and the successful trials that are not outliers are
+    reduced to their median per release
+    
+    Inputs
+        resultsStore - folder of the results store
+        baseline - value of the version column for the baseline release
+        candidate - value of the version column for the candidate release
+        metrics - list of result columns to compare
+        filters - dictionary of additional column -> value or list of values to keep (None keeps everything)
+        versionColumn - column that identifies the releases (helics version, fncs version, or git revision)
+        since - only use trials recorded at or after this time
+
+    Outputs
+        pandas dataframe with one row per configuration and the baseline, candidate, and ratio (candidate / baseline) of
+        each metric
+    """
+
+    conditions = dict(filters or dict())
+    conditions[versionColumn] = [baseline, candidate]
+    conditions['status'] = 'success'
+    data = query_results(resultsStore, conditions, since=since)
+    data = data[~data['outlier'].fillna(False).astype(bool)]
+
+    keys = ['experiment hash', 'experiment type', 'co-simulation platform', 'core type', 'federates', 'messages', 'bytes']
+    medians = data.groupby(keys + [versionColumn], dropna=False)[metrics].median().reset_index()
+    baselineData = medians[medians[versionColumn] == baseline].drop(columns=versionColumn)
+    candidateData = medians[medians[versionColumn] == candidate].drop(columns=versionColumn)
+
+    comparison = baselineData.merge(candidateData, on=keys, suffixes=(' baseline', ' candidate'))
+    for metric in metrics:
+        comparison[metric + ' ratio'] = comparison[metric + ' candidate'] / comparison[metric + ' baseline']
+
+    return comparison.sort_values(keys[1:]).reset_index(drop=True)
+
+
+def summarize_trials(trials, metrics, confidence=0.95, bootstrapSamples=1000, outlierThreshold=3.5):
+    """
+    This function aggregates the repeated trials of an experiment. Trials that are outliers in any of the wall times
+    (modified z-score above the threshold, e.g. a first run with a cold page cache) are flagged and left out of the
+    statistics instead of being averaged in
+    
+    Inputs
+        trials - list of result dictionaries for the trials of one experiment
+        metrics - list of result columns to aggregate
+        confidence - confidence level of the bootstrap confidence interval of the mean
+        bootstrapSamples - number of bootstrap resamples used for the confidence interval
+        outlierThreshold - modified z-score above which a trial is flagged as an outlier
+
+    Outputs
+        summary - dictionary with the median, mean, std, and confidence interval of each metric plus trial counts
+        outliers - list of flags, one per trial, that are True for trials flagged as outliers
+    """
+
+    successful = [idx for idx, trial in enumerate(trials) if trial['status'] == 'success']
+    outliers = [False] * len(trials)
+
+    # the median absolute deviation needs a few trials to mean anything
+    if len(successful) >= 3:
+        for metric in [metric for metric in metrics if metric.endswith('(wall)')]:
+            values = np.array([trials[idx][metric] for idx in successful], dtype=float)
+            median = np.median(values)
+            mad = np.median(np.abs(values - median))
+            if mad > 0:
+                scores = 0.6745 * (values - median) / mad
+            else:
+                # more than half the trials have the same value, fall back to the mean absolute deviation
+                meanAd = np.mean(np.abs(values - median))
+                if meanAd == 0:
+                    continue
+                scores = (values - median) / (1.253314 * meanAd)
+            for idx, score in zip(successful, scores):
+                if abs(score) > outlierThreshold:
+                    outliers[idx] = True
+
+    kept = [idx for idx in successful if not outliers[idx]]
+    summary = {'trials': len(trials), 'successful trials': len(successful), 'outlier trials': int(sum(outliers))}
+
+    rng = np.random.default_rng(0)
+    for metric in metrics:
+        # trials recorded before a metric existed do not have it
+        values = np.array([trials[idx].get(metric, np.nan) for idx in kept], dtype=float)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            # nothing succeeded is reported as zero like before, a metric that was not measured is left empty
+            empty = np.nan if kept else 0.
+            summary.update({metric: empty, metric + ' mean': empty, metric + ' std': np.nan, metric + ' ci low': np.nan, metric + ' ci high': np.nan})
+            continue
+        summary[metric] = float(np.median(values))
+        summary[metric + ' mean'] = float(np.mean(values))
+        if len(values) > 1:
+            means = rng.choice(values, size=(bootstrapSamples, len(values))).mean(axis=1)
+            summary[metric + ' std'] = float(np.std(values, ddof=1))
+            summary[metric + ' ci low'] = float(np.percentile(means, 100. * (1. - confidence) / 2.))
+            summary[metric + ' ci high'] = float(np.percentile(means, 100. * (1. + confidence) / 2.))
+        else:
+            summary[metric + ' std'] = np.nan
+            summary[metric + ' ci low'] = np.nan
+            summary[metric + ' ci high'] = np.nan
+
+    return summary, outliers
+
+
+def load_trials(source):
+    """
+    This function loads the trials of a results set as a dataframe with the experiment parameters and results. Trials
+    that are outliers are flagged the same way as in run_search
+    
+    Inputs
+        source - sweep folder, results.jsonl file of a sweep, trials.csv table of a sweep, harness benchmark folder
+            (harness_trials.csv), or a dataframe of trials (e.g. from query_results)
+
+    Outputs
+        pandas dataframe with one row per trial
+    """
+
+    if isinstance(source, pd.DataFrame):
+        return source.copy()
+
+    resultsFile = Path(source)
+    if os.path.isfile(resultsFile / 'harness_trials.csv'):
+        return pd.read_csv(resultsFile / 'harness_trials.csv')
+    if os.path.isfile(resultsFile) and resultsFile.suffix == '.csv':
+        # the trials table of run_search already has the parameters, results, and outlier flags of every trial
+        return pd.read_csv(resultsFile)
+    if os.path.isdir(resultsFile):
+        resultsFile = resultsFile / 'results.jsonl'
+    if not os.path.isfile(resultsFile):
+        raise Exception('no results found at ' + str(source))
+
+    rows = []
+    for hashKey, records in load_results(resultsFile).items():
+        trials = [record['results'] for record in records]
+        _, outliers = summarize_trials(trials, TIME_COLUMNS)
+        for record, outlier in zip(records, outliers):
+            rows.append(dict(record['parameters'], **record['results'], outlier=outlier))
+
+    return pd.DataFrame(rows)
+
+
+def permutation_test(baseline, candidate, samples=10000):
+    """
+    This function tests if the candidate values are larger than the baseline values without assuming a distribution. All
+    splits of the pooled values are tried when there are few enough of them, otherwise a random sample of them is used
+    
+    Inputs
+        baseline - array of baseline values
+        candidate - array of candidate values
+        samples - maximum number of splits of the pooled values to try
+
+    Outputs
+        one-sided p-value of the difference of the means being at least as large as the observed one
+    """
+
+    pooled = np.concatenate((baseline, candidate))
+    observed = np.mean(candidate) - np.mean(baseline)
+    total = pooled.sum()
+
+    if math.comb(len(pooled), len(candidate)) <= samples:
+        splits = np.array(list(itertools.combinations(range(len(pooled)), len(candidate))))
+    else:
+        rng = np.random.default_rng(0)
+        splits = np.argsort(rng.random((samples, len(pooled))), axis=1)[:, :len(candidate)]
+
+    candidateSums = pooled[splits].sum(axis=1)
+    differences = candidateSums / len(candidate) - (total - candidateSums) / len(baseline)
+    # a small tolerance keeps ties from rounding errors on the side of the observed difference
+    return float(np.mean(differences >= observed - 1e-12 * max(1., abs(observed))))
+
+
+def compare_results(baseline, candidate, metrics=GATE_METRICS, threshold=0.05, alpha=0.05):
+    """
+    This function compares a candidate results set with a baseline results set. Configurations are matched on the
+    experiment hash, which covers every experiment parameter. A metric regresses when its median grows by more than the
+    threshold and the permutation test says the increase is significant. A configuration that only fails in the candidate
+    regresses as well
+    
+    Inputs
+        baseline - baseline results set (see load_trials)
+        candidate - candidate results set (see load_trials)
+        metrics - list of result columns to compare, larger is worse for all of them
+        threshold - relative increase of the median that counts as a regression
+        alpha - significance level of the permutation test
+
+    Outputs
+        report - pandas dataframe with one row per configuration and metric
+        unmatched - dictionary with the number of configurations only found in the baseline and only in the candidate
+    """
+
+    baselineData = load_trials(baseline)
+    candidateData = load_trials(candidate)
+
+    keys = ['experiment hash', 'experiment type', 'co-simulation platform', 'core type', 'federates', 'messages', 'bytes']
+    baselineHashes = set(baselineData['experiment hash']) if len(baselineData) else set()
+    candidateHashes = set(candidateData['experiment hash']) if len(candidateData) else set()
+    matched = sorted(baselineHashes & candidateHashes)
+
+    rows = []
+    for hashKey in matched:
+        baselineTrials = baselineData[baselineData['experiment hash'] == hashKey]
+        candidateTrials = candidateData[candidateData['experiment hash'] == hashKey]
+        description = {key: baselineTrials.iloc[0][key] for key in keys}
+
+        # the statistics only use the successful trials that are not outliers
+        baselineKept = baselineTrials[(baselineTrials['status'] == 'success') & ~baselineTrials['outlier'].fillna(False).astype(bool)]
+        candidateKept = candidateTrials[(candidateTrials['status'] == 'success') & ~candidateTrials['outlier'].fillna(False).astype(bool)]
+
+        if len(baselineKept) > 0 and len(candidateKept) == 0:
+            rows.append(dict(description, metric='status', **{'baseline trials': len(baselineKept), 'candidate trials': 0,
+                             'baseline median': np.nan, 'candidate median': np.nan, 'change': np.nan, 'p value': np.nan, 'regression': True}))
+            continue
+
+        for metric in metrics:
+            if metric not in baselineKept.columns or metric not in candidateKept.columns:
+                continue
+            baselineValues = baselineKept[metric].to_numpy(dtype=float)
+            candidateValues = candidateKept[metric].to_numpy(dtype=float)
+            baselineValues = baselineValues[~np.isnan(baselineValues)]
+            candidateValues = candidateValues[~np.isnan(candidateValues)]
+            if len(baselineValues) == 0 or len(candidateValues) == 0:
+                continue
+
+            baselineMedian = float(np.median(baselineValues))
+            candidateMedian = float(np.median(candidateValues))
+            if baselineMedian != 0:
+                change = (candidateMedian - baselineMedian) / abs(baselineMedian)
+            else:
+                change = 0. if candidateMedian == 0 else np.inf
+            pValue = permutation_test(baselineValues, candidateValues)
+
+            rows.append(dict(description, metric=metric, **{'baseline trials': len(baselineValues), 'candidate trials': len(candidateValues),
+                             'baseline median': baselineMedian, 'candidate median': candidateMedian, 'change': change, 'p value': pValue,
+                             'regression': bool(change > threshold and pValue < alpha)}))
+
+    columns = keys + ['metric', 'baseline trials', 'candidate trials', 'baseline median', 'candidate median', 'change', 'p value', 'regression']
+    unmatched = {'baseline only': len(baselineHashes - candidateHashes), 'candidate only': len(candidateHashes - baselineHashes)}
+    return pd.DataFrame(rows, columns=columns), unmatched
+
+
+def regression_gate(baseline, candidate, reportFile, metrics=GATE_METRICS, threshold=0.05, alpha=0.05):
+    """
+    This function compares a candidate results set with a baseline and writes a machine readable report of it so a
+    release can be gated on the result
+    
+    Inputs
+        baseline - baseline results set (see load_trials)
+        candidate - candidate results set (see load_trials)
+        reportFile - JSON file the report is written to
+        metrics - list of result columns to compare, larger is worse for all of them
+        threshold - relative increase of the median that counts as a regression
+        alpha - significance level of the permutation test
+
+    Outputs
+        exit status - 0 if nothing regressed, 1 if any configuration regressed, and 2 if no configurations matched
+    """
+
+    report, unmatched = compare_results(baseline, candidate, metrics, threshold, alpha)
+    configurations = report['experiment hash'].nunique()
+    regressions = report[report['regression'].astype(bool)]
+
+    if configurations == 0:
+        print("WARNING: no configurations of the candidate match the baseline")
+        status = 2
+    elif len(regressions) > 0:
+        status = 1
+    else:
+        status = 0
+
+    # json does not know about infinity or numpy types, the records go through pandas to clean them up
+    results = json.loads(report.replace([np.inf, -np.inf], None).to_json(orient='records'))
+    with open(reportFile, 'w') as outfile:
+        json.dump({'baseline': str(baseline) if not isinstance(baseline, pd.DataFrame) else 'dataframe',
+                   'candidate': str(candidate) if not isinstance(candidate, pd.DataFrame) else 'dataframe',
+                   'threshold': threshold, 'alpha': alpha, 'status': status, 'configurations': configurations,
+                   'regressed configurations': regressions['experiment hash'].nunique(), 'regressions': len(regressions),
+                   'unmatched': unmatched, 'results': results}, outfile, indent=2)
+
+    from termcolor import colored
+    for _, row in regressions.iterrows():
+        print(colored('regression', 'red'), row['co-simulation platform'], row['experiment type'], 'core=' + str(row['core type']),
+              'federates=' + str(row['federates']), 'messages=' + str(row['messages']), 'bytes=' + str(row['bytes']), row['metric'],
+              '' if row['metric'] == 'status' else '%+.1f%% (p=%.3f)' % (100. * row['change'], row['p value']))
+    print(str(len(regressions)) + ' regressions in ' + str(configurations) + ' matched configurations, report written to ' + str(reportFile))
+
+    return status
+
+
+def predict_timeout(records, parameters, simulationTimeout, timeoutFactor=3., minTimeout=10.):
+    """
+    This function predicts the timeout of an experiment from the launch times of the successful trials of neighbouring
+    experiments, the ones with the same settings apart from the federates, messages, and bytes. The launch time is taken
+    to grow as a power of the messages per step (federates times messages) fitted over the measured sizes in log-log
+    space and anchored at the nearest measured size, at least linearly beyond the largest one
+    
+    Inputs
+        records - dictionary of experiment hash -> list of result records for the trials, see load_results
+        parameters - parameters of the experiment the timeout is for
+        simulationTimeout - timeout used when there is nothing to learn from, also the upper bound of the prediction
+        timeoutFactor - multiple of the predicted launch time the experiment gets
+        minTimeout - lower bound of the prediction
+
+    Outputs
+        timeout in seconds
+    """
+
+    sizeKeys = ['federates', 'messages', 'bytes', 'simulation timeout']
+    settings = {key: value for key, value in parameters.items() if key not in sizeKeys}
+    launchTimes = dict()
+    for trialRecords in records.values():
+        for record in trialRecords:
+            if record['results'].get('status') != 'success':
+                continue
+            if {key: value for key, value in record['parameters'].items() if key not in sizeKeys} != settings:
+                continue
+            launchTime = record['results'].get('launch time (wall)')
+            if launchTime is None or not launchTime > 0:
+                continue
+            launchTimes.setdefault(record['parameters']['federates'] * record['parameters']['messages'], []).append(launchTime)
+
+    if not launchTimes:
+        return simulationTimeout
+
+    sizes = np.array(sorted(launchTimes), dtype=float)
+    times = np.array([np.median(launchTimes[size]) for size in sorted(launchTimes)])
+    size = parameters['federates'] * parameters['messages']
+    exponent = 1.
+    if len(sizes) > 1:
+        exponent = min(max(np.polyfit(np.log(sizes), np.log(times), 1)[0], 0.), 3.)
+    if size > sizes[-1]:
+        # the fixed costs flatten the curve of small experiments, so extrapolating is never less than linear
+        exponent = max(exponent, 1.)
+    nearest = np.argmin(np.abs(np.log(sizes) - np.log(size)))
+    predicted = times[nearest] * (size / sizes[nearest]) ** exponent
+    return float(min(max(timeoutFactor * predicted, minTimeout), simulationTimeout))
+
+
+def format_status(simStatus, results):
+    """
+    This function formats the status of a trial for the progress output
+    
+    Inputs
+        simStatus - success, failure, or timeout
+        results - dictionary with the failed process, exit code, signal, and stalled flag of the trial
+
+    Outputs
+        colored status text with the process that failed and how
+    """
+
+    from termcolor import colored
+
+    statusText = colored(simStatus, {'success': 'green', 'failure': 'red'}.get(simStatus, 'yellow'))
+    if results.get('stalled'):
+        statusText += ' (stalled after ' + format(results['launch time (wall)'], '.1f') + 's)'
+    if results.get('failed process') is not None:
+        if results.get('signal') is not None:
+            statusText += ' (' + str(results['failed process']) + ' killed by signal ' + str(results['signal']) + ')'
+        else:
+            statusText += ' (' + str(results['failed process']) + ' exited with code ' + str(results['exit code']) + ')'
+    return statusText
+
+
+def parse_address(address):
+    """
+    This function parses a worker address
+    
+    Inputs
+        address - address as host:port
+
+    Outputs
+        tuple of the host and port
+    """
+
+    host, _, port = address.rpartition(':')
+    if not host or not port.isdigit():
+        raise Exception('worker address has to be host:port (' + str(address) + ')')
+    return host, int(port)
+
+
+def format_address(address):
+    """
+    This function formats a worker address for the output
+    
+    Inputs
+        address - tuple of the host and port
+
+    Outputs
+        address as host:port
+    """
+
+    return str(address[0]) + ':' + str(address[1])
+
+
+def run_search(outFolder, federateNumber, messageNumber, bytesNumber, updateInterval, simTime, logLevel, logFiles, uninterruptible, coreType, coreTick, coreTimeout, simulationTimeout, coSimPlatform, experimentType, workers=1, coresPerExperiment=None, basePort=None, portStride=1000, force=False, repeats=1, adaptive=False, maxRepeats=20, ciTarget=0.05, ciMetric='execution time (wall)', configTimeBudget=None, saveTables=True, launcher='python', startBatchSize=None, startBatchDelay=0., sampleInterval=1., logLatency=True, resultsStore=None, workerAddresses=None, authkey=None, heartbeatTimeout=60., trialCallback=None, brokerFanOut=None, placement='block', topology=None, combinations=None, cpuPlacement=None, brokerCores=1, coresPerFederate=None, stagingFolder=None, compressLogs=False, logCap=None, stallWindow=None, stallCpu=0.05, adaptiveTimeout=False, timeoutFactor=3., minTimeout=10., federateProcesses=None, interface='value', workload=None, profileFederates=None, profileRecord=False, profileFrequency=99):
+    """
+    This function runs all combinations of the specified senders, messages, bytes, and core types and returns the results in a dataframe.
+    Every trial is appended to results.jsonl in the output folder as soon as it completes, keyed by a hash of the experiment
+    parameters, and trials that already have a result there are not run again. With worker addresses the experiments are
+    run by the worker agents and their trials are streamed back into the same results file
+    
+    Inputs
+        outFolder - Folder that the experiment will be created in
+        federateNumber - number of senders in the federation
+        messageNumber - number of messages per sender
+        bytesNumber - number of bytes in each message 
+        updateInterval - interval between sending messages
+        simTime - total simulation time
+        logLevel - log level for the federates
+        logFiles - flag to determine if log files are created
+        uninterruptible - HELICS setting for federates
+        coreType - HELICS setting for federates
+        coreTick - HELICS setting for federates
+        coreTimeout - HELICS setting for federates
+        simulationTimeout - Timeout value before we consider the experiment failed (the upper bound with adaptive timeouts)
+        coSimPlatform - Co-Simulation platform used. FNCS and HELICS supported
+        experimentType - Type of experiment Meshed or ManyToOne
+        workers - number of experiments to run at the same time
+        coresPerExperiment - number of cpus each experiment is pinned to (None splits the available cpus between the 
+            workers when running in parallel and does not pin when running serially)
+        basePort - first broker port, every worker slot gets its own range of ports from there (None starts at 20000
+            when running in parallel and keeps the platform defaults for a serial run)
+        portStride - number of ports reserved for each parallel experiment (broker plus automatically assigned core ports)
+        force - flag to run every experiment again even if it already has a result
+        repeats - number of trials per experiment (the minimum number of trials in adaptive mode)
+        adaptive - flag to keep adding trials until the confidence interval is narrow enough
+        maxRepeats - maximum number of trials per experiment in adaptive mode
+        ciTarget - adaptive mode stops once the confidence interval half-width is below this fraction of the median
+        ciMetric - result column the adaptive mode looks at
+        configTimeBudget - time in seconds after which adaptive mode stops adding trials to an experiment (None for no limit)
+        saveTables - flag to write data.csv and trials.csv for the sweep
+        launcher - python to start the processes with launch_experiment, bash to run the exported run.sh
+        startBatchSize - number of federates started at a time by the python launcher (None starts them all at once)
+        startBatchDelay - time between starting batches of federates for the python launcher
+        sampleInterval - time between resource samples of the running processes (None disables the sampling)
+        logLatency - flag to have every federate log the work time and time request latency of each step
+        resultsStore - folder of the columnar results store every new trial is appended to (None to not store them)
+        workerAddresses - list of (host, port) of worker agents (see serve_worker) the experiments are dispatched to instead of
+            running them here (None runs them here)
+        authkey - shared secret the worker agents were started with (bytes), needed with worker addresses
+        heartbeatTimeout - time without hearing from a worker after which its experiment is sent to another worker
+        trialCallback - function called with the results of every trial that is run (used by the worker agents)
+        brokerFanOut - list with the number of sub-brokers per broker on each level of a HELICS broker hierarchy (None
+            for a single broker), see broker_hierarchy
+        placement - how the federates are placed on the leaf brokers of the hierarchy (block or roundrobin)
+        topology - dictionary with the communication_graph settings of Meshed experiments, e.g. {'graph': 'scale-free',
+            'degree': 4} (None for fully connected)
+        combinations - list of (federates, messages, bytes, core type) tuples to run instead of every combination of the
+            lists above, see sweep_points (None runs every combination)
+        cpuPlacement - compact or spread to pin the brokers and every federate to their own cpus within the cpus of the
+            experiment, see cpu_placement (None lets them run on any of them)
+        brokerCores - number of cores dedicated to the brokers with a cpu placement (0 to share them with the federates)
+        coresPerFederate - number of cores every federate gets with a cpu placement, below one the federates share cores
+            (None pins them to every federate core of the experiment or NUMA node)
+        stagingFolder - folder on tmpfs (e.g. /dev/shm) every trial is run in so the logs are not written to disk while
+            the experiment is timed, the outputs are moved back to the experiment folder afterwards (None runs in place)
+        compressLogs - flag to gzip the logs of every trial once it is done
+        logCap - size in bytes the log of every process is truncated at (None for no cap)
+        stallWindow - time in seconds a trial may go without advancing before the watchdog stops it, see
+            progress_watchdog (None for no watchdog)
+        stallCpu - number of cores the processes have to keep busy to count as advancing without a heartbeat
+        adaptiveTimeout - flag to give every trial a timeout predicted from the launch times of the neighbouring
+            experiments measured so far instead of the simulation timeout, see predict_timeout
+        timeoutFactor - multiple of the predicted launch time a trial gets with adaptive timeouts
+        minTimeout - lower bound of the adaptive timeouts
+        federateProcesses - number of processes the HELICS federates are packed into, the federates of a process run as
+            threads and share a core (an inproc core needs 1), see pack_federates (None for a process per federate)
+        interface - one of INTERFACES, value publications and subscriptions or messages between endpoints of the HELICS
+            federates, directly or through delay or cloning filters
+        workload - dictionary with the workload_schedule settings, a recorded trace or bursty traffic the HELICS
+            federates replay instead of sending every message on every step (None for the fixed workload)
+        profileFederates - number of federate processes profiled with perf stat together with the brokers, see
+            run_experiment (None for no profiling)
+        profileRecord - flag to also sample the call stacks of the profiled processes with perf record
+        profileFrequency - samples per second perf record takes
+
+    Outputs
+        results - pandas dataframe with the aggregated results of each experiment, the individual trials are written to
+            trials.csv in the output folder
+
+    """
+
+    # the settings of the sweep as a sweep spec would give them, taken before anything below changes them
+    settings = {setting: value for setting, value in locals().items() if setting in sweep_settings()}
+
+    columns = ['experiment hash','experiment type','co-simulation platform','core type','broker fan out','placement','topology','cpu placement','federate processes','interface','workload','profile','status','federates','messages','bytes','trials','successful trials','outlier trials']
+    for metric in TIME_COLUMNS + RESOURCE_COLUMNS + LATENCY_COLUMNS + THROUGHPUT_COLUMNS + LOG_COLUMNS + PROFILE_COLUMNS:
+        columns += [metric, metric + ' mean', metric + ' std', metric + ' ci low', metric + ' ci high']
+    columns += ['straggler','failed process','exit code','signal']
+    trialColumns = ['experiment hash','trial','outlier','experiment type','co-simulation platform','core type','broker fan out','placement','topology','cpu placement','federate processes','interface','workload','profile','status','federates','messages','bytes'] + TIME_COLUMNS + RESOURCE_COLUMNS + LATENCY_COLUMNS + THROUGHPUT_COLUMNS + LOG_COLUMNS + PROFILE_COLUMNS + ['straggler','failed process','exit code','signal','stalled','timeout (s)']
+    
+    if coSimPlatform not in ['FNCS', 'HELICS', 'NOOP']:
+        print("ERROR: unknown Co-Simulation platform specified")
+        return pd.DataFrame(columns=columns)
+
+    if experimentType not in ['ManyToOne', 'Meshed']:
+        print("ERROR: unknown Co-Simulation experiment type specified")
+        return pd.DataFrame(columns=columns)
+
+    if workers < 1:
+        raise Exception('at least one worker is needed to run the experiments')
+
+    if repeats < 1:
+        raise Exception('at least one trial is needed for each experiment')
+
+    if cpuPlacement is not None and launcher != 'python':
+        raise Exception('cpu placement is only supported by the python launcher')
+
+    # with remote workers every worker is a slot and the workers take care of their own cpus and ports
+    if workerAddresses is not None:
+        if len(workerAddresses) < 1:
+            raise Exception('at least one worker address is needed to dispatch the experiments')
+        if not authkey:
+            raise Exception('a shared secret (authkey) is needed to dispatch the experiments to workers')
+        workers = len(workerAddresses)
+        coresPerExperiment = None
+
+    # each worker slot gets its own set of cpus so concurrent experiments do not distort each other's timings
+    cpuSets = [None] * workers
+    if workerAddresses is None and (workers > 1 or coresPerExperiment is not None):
+        availableCores = sorted(os.sched_getaffinity(0))
+        if coresPerExperiment is None:
+            coresPerExperiment = max(1, len(availableCores) // workers)
+        if workers * coresPerExperiment > len(availableCores):
+            raise Exception('core budget of ' + str(workers) + ' workers with ' + str(coresPerExperiment) + ' cores each exceeds the ' + str(len(availableCores)) + ' available cores')
+        cpuSets = [availableCores[slot*coresPerExperiment:(slot+1)*coresPerExperiment] for slot in range(0, workers)]
+
+    if combinations is None:
+        combinations = itertools.product(federateNumber, messageNumber, bytesNumber, coreType)
+    experiments = [tuple(combination) for combination in combinations]
+    totalTestNum = len(experiments)
+
+    # each worker slot gets its own range of ports, a serial run keeps the platform defaults unless it is given a base port
+    brokerPorts = [None] * workers
+    if workerAddresses is None and (workers > 1 or basePort is not None):
+        if basePort is None:
+            basePort = 20000
+        if basePort + workers * portStride > 65535:
+            raise Exception('not enough ports available for ' + str(workers) + ' workers with a stride of ' + str(portStride))
+        brokerPorts = [basePort + slot * portStride for slot in range(0, workers)]
+        if brokerFanOut is not None:
+            # the largest federation (senders plus echo) decides how many ports a hierarchy spans
+            brokers, _ = broker_hierarchy([str(fed) for fed in range(0, max([experiment[0] for experiment in experiments], default=0)+1)], brokerFanOut, placement, basePort)
+            portsNeeded = max(broker['port'] if broker['portStart'] is None else broker['portStart'] + 2*broker['federates'] + 4 for broker in brokers) - basePort
+            if portsNeeded > portStride:
+                raise Exception('broker hierarchy needs ' + str(portsNeeded) + ' ports which is more than the stride of ' + str(portStride))
+
+    # results from earlier runs of the sweep let us pick up where we left off
+    os.makedirs(outFolder, exist_ok=True)
+    resultsFile = outFolder / 'results.jsonl'
+    records = load_results(resultsFile)
+    resultsLock = threading.Lock()
+
+    freeSlots = queue.Queue()
+    for slot in range(0, workers):
+        freeSlots.put(slot)
+    deadWorkers = set()
+
+    # the environment is the same for every trial of the sweep, the sweep id ties the trials of this run together
+    if resultsStore is not None:
+        environment = environment_metadata()
+        sweepId = uuid.uuid4().hex[:16]
+
+    def trials_needed(trials, startTime):
+        # a fixed number of trials is always run, adaptive mode then keeps going until the interval is narrow enough
+        if len(trials) < repeats:
+            return True
+        if not adaptive or len(trials) >= maxRepeats:
+            return False
+        if configTimeBudget is not None and time.monotonic() - startTime >= configTimeBudget:
+            return False
+        summary, _ = summarize_trials(trials, [ciMetric])
+        if summary['successful trials'] == 0:
+            return False
+        halfWidth = (summary[ciMetric + ' ci high'] - summary[ciMetric + ' ci low']) / 2.
+        return not halfWidth <= ciTarget * summary[ciMetric]
+
+    def record_trial(hashKey, parameters, row):
+        record = {'hash': hashKey, 'trial': row['trial'], 'parameters': parameters, 'results': row}
+        with resultsLock:
+            append_result(resultsFile, record)
+            records.setdefault(hashKey, []).append(record)
+
+    def run_remote(description, parameters, hashKey, spec, labels):
+        # the experiment goes to the next free worker, if that worker dies its trials are dropped and it goes to another one
+        while True:
+            slot = freeSlots.get()
+            if slot is None:
+                # put the marker back for the other experiments waiting on a worker
+                freeSlots.put(None)
+                raise Exception('every worker died before the sweep finished')
+            trials = []
+            try:
+                from multiprocessing.connection import Client
+                with Client(workerAddresses[slot], authkey=authkey) as connection:
+                    connection.send({'type': 'experiment', 'spec': spec})
+                    while True:
+                        # the worker sends heartbeats while it runs, silence means the host is gone
+                        if not connection.poll(heartbeatTimeout):
+                            raise TimeoutError('no heartbeat for ' + str(heartbeatTimeout) + ' seconds')
+                        message = connection.recv()
+                        if message['type'] == 'heartbeat':
+                            continue
+                        if message['type'] == 'done':
+                            break
+                        if message['type'] == 'error':
+                            # the experiment itself is broken, the worker is fine, so it counts as a failed trial and the sweep goes on
+                            row = dict(labels, status='failure', error=message['error'])
+                            row.update({'experiment hash': hashKey, 'failed process': None, 'exit code': None, 'signal': None,
+                                        'recorded': pd.Timestamp.now(tz='UTC').isoformat()})
+                        else:
+                            row = message['results']
+                        row['trial'] = len(trials)
+                        trialDescription = description + ' worker=' + format_address(workerAddresses[slot])
+                        if repeats > 1 or adaptive:
+                            trialDescription += ' trial=' + str(len(trials)+1)
+                        statusText = format_status(row['status'], row)
+                        if message['type'] == 'error':
+                            statusText += ' (' + message['error'] + ')'
+                        print(trialDescription + ' status=' + statusText + '\n', end='', flush=True)
+                        record_trial(hashKey, parameters, row)
+                        trials.append(row)
+                        if message['type'] == 'error':
+                            break
+            except (OSError, EOFError, TimeoutError) as error:
+                print("WARNING: worker " + format_address(workerAddresses[slot]) + " is gone (" + (str(error) or type(error).__name__) + "), sending its experiment to another worker\n", end='', flush=True)
+                with resultsLock:
+                    # the trials it sent are dropped so the other worker starts the experiment over
+                    if trials:
+                        del records[hashKey][-len(trials):]
+                        drop_results(resultsFile, hashKey, len(trials))
+                    deadWorkers.add(slot)
+                    if len(deadWorkers) == len(workerAddresses):
+                        freeSlots.put(None)
+                continue
+            freeSlots.put(slot)
+            return trials
+
+    def run_single(count):
+        fedNum, messNum, bytesNum, coreNum = experiments[count-1]
+        description = ' '.join(["running", coSimPlatform, "test", str(count), "of", str(totalTestNum), "with federates=" + str(fedNum), "messages=" + str(messNum), "bytes=" + str(bytesNum), "core=" + str(coreNum)])
+
+        parameters = {'co-simulation platform': coSimPlatform, 'experiment type': experimentType, 'core type': coreNum,
+                      'federates': fedNum, 'messages': messNum, 'bytes': bytesNum, 'update interval': updateInterval,
+                      'simulation time': simTime, 'log level': logLevel, 'log files': logFiles, 'uninterruptible': uninterruptible,
+                      'core tick': coreTick, 'core timeout': coreTimeout, 'simulation timeout': simulationTimeout}
+        # only hierarchies are part of the hash so results of single broker experiments keep their hash
+        if brokerFanOut is not None:
+            parameters['broker fan out'] = 'x'.join([str(fanOut) for fanOut in brokerFanOut])
+            parameters['placement'] = placement
+        if topology is not None:
+            parameters['topology'] = topology_label(topology)
+        # the cores are only part of the label when they are set, otherwise the placement spans whatever the host has
+        if cpuPlacement is not None:
+            parameters['cpu placement'] = ' '.join([cpuPlacement, 'broker=' + str(brokerCores), 'per federate=' + ('pool' if coresPerFederate is None else str(coresPerFederate))] +
+                                                   ([] if coresPerExperiment is None else ['cores=' + str(coresPerExperiment)]))
+        if federateProcesses is not None:
+            parameters['federate processes'] = federateProcesses
+        # value workloads are what every experiment ran before, so only the message interfaces are part of the hash
+        if interface != 'value':
+            parameters['interface'] = interface
+        if workload is not None:
+            parameters['workload'] = workload_label(workload)
+        # profiling slows the processes down, so profiled experiments are not mixed with the ones that were not
+        if profileFederates is not None:
+            parameters['profile'] = ' '.join(['federates=' + str(profileFederates)] + (['record frequency=' + str(profileFrequency)] if profileRecord else []))
+        hashKey = experiment_hash(parameters)
+        # every trial and the summary of the experiment are labeled with its settings
+        labels = {'experiment type': experimentType, 'co-simulation platform': coSimPlatform, 'core type': coreNum, 'federates': fedNum, 'messages': messNum, 'bytes': bytesNum,
+                  'broker fan out': parameters.get('broker fan out'), 'placement': parameters.get('placement'), 'topology': parameters.get('topology'),
+                  'cpu placement': parameters.get('cpu placement'), 'federate processes': parameters.get('federate processes'),
+                  'interface': parameters.get('interface', 'value'), 'workload': parameters.get('workload'),
+                  'profile': parameters.get('profile')}
+        if force:
+            trials = []
+            with resultsLock:
+                # a forced run starts the trials of the experiment over
+                records.pop(hashKey, None)
+        else:
+            trials = [record['results'] for record in records.get(hashKey, [])]
+
+        previousTrials = len(trials)
+        startTime = time.monotonic()
+        if not trials_needed(trials, startTime):
+            print(description.replace('running', 'skipping', 1) + ' (already measured ' + str(len(trials)) + ' trials)\n', end='', flush=True)
+        else:
+            if workerAddresses is not None:
+                # the worker runs every trial of the experiment, the settings to decide how many go along with it. Where
+                # it runs them, on which cpus and ports, and where the results are stored is up to the worker
+                spec = {setting: value for setting, value in settings.items() if setting not in ['outFolder', 'workers', 'coresPerExperiment', 'basePort', 'portStride',
+                                                                                                  'saveTables', 'resultsStore', 'heartbeatTimeout']}
+                spec.update({'federateNumber': [fedNum], 'messageNumber': [messNum], 'bytesNumber': [bytesNum], 'coreType': [coreNum],
+                             'stagingFolder': None if stagingFolder is None else str(stagingFolder)})
+                trials = run_remote(description, parameters, hashKey, spec, labels)
+            else:
+                # the slot is held for all trials as its broker port ends up in the generated configs
+                slot = freeSlots.get()
+                try:
+                    tempFolder = outFolder / coreNum / str('test_f_' + str(fedNum) + '_m_' + str(messNum) + '_b_' + str(bytesNum))
+                    create_experiment(tempFolder, coSimPlatform, experimentType, fedNum, messNum, bytesNum, updateInterval, simTime, logLevel, logFiles, uninterruptible, coreNum, coreTick, coreTimeout, brokerPorts[slot], brokerFanOut=brokerFanOut, placement=placement, topology=topology,
+                                      federateProcesses=federateProcesses, interface=interface, workload=workload)
+                    while trials_needed(trials, startTime):
+                        trialDescription = description
+                        if repeats > 1 or adaptive:
+                            trialDescription += ' trial=' + str(len(trials)+1)
+                        trialDescription += ' status='
+                        if workers == 1:
+                            print(trialDescription, end='', flush=True)
+                        trialTimeout = simulationTimeout
+                        if adaptiveTimeout:
+                            with resultsLock:
+                                trialTimeout = predict_timeout(records, parameters, simulationTimeout, timeoutFactor, minTimeout)
+                        results = run_experiment(tempFolder, trialTimeout, cpuSets[slot], launcher, startBatchSize, startBatchDelay, sampleInterval=sampleInterval, logLatency=logLatency,
+                                                 cpuPlacement=cpuPlacement, brokerCores=brokerCores, coresPerFederate=coresPerFederate, stagingFolder=stagingFolder,
+                                                 compressLogs=compressLogs, logCap=logCap, stallWindow=stallWindow, stallCpu=stallCpu,
+                                                 profileFederates=profileFederates, profileRecord=profileRecord, profileFrequency=profileFrequency)
+
+                        simStatus = ['success', 'failure', 'timeout'][results['status']]
+                        statusText = format_status(simStatus, results)
+                        if workers == 1:
+                            print(statusText, flush=True)
+                        else:
+                            # a single write keeps the lines of concurrent experiments from interleaving
+                            print(trialDescription + statusText + '\n', end='', flush=True)
+
+                        row = dict(labels)
+                        row.update(results)
+                        row['status'] = simStatus
+                        row['experiment hash'] = hashKey
+                        row['trial'] = len(trials)
+                        row['recorded'] = pd.Timestamp.now(tz='UTC').isoformat()
+
+                        # the trials of this run are neighbours for the timeouts of the experiments that come after them
+                        record_trial(hashKey, parameters, row)
+                        trials.append(row)
+                        if trialCallback is not None:
+                            trialCallback(row)
+                finally:
+                    freeSlots.put(slot)
+
+        summary, outliers = summarize_trials(trials, TIME_COLUMNS + RESOURCE_COLUMNS + LATENCY_COLUMNS + THROUGHPUT_COLUMNS + LOG_COLUMNS + PROFILE_COLUMNS)
+        for trial, outlier in zip(trials, outliers):
+            trial['outlier'] = outlier
+
+        # only the trials run now go to the store, the ones loaded from the results file are already there
+        if resultsStore is not None and len(trials) > previousTrials:
+            storeRecords = []
+            for trial in trials[previousTrials:]:
+                # trials from workers carry the environment of the worker
+                storeRecords.append(dict(parameters, launcher=launcher, sweep=sweepId, **environment))
+                storeRecords[-1].update(trial)
+            with resultsLock:
+                store_results(resultsStore, storeRecords)
+
+        row = dict(labels, **{'experiment hash': hashKey})
+        row.update(summary)
+        row['status'] = 'success' if summary['successful trials'] > 0 else trials[-1]['status']
+        # the federate that was the straggler in most of the trials
+        stragglers = [trial.get('straggler') for trial in trials if trial.get('straggler') is not None]
+        if stragglers:
+            row['straggler'] = max(set(stragglers), key=stragglers.count)
+        failedTrials = [trial for trial in trials if trial['status'] != 'success']
+        if failedTrials:
+            row['failed process'], row['exit code'], row['signal'] = failedTrials[-1]['failed process'], failedTrials[-1]['exit code'], failedTrials[-1]['signal']
+
+        return row, trials
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    # results are kept in sweep order no matter which experiment finishes first so they line up with a serial run
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        outputs = list(executor.map(run_single, range(1, totalTestNum+1)))
+
+    df = pd.DataFrame([row for row, _ in outputs], columns=columns)
+    trialsDf = pd.DataFrame([trial for _, trials in outputs for trial in trials], columns=trialColumns)
+
+    # save the data from the runs, the results file has everything already so these are just the tables for this sweep
+    if saveTables:
+        df.to_csv(outFolder / 'data.csv', index_label='experiment')
+        trialsDf.to_csv(outFolder / 'trials.csv', index=False)
+
+    return df
+
+
+def serve_worker(address, workFolder, authkey, heartbeatInterval=5., basePort=None, portStride=1000):
+    """
+    This function runs a worker agent that runs experiments for a coordinator (run_search with worker addresses). Each
+    connection brings one experiment spec, the agent generates and runs it here with run_search and streams every trial
+    back as it completes. The agent runs one experiment at a time and serves until it is killed
+    
+    Inputs
+        address - tuple of the host and port to listen on
+        workFolder - folder the experiments are created and run in
+        authkey - shared secret the coordinator has to know to send experiments (bytes)
+        heartbeatInterval - time between heartbeats sent to the coordinator while an experiment runs
+        basePort - first broker port of the experiments of this agent, agents on the same host need ranges that do not
+            overlap (None keeps the platform defaults)
+        portStride - number of ports reserved for the experiments of this agent starting at the base port
+
+    Outputs
+        None
+    """
+
+    from multiprocessing.connection import Listener
+
+    # whoever knows the secret can run code on this host, so there is no default one
+    if not authkey:
+        raise Exception('a shared secret (authkey) is needed to run a worker agent')
+
+    workFolder = Path(workFolder)
+    os.makedirs(workFolder, exist_ok=True)
+    environment = environment_metadata()
+
+    with Listener(address, authkey=authkey) as listener:
+        print("worker listening on " + format_address(listener.address), flush=True)
+        while True:
+            try:
+                connection = listener.accept()
+            except (OSError, EOFError) as error:
+                # a client that does not know the authkey or hangs up during the handshake
+                print("WARNING: rejected connection (" + str(error) + ")", flush=True)
+                continue
+
+            sendLock = threading.Lock()
+            finished = threading.Event()
+
+            def send(message):
+                with sendLock:
+                    connection.send(message)
+
+            def send_heartbeats():
+                while not finished.wait(heartbeatInterval):
+                    try:
+                        send({'type': 'heartbeat'})
+                    except (OSError, EOFError):
+                        return
+
+            def send_trial(row):
+                # the coordinator stores the trial with the environment it ran in
+                send({'type': 'trial', 'results': dict(row, **environment)})
+
+            try:
+                message = connection.recv()
+                spec = message['spec']
+                parameters = {'co-simulation platform': spec['coSimPlatform'], 'experiment type': spec['experimentType'], 'core type': spec['coreType'][0],
+                              'federates': spec['federateNumber'][0], 'messages': spec['messageNumber'][0], 'bytes': spec['bytesNumber'][0]}
+                print("running experiment " + json.dumps(parameters), flush=True)
+                heartbeats = threading.Thread(target=send_heartbeats, daemon=True)
+                heartbeats.start()
+                try:
+                    # the coordinator decides what needs to run, so nothing is skipped based on earlier runs here
+                    run_search(workFolder / experiment_hash(spec), force=True, saveTables=False, trialCallback=send_trial,
+                               **dict(spec, basePort=basePort, portStride=portStride))
+                    send({'type': 'done'})
+                except (OSError, EOFError):
+                    raise
+                except Exception as error:
+                    send({'type': 'error', 'error': str(error)})
+                finally:
+                    finished.set()
+            except (OSError, EOFError) as error:
+                print("WARNING: lost the coordinator (" + str(error) + ")", flush=True)
+            finally:
+                connection.close()
+
+
+def sweep_settings():
+    """
+    This function lists the settings of a sweep, everything run_search takes except what only makes sense from the
+    command line or from code. A sweep spec and the experiments sent to the workers are dictionaries of these settings
+    
+    Inputs
+        None
+
+    Outputs
+        list of the names of the run_search arguments
+    """
+
+    settings = run_search.__code__.co_varnames[:run_search.__code__.co_argcount]
+    return [setting for setting in settings if setting not in ['force', 'workerAddresses', 'authkey', 'trialCallback', 'combinations']]
+
+
+def load_sweep_spec(specFile=None):
+    """
+    This function loads a sweep spec, a YAML or JSON file with the run_search settings of a sweep. Settings that are
+    not in the spec keep their SWEEP_DEFAULTS value. The sweep axes (federateNumber, messageNumber, bytesNumber, and
+    coreType) can be given as lists like in run_search, or under
+        product - mapping of axes whose values are combined with every other value
+        zip - list of mappings of axes that are stepped through together (all lists of a mapping have the same length)
+        exclude - list of rules over the axes, points that match any of them are not run, see exclude_point
+    The output folder and results store are relative to the current folder
+    
+    Inputs
+        specFile - YAML or JSON (.json) file with the sweep spec (None for the default sweep)
+
+    Outputs
+        spec - dictionary with every setting of the sweep, see sweep_points for the experiments it runs
+    """
+
+    spec = {}
+    if specFile is not None:
+        with open(specFile) as infile:
+            if Path(specFile).suffix == '.json':
+                spec = json.load(infile)
+            else:
+                import yaml
+                spec = yaml.safe_load(infile)
+        if spec is None:
+            spec = {}
+        if not isinstance(spec, dict):
+            raise Exception('sweep spec ' + str(specFile) + ' is not a mapping of settings')
+
+    settings = sweep_settings()
+    unknown = [key for key in spec if key not in settings + ['product', 'zip', 'exclude']]
+    if unknown:
+        raise Exception('unknown settings in sweep spec ' + str(specFile) + ': ' + ', '.join(unknown))
+
+    sweptAxes = list(spec.get('product') or {}) + [axis for group in spec.get('zip') or [] for axis in group]
+    for axis in sweptAxes:
+        if axis not in SWEEP_AXES:
+            raise Exception('unknown sweep axis ' + axis + ' (the axes are ' + ', '.join(SWEEP_AXES) + ')')
+        if sweptAxes.count(axis) > 1 or axis in spec:
+            raise Exception('sweep axis ' + axis + ' is given more than once')
+
+    spec = dict(SWEEP_DEFAULTS, **spec)
+    spec['outFolder'] = Path(spec['outFolder']).resolve()
+    if spec['resultsStore'] is not None:
+        spec['resultsStore'] = Path(spec['resultsStore']).resolve()
+    return spec
+
+
+def exclude_point(rule, point):
+    """
+    This function matches a point of a sweep against an exclude rule of its sweep spec. A rule is a mapping of axes to
+    conditions and matches when all of them hold. A condition is a value the axis has to be equal to, or a mapping of
+    EXCLUDE_OPERATORS to values, e.g. {'federateNumber': {'>': 1000}, 'coreType': 'tcp'}
+    
+    Inputs
+        rule - mapping of axes to conditions
+        point - dictionary with the value of every axis of the point
+
+    Outputs
+        True when the point matches the rule and is not run
+    """
+
+    if not isinstance(rule, dict) or not rule:
+        raise Exception('an exclude rule is a mapping of sweep axes to conditions (' + str(rule) + ')')
+
+    for axis, condition in rule.items():
+        if axis not in SWEEP_AXES:
+            raise Exception('unknown sweep axis ' + str(axis) + ' in exclude rule (the axes are ' + ', '.join(SWEEP_AXES) + ')')
+        if not isinstance(condition, dict):
+            condition = {'==': condition}
+        for operator, limit in condition.items():
+            if operator not in EXCLUDE_OPERATORS:
+                raise Exception('unknown operator ' + str(operator) + ' in exclude rule (the operators are ' + ', '.join(EXCLUDE_OPERATORS) + ')')
+            try:
+                if not EXCLUDE_OPERATORS[operator](point[axis], limit):
+                    return False
+            except TypeError as error:
+                raise Exception('not able to compare ' + axis + ' to ' + str(limit) + ' in exclude rule (' + str(error) + ')')
+
+    return True
+
+
+def sweep_points(spec):
+    """
+    This function expands a sweep spec (see load_sweep_spec) into the experiments of the sweep. The product axes and zip
+    groups are combined with each other, axes that are not in either come from the settings, and the points that match
+    an exclude rule are dropped
+    
+    Inputs
+        spec - dictionary with the settings of the sweep
+
+    Outputs
+        combinations - list of (federates, messages, bytes, core type) tuples in the order run_search runs them
+    """
+
+    product = dict(spec.get('product') or {})
+    zipped = spec.get('zip') or []
+    sweptAxes = set(product) | set(axis for group in zipped for axis in group)
+    for axis in SWEEP_AXES:
+        if axis not in sweptAxes:
+            product[axis] = spec[axis]
+
+    # every axis and zip group is a list of partial points, ordered by their first axis so the nesting matches run_search
+    groups = [(SWEEP_AXES.index(axis), [{axis: value} for value in (values if isinstance(values, list) else [values])]) for axis, values in product.items()]
+    for group in zipped:
+        if len(set(len(values) for values in group.values())) > 1:
+            raise Exception('the axes of the zip group ' + ', '.join(group) + ' do not have the same number of values')
+        groups.append((min(SWEEP_AXES.index(axis) for axis in group), [dict(zip(group, values)) for values in zip(*group.values())]))
+    groups = [points for _, points in sorted(groups, key=lambda group: group[0])]
+
+    combinations = []
+    for parts in itertools.product(*groups):
+        point = {}
+        for part in parts:
+            point.update(part)
+        if not any(exclude_point(rule, point) for rule in spec.get('exclude') or []):
+            combinations.append(tuple(point[axis] for axis in SWEEP_AXES))
+
+    return combinations
+
+
+def generate_sweep(spec):
+    """
+    This function creates the experiment folders of a sweep without running them, in the same place run_search would
+    create them, so they can be inspected or run from elsewhere (run.sh in each folder)
+    
+    Inputs
+        spec - dictionary with the settings of the sweep, see load_sweep_spec
+
+    Outputs
+        experimentFolders - list of the folders that were created
+    """
+
+    experimentFolders = []
+    for fedNum, messNum, bytesNum, coreNum in sweep_points(spec):
+        tempFolder = spec['outFolder'] / coreNum / str('test_f_' + str(fedNum) + '_m_' + str(messNum) + '_b_' + str(bytesNum))
+        create_experiment(tempFolder, spec['coSimPlatform'], spec['experimentType'], fedNum, messNum, bytesNum, spec['updateInterval'], spec['simTime'], spec['logLevel'], spec['logFiles'],
+                          spec['uninterruptible'], coreNum, spec['coreTick'], spec['coreTimeout'], brokerFanOut=spec['brokerFanOut'], placement=spec.get('placement', 'block'), topology=spec['topology'],
+                          federateProcesses=spec.get('federateProcesses'), interface=spec.get('interface', 'value'),
+                          workload=spec.get('workload'))
+        experimentFolders.append(tempFolder)
+
+    return experimentFolders
+
+
+def find_knee(x, y):
+    """
+    This function finds the knee of a scaling curve, the point where the time starts to grow faster than the federate
+    count. Both axes are normalized and the knee is the point furthest below the line between the first and last point
+    
+    Inputs
+        x - list of federate counts (sorted)
+        y - list of times for those federate counts
+
+    Outputs
+        federate count at the knee (None if there are not enough points)
+    """
+
+    if len(x) < 3:
+        return None
+
+    x = np.array(x, dtype=float)
+    y = np.array(y, dtype=float)
+    if x[-1] == x[0] or y[-1] == y[0]:
+        return None
+    xNorm = (x - x[0]) / (x[-1] - x[0])
+    yNorm = (y - y[0]) / (y[-1] - y[0])
+
+    distance = xNorm - yNorm
+    idx = int(np.argmax(distance))
+    if distance[idx] <= 0:
+        return None
+    return int(x[idx])
+
+
+def find_scaling_limit(outFolder, messageNumber, bytesNumber, updateInterval, simTime, logLevel, logFiles, uninterruptible, coreType, coreTick, coreTimeout, simulationTimeout, coSimPlatform, experimentType, startFederates=10, maxFederates=10000, growthFactor=2, resolution=0.05, wallTimeLimit=None, initTimeLimit=None, repeats=1, resultsStore=None, brokerFanOut=None, placement='block', topology=None, cpuPlacement=None, brokerCores=1, coresPerFederate=None, stallWindow=None, adaptiveTimeout=False, federateProcesses=None, interface='value', workload=None):
+    """
+    This function searches for the largest number of federates each core type can handle for a fixed number of messages
+    and bytes. The federate count grows exponentially until an experiment fails or goes over a time limit and is then
+    narrowed down with a binary search. Results already in results.jsonl of the output folder are reused
+    
+    Inputs
+        outFolder - Folder that the experiments will be created in
+        messageNumber - number of messages per sender
+        bytesNumber - number of bytes in each message 
+        updateInterval - interval between sending messages
+        simTime - total simulation time
+        logLevel - log level for the federates
+        logFiles - flag to determine if log files are created
+        uninterruptible - HELICS setting for federates
+        coreType - list of core types to search (FNCS will ignore the input)
+        coreTick - HELICS setting for federates
+        coreTimeout - HELICS setting for federates
+        simulationTimeout - Timeout value before we consider the experiment failed
+        coSimPlatform - Co-Simulation platform used. FNCS and HELICS supported
+        experimentType - Type of experiment Meshed or ManyToOne
+        startFederates - federate count the search starts with
+        maxFederates - largest federate count that is tried
+        growthFactor - factor the federate count grows by until the first failure
+        resolution - the binary search stops once the gap between the largest passing and smallest failing count is below
+            this fraction of the passing count
+        wallTimeLimit - total (initialization + execution + closing) wall time above which an experiment counts as failed
+        initTimeLimit - initialization wall time above which an experiment counts as failed
+        repeats - number of trials per experiment
+        resultsStore - folder of the columnar results store every new trial is appended to (None to not store them)
+        brokerFanOut - list with the number of sub-brokers per broker on each level of a HELICS broker hierarchy (None
+            for a single broker)
+        placement - how the federates are placed on the leaf brokers of the hierarchy (block or roundrobin)
+        topology - dictionary with the communication_graph settings of Meshed experiments (None for fully connected)
+        cpuPlacement - compact or spread to pin the brokers and federates to their own cpus, see cpu_placement
+        brokerCores - number of cores dedicated to the brokers with a cpu placement
+        coresPerFederate - number of cores every federate gets with a cpu placement (None for every core of the pool)
+        stallWindow - time in seconds a probe may go without advancing before the watchdog stops it (None for no watchdog)
+        adaptiveTimeout - flag to give every probe a timeout predicted from the probes before it, see predict_timeout
+        federateProcesses - number of processes the HELICS federates are packed into (None for a process per federate)
+        interface - one of INTERFACES, how the HELICS federates exchange data
+        workload - dictionary with the workload_schedule settings the HELICS federates replay (None for the fixed workload)
+
+    Outputs
+        limits - pandas dataframe with the largest passing federate count and the knee of the scaling curve per core type
+        probes - pandas dataframe with every experiment the search ran
+    """
+
+    # a meshed federation needs at least two federates to exchange anything
+    minFederates = 2 if experimentType == 'Meshed' else 1
+    if startFederates < minFederates or maxFederates < startFederates:
+        raise Exception('invalid federate range for the search (' + str(startFederates) + ' to ' + str(maxFederates) + ')')
+    # the federate count has to grow for the search to end, and the binary search needs a gap to stop at
+    if growthFactor <= 1:
+        raise Exception('the growth factor of the search has to be larger than 1 (' + str(growthFactor) + ')')
+    if resolution <= 0:
+        raise Exception('the resolution of the search has to be larger than 0 (' + str(resolution) + ')')
+
+    probes = []
+    limits = []
+    for coreNum in coreType:
+        measured = dict()
+
+        def passes(fedNum):
+            if fedNum not in measured:
+                df = run_search(outFolder, [fedNum], [messageNumber], [bytesNumber], updateInterval, simTime, logLevel, logFiles, uninterruptible, [coreNum], coreTick, coreTimeout, simulationTimeout, coSimPlatform, experimentType, repeats=repeats, saveTables=False, resultsStore=resultsStore, brokerFanOut=brokerFanOut, placement=placement, topology=topology,
+                                cpuPlacement=cpuPlacement, brokerCores=brokerCores, coresPerFederate=coresPerFederate, stallWindow=stallWindow, adaptiveTimeout=adaptiveTimeout, federateProcesses=federateProcesses, interface=interface, workload=workload)
+                row = df.iloc[0].to_dict()
+                totalWall = row['initialization time (wall)'] + row['execution time (wall)'] + row['closing time (wall)']
+                row['total time (wall)'] = totalWall
+                row['within limits'] = (row['status'] == 'success'
+                                        and (wallTimeLimit is None or totalWall <= wallTimeLimit)
+                                        and (initTimeLimit is None or row['initialization time (wall)'] <= initTimeLimit))
+                measured[fedNum] = row
+                print('scaling search', coreNum, 'federates=' + str(fedNum), 'within limits=' + str(row['within limits']), flush=True)
+            return measured[fedNum]['within limits']
+
+        # grow until something fails, the count below the minimum is treated as passing so a failing start still gets searched
+        passing = minFederates - 1
+        failing = None
+        fedNum = startFederates
+        while True:
+            if passes(fedNum):
+                passing = fedNum
+                if fedNum == maxFederates:
+                    break
+                fedNum = min(int(np.ceil(fedNum * growthFactor)), maxFederates)
+            else:
+                failing = fedNum
+                break
+
+        # then narrow down the gap between the largest passing and the smallest failing count
+        if failing is not None:
+            while failing - passing > max(1, int(resolution * passing)):
+                fedNum = (passing + failing) // 2
+                if passes(fedNum):
+                    passing = fedNum
+                else:
+                    failing = fedNum
+
+        passed = sorted(fedNum for fedNum in measured if measured[fedNum]['within limits'])
+        knee = find_knee(passed, [measured[fedNum]['execution time (wall)'] for fedNum in passed])
+        limits.append({'core type': coreNum, 'messages': messageNumber, 'bytes': bytesNumber,
+                       'largest passing federates': passing if passing >= minFederates else None,
+                       'smallest failing federates': failing, 'knee federates': knee})
+        probes += [measured[fedNum] for fedNum in sorted(measured)]
+
+    limits = pd.DataFrame(limits)
+    probes = pd.DataFrame(probes)
+    limits.to_csv(outFolder / str('scaling_limit_m_' + str(messageNumber) + '_b_' + str(bytesNumber) + '.csv'), index=False)
+    probes.to_csv(outFolder / str('scaling_probes_m_' + str(messageNumber) + '_b_' + str(bytesNumber) + '.csv'), index=False)
+
+    return limits, probes
+
+
+def fit_scaling_model(federates, values, model):
+    """
+    This function fits a scaling model of a time to the federate count N with least squares. The models are
+        linear - t = intercept + slope * N
+        power - t = a * N^exponent (fitted in log-log space)
+        amdahl - t = serial + parallel / N, Amdahl's law with a serial time and a parallel time spread over the federates
+        usl - t = (1 + sigma * (N-1) + kappa * N * (N-1)) / lambda, the Universal Scalability Law for a federation that
+            grows with the work (the time is N over the throughput of the law)
+    The serial and parallel times and the contention (sigma) and coherency (kappa) terms cannot be negative, a term that
+    would come out negative is left at 0
+    
+    Inputs
+        federates - array of federate counts
+        values - array of the times measured at those counts
+        model - linear, power, amdahl, or usl
+
+    Outputs
+        parameters - dictionary with the fitted parameters of the model
+        predict - function that returns the model's times for an array of federate counts
+    """
+
+    federates = np.asarray(federates, dtype=float)
+    values = np.asarray(values, dtype=float)
+
+    if model == 'linear':
+        slope, intercept = np.polyfit(federates, values, 1)
+        return {'intercept': intercept, 'slope': slope}, lambda count: intercept + slope * np.asarray(count, dtype=float)
+
+    if model == 'power':
+        exponent, logA = np.polyfit(np.log(federates), np.log(values), 1)
+        scale = np.exp(logA)
+        return {'a': scale, 'exponent': exponent}, lambda count: scale * np.asarray(count, dtype=float) ** exponent
+
+    if model not in ['amdahl', 'usl']:
+        raise Exception('unknown scaling model ' + str(model) + ' (linear, power, amdahl, or usl)')
+
+    # both laws are linear in their terms, amdahl in serial and parallel and usl in 1/lambda, sigma/lambda, and
+    # kappa/lambda. Every subset of the terms is tried and the best fit that keeps all of them positive wins, the usl
+    # always keeps its single federate time 1/lambda
+    if model == 'amdahl':
+        basis = lambda count: np.column_stack([np.ones_like(count), 1. / count])
+        required = []
+    else:
+        basis = lambda count: np.column_stack([np.ones_like(count), count - 1, count * (count - 1)])
+        required = [0]
+    terms = basis(federates)
+    optional = [idx for idx in range(0, terms.shape[1]) if idx not in required]
+    best = None
+    for keep in itertools.product([True, False], repeat=len(optional)):
+        columns = required + [idx for idx, kept in zip(optional, keep) if kept]
+        if not columns:
+            continue
+        coefficients = np.zeros(terms.shape[1])
+        coefficients[columns] = np.linalg.lstsq(terms[:, columns], values, rcond=None)[0]
+        if (coefficients[required] <= 0).any() or (coefficients < 0).any():
+            continue
+        residual = ((terms @ coefficients - values) ** 2).sum()
+        if best is None or residual < best[0]:
+            best = (residual, coefficients)
+    if best is None:
+        raise Exception('no ' + model + ' fit with positive terms')
+
+    coefficients = best[1]
+    if model == 'amdahl':
+        parameters = {'serial': coefficients[0], 'parallel': coefficients[1]}
+    else:
+        parameters = {'lambda': 1. / coefficients[0], 'sigma': coefficients[1] / coefficients[0], 'kappa': coefficients[2] / coefficients[0]}
+
+    def predict(count):
+        return basis(np.asarray(count, dtype=float)) @ coefficients
+
+    return parameters, predict
+
+
+def fit_scaling(results, metrics=['execution time (wall)', 'initialization time (wall)'], models=['linear', 'power', 'amdahl', 'usl'], extrapolate=[10000, 100000]):
+    """
+    This function fits scaling models (see fit_scaling_model) to how the times of a sweep grow with the federate count,
+    for every series (e.g. core type) and message and byte count. Every fit reports its goodness of fit and its
+    predictions for federate counts that were not run:
+        r2 - coefficient of determination on the measured points
+        rmse - root mean square error in seconds
+        aicc - corrected Akaike information criterion, the model with the lowest one in a group is marked as best
+        holdout error - relative error of the prediction for the largest federate count when the model is fitted without
+            it, the best guide to how far the extrapolation can be trusted
+    A model needs one point more than it has parameters (and two more for the holdout error)
+    
+    Inputs
+        results - pandas dataframe with the results of run_search, or the sweep folder (its data.csv is used)
+        metrics - list of time columns to fit
+        models - list of models to fit
+        extrapolate - list of federate counts to predict the times for
+
+    Outputs
+        fits - pandas dataframe with one row per series, messages, bytes, metric, and model
+    """
+
+    if not isinstance(results, pd.DataFrame):
+        results = pd.read_csv(Path(results) / 'data.csv')
+    # the frame run_search builds has its columns added one at a time, a copy puts them back together before adding one
+    data = results.copy()
+    data['series'] = result_series(data)
+    if 'status' in data.columns:
+        data = data[data['status'] == 'success']
+
+    parameterCount = {'linear': 2, 'power': 2, 'amdahl': 2, 'usl': 3}
+    fits = []
+    for (series, messNum, bytesNum), group in data.groupby(['series', 'messages', 'bytes'], sort=True):
+        for metric in metrics:
+            points = group[['federates', metric]].dropna()
+            # power laws live in log space and the laws need positive times, zero times are below the clock resolution
+            points = points[(points['federates'] > 0) & (points[metric] > 0)].groupby('federates')[metric].median()
+            federates, values = points.index.to_numpy(dtype=float), points.to_numpy(dtype=float)
+            groupFits = []
+            for model in models:
+                row = {'series': series, 'messages': messNum, 'bytes': bytesNum, 'metric': metric, 'model': model, 'points': len(federates),
+                       'federates min': federates.min() if len(federates) else np.nan, 'federates max': federates.max() if len(federates) else np.nan,
+                       'parameters': None, 'r2': np.nan, 'rmse': np.nan, 'aicc': np.nan, 'holdout error': np.nan, 'best': False}
+                for count in extrapolate:
+                    row['prediction at ' + str(count) + ' federates'] = np.nan
+                parameters = parameterCount[model]
+                if len(federates) <= parameters:
+                    groupFits.append(row)
+                    continue
+                try:
+                    fitted, predict = fit_scaling_model(federates, values, model)
+                except Exception as error:
+                    print("WARNING: " + str(error) + " for " + metric + " of " + str(series) + " messages=" + str(messNum) + " bytes=" + str(bytesNum))
+                    groupFits.append(row)
+                    continue
+
+                residual = ((predict(federates) - values) ** 2).sum()
+                total = ((values - values.mean()) ** 2).sum()
+                row['parameters'] = ' '.join([name + '=' + '%.4g' % value for name, value in fitted.items()])
+                row['r2'] = 1. - residual / total if total > 0 else np.nan
+                row['rmse'] = np.sqrt(residual / len(federates))
+                # the correction keeps small sweeps from favouring the models with more parameters
+                if len(federates) > parameters + 1:
+                    row['aicc'] = len(federates) * np.log(max(residual, 1e-300) / len(federates)) + 2 * parameters + 2. * parameters * (parameters + 1) / (len(federates) - parameters - 1)
+                    try:
+                        _, holdoutPredict = fit_scaling_model(federates[:-1], values[:-1], model)
+                        row['holdout error'] = abs(float(holdoutPredict(federates[-1:])[0]) - values[-1]) / values[-1]
+                    except Exception:
+                        pass
+                for count in extrapolate:
+                    row['prediction at ' + str(count) + ' federates'] = float(predict([count])[0])
+                groupFits.append(row)
+
+            scored = [row for row in groupFits if not np.isnan(row['aicc'])]
+            if scored:
+                min(scored, key=lambda row: row['aicc'])['best'] = True
+            fits += groupFits
+
+    return pd.DataFrame(fits)
+
+
+def result_series(df):
+    """
+    This function labels every result with the series it is plotted in, made up of the experiment settings that vary in
+    the results (e.g. the core type, or the co-simulation platform and core type when several platforms were run)
+    
+    Inputs
+        df - pandas dataframe with experiment results (e.g. data.csv of a sweep)
+
+    Outputs
+        pandas series with the label of every row
+    """
+
+    candidates = ['co-simulation platform', 'experiment type', 'core type', 'broker fan out', 'placement', 'topology', 'cpu placement', 'federate processes', 'interface', 'workload', 'profile']
+    varying = [column for column in candidates if column in df.columns and df[column].nunique(dropna=False) > 1]
+    if not varying:
+        varying = ['core type']
+    labels = df[varying].astype(str)
+    return labels[varying[0]].str.cat([labels[column] for column in varying[1:]], sep=' ')
+
+
+def plot_data(df, outFile='fig.png'):
+    """
+    This function plots the wall clock time results from the experiment as grouped bars per core type
+    
+    Inputs
+        df - Pandas data frame with experiment data 
+        outFile - image file the figure is saved to
+
+    Outputs
+        wide - pandas dataframe with the initialization, execution, and closing wall times per experiment and series
+    """ 
+
+    from matplotlib.figure import Figure
+
+    metrics = ['initialization time (wall)', 'execution time (wall)', 'closing time (wall)']
+    data = df.assign(series=result_series(df))
+    # one pivot puts the series side by side, experiments that were not run for every series are simply left empty
+    wide = data.pivot_table(index=['federates', 'messages', 'bytes'], columns='series', values=metrics, aggfunc='first').sort_index()
+    plotLabels = ['f-' + str(fedNum) + '-m-' + str(messNum) + '-b-' + str(bytesNum) for fedNum, messNum, bytesNum in wide.index]
+    seriesNames = list(wide[metrics[0]].columns)
+
+    fig = Figure(figsize=(max(6.4, 0.4 * len(plotLabels) * max(1, len(seriesNames) / 3)), 7.2))
+    axes = fig.subplots(3, sharex=True)
     index = np.arange(len(plotLabels))
-    bar_width = 0.1
-    opacity = 0.8
-
-    initTime = pd.DataFrame();
-    executionTime = pd.DataFrame();
-    closeTime = pd.DataFrame();
-    for idx, core in enumerate(coreUnique):
-        temp = df.loc[df['core type'].isin([core]),['initialization time (wall)']]
-        temp.reset_index(drop=True, inplace=True)
-        temp.columns = [core]
-        temp.index = [plotLabels] 
-        initTime = pd.concat([initTime, temp], axis=1)
-                
-        ax1.bar(index + idx*bar_width, temp[core], bar_width,
-                        alpha=opacity)
-
-        temp = df.loc[df['core type'].isin([core]),['execution time (wall)']]
-        temp.reset_index(drop=True, inplace=True)
-        temp.columns = [core]
-        temp.index = [plotLabels] 
-        executionTime = pd.concat([executionTime, temp], axis=1)
-                
-        ax2.bar(index + idx*bar_width, temp[core], bar_width,
-                        alpha=opacity)
-
-        temp = df.loc[df['core type'].isin([core]),['closing time (wall)']]
-        temp.reset_index(drop=True, inplace=True)
-        temp.columns = [core]
-        temp.index = [plotLabels] 
-        closeTime = pd.concat([closeTime, temp], axis=1)
-                
-        ax3.bar(index + idx*bar_width, temp[core], bar_width,
-                        alpha=opacity)
-    
-    ax1.set_title('Test Suite Experiment Results (wall time)')
-    ax2.set_ylabel('time (s)')
-    plt.xticks(index + bar_width, (plotLabels))
-    fig.legend(coreUnique)
-    plt.savefig('fig.png')
-    plt.show()
+    barWidth = 0.8 / max(1, len(seriesNames))
+    for ax, metric in zip(axes, metrics):
+        for idx, series in enumerate(seriesNames):
+            ax.bar(index + idx*barWidth, wide[(metric, series)].to_numpy(dtype=float), barWidth, alpha=0.8, label=series)
+        ax.set_ylabel(metric.replace(' (wall)', ' (s)'))
+
+    axes[0].set_title('Test Suite Experiment Results (wall time)')
+    axes[-1].set_xticks(index + barWidth * (len(seriesNames) - 1) / 2)
+    axes[-1].set_xticklabels(plotLabels, rotation=90)
+    axes[0].legend(fontsize='small')
+    fig.tight_layout()
+    fig.savefig(outFile)
+
+    return wide
+
+
+def write_report(results, reportFolder, metrics=['initialization time (wall)', 'execution time (wall)', 'closing time (wall)']):
+    """
+    This function writes a self-contained report of a sweep to a folder without needing a display. For every metric it
+    draws the scaling curves (metric vs federates per series, one panel per messages and bytes combination, with the
+    confidence interval of the repeats as error bars) and heatmaps over the federates x messages grid. The figures,
+    summary.csv, and an index.html that shows them are written to the report folder
+    
+    Inputs
+        results - pandas dataframe with the results of run_search, or the sweep folder (its data.csv is used)
+        reportFolder - folder the report is written to
+        metrics - list of result columns to report
+
+    Outputs
+        summary - pandas dataframe with the median of every metric per experiment and series
+    """
+
+    from matplotlib.figure import Figure
+    from matplotlib.colors import LogNorm
+
+    if not isinstance(results, pd.DataFrame):
+        results = pd.read_csv(Path(results) / 'data.csv')
+    reportFolder = Path(reportFolder)
+    os.makedirs(reportFolder, exist_ok=True)
+
+    # only the columns of the report are kept, metrics without a confidence interval (single trials) get empty ones
+    valueColumns = [metric + suffix for metric in metrics for suffix in ['', ' ci low', ' ci high']]
+    keyColumns = [column for column in ['experiment hash', 'status', 'federates', 'messages', 'bytes', 'trials', 'successful trials'] if column in results.columns]
+    data = results.reindex(columns=keyColumns + valueColumns).assign(series=result_series(results))
+
+    # failed experiments are reported as zero times, they are left out of the figures instead of plotted as fast
+    failed = data['status'] != 'success' if 'status' in data.columns else pd.Series(False, index=data.index)
+    data.loc[failed, valueColumns] = np.nan
+
+    wide = data.pivot_table(index=['messages', 'bytes', 'federates'], columns='series', values=valueColumns, aggfunc='first', dropna=False).sort_index()
+    seriesNames = sorted(data['series'].unique())
+    messageValues = sorted(data['messages'].unique())
+    bytesValues = sorted(data['bytes'].unique())
+    federateValues = sorted(data['federates'].unique())
+    logScale = len(federateValues) > 1 and federateValues[-1] >= 20 * max(1, federateValues[0])
+
+    figures = []
+    for metric in metrics:
+        name = re.sub('[^a-z0-9]+', '_', metric.lower()).strip('_')
+
+        # scaling curves, one panel per messages and bytes combination
+        fig = Figure(figsize=(4 * len(bytesValues), 3 * len(messageValues)))
+        axes = fig.subplots(len(messageValues), len(bytesValues), squeeze=False, sharex=True)
+        for row, messNum in enumerate(messageValues):
+            for col, bytesNum in enumerate(bytesValues):
+                ax = axes[row][col]
+                if (messNum, bytesNum) not in wide.index.droplevel('federates'):
+                    ax.set_visible(False)
+                    continue
+                panel = wide.loc[(messNum, bytesNum)]
+                for series in seriesNames:
+                    median = panel[(metric, series)].to_numpy(dtype=float)
+                    low = panel[(metric + ' ci low', series)].to_numpy(dtype=float)
+                    high = panel[(metric + ' ci high', series)].to_numpy(dtype=float)
+                    yerr = np.nan_to_num(np.vstack([median - low, high - median]).clip(min=0))
+                    ax.errorbar(panel.index.to_numpy(), median, yerr=yerr, marker='o', markersize=3, capsize=2, label=series)
+                # the scaling curves are log-log when the federate counts span more than an order of magnitude
+                if logScale:
+                    ax.set_xscale('log')
+                    ax.set_yscale('log')
+                ax.set_title('messages=' + str(messNum) + ' bytes=' + str(bytesNum), fontsize='small')
+                if row == len(messageValues) - 1:
+                    ax.set_xlabel('federates')
+                if col == 0:
+                    ax.set_ylabel(metric)
+        axes[0][0].legend(fontsize='x-small')
+        fig.tight_layout()
+        fig.savefig(reportFolder / str('scaling_' + name + '.png'))
+        figures.append(('Scaling of ' + metric, 'scaling_' + name + '.png'))
+
+        # heatmaps over the federates x messages grid, one per series and bytes
+        grid = data.pivot_table(index=['series', 'bytes', 'messages'], columns='federates', values=metric, aggfunc='first', dropna=False).sort_index()
+        fig = Figure(figsize=(max(4, 0.6 * len(federateValues) + 2) * len(bytesValues), max(2.5, 0.4 * len(messageValues) + 1.5) * len(seriesNames)))
+        axes = fig.subplots(len(seriesNames), len(bytesValues), squeeze=False)
+        for row, series in enumerate(seriesNames):
+            for col, bytesNum in enumerate(bytesValues):
+                ax = axes[row][col]
+                if (series, bytesNum) not in grid.index.droplevel('messages'):
+                    ax.set_visible(False)
+                    continue
+                cells = grid.loc[(series, bytesNum)].reindex(index=messageValues, columns=federateValues)
+                values = cells.to_numpy(dtype=float)
+                positive = values[values > 0]
+                norm = LogNorm(positive.min(), positive.max()) if len(positive) and positive.max() > 100 * positive.min() else None
+                image = ax.imshow(values, aspect='auto', origin='lower', cmap='viridis', norm=norm)
+                ax.set_xticks(np.arange(len(federateValues)))
+                ax.set_xticklabels(federateValues, rotation=90, fontsize='x-small')
+                ax.set_yticks(np.arange(len(messageValues)))
+                ax.set_yticklabels(messageValues, fontsize='x-small')
+                # the values are only written in the cells while they stay readable
+                if cells.size <= 100:
+                    for (y, x), value in np.ndenumerate(values):
+                        if not np.isnan(value):
+                            ax.text(x, y, '%.3g' %(value), ha='center', va='center', fontsize='x-small', color='white')
+                ax.set_title(series + ' bytes=' + str(bytesNum), fontsize='small')
+                ax.set_xlabel('federates')
+                ax.set_ylabel('messages')
+                fig.colorbar(image, ax=ax, label=metric)
+        fig.tight_layout()
+        fig.savefig(reportFolder / str('heatmap_' + name + '.png'))
+        figures.append(('Heatmap of ' + metric, 'heatmap_' + name + '.png'))
+
+    summaryColumns = [column for column in ['experiment hash', 'series', 'status', 'federates', 'messages', 'bytes', 'trials', 'successful trials'] if column in data.columns]
+    summary = data[summaryColumns + metrics].sort_values(['series', 'messages', 'bytes', 'federates'])
+    summary.to_csv(reportFolder / 'summary.csv', index=False)
+
+    with open(reportFolder / 'index.html', 'w') as outfile:
+        outfile.write('<!DOCTYPE html>\n<html>\n<head><meta charset="utf-8"><title>Test Suite Report</title></head>\n<body>\n')
+        outfile.write('<h1>Test Suite Report</h1>\n')
+        outfile.write('<p>' + str(len(data)) + ' experiments, ' + str(int(failed.sum())) + ' failed, series: ' + ', '.join(seriesNames) + '</p>\n')
+        for title, image in figures:
+            outfile.write('<h2>' + title + '</h2>\n<img src="' + image + '" style="max-width:100%">\n')
+        outfile.write('<h2>Results</h2>\n' + summary.to_html(index=False, na_rep='', float_format=lambda value: '%.4g' %(value)) + '\n')
+        outfile.write('</body>\n</html>\n')
+
+    return summary
 
 
 if __name__ == '__main__':
-    experimentName = 'test_HELICS'  # name of the experiment folder that will be created 
-    federateNumber = [100, 200]     # list of number of federates you want to test with               
-    messageNumber = [1, 10]         # number of messages per federate        
-    bytesNumber = [1, 10]           # size of each message in bytes
-    coreType = ['zmq','tcp']        # core types to test. FNCS will ignore the input
-    updateInterval = 10.            # interval between time updates
-    simTime = 100.                  # total simulation time
-    logLevel = 'INFO'               # ERROR, WARNING, INFO, DEBUG DEBUG1-4
-    logFiles = True                 # flag to determine if log files are created per federate
-    uninterruptible = False         # HELICS specific flag
-    coreTick = '30s'                # HELICS specific flag
-    coreTimeout = '30s'             # HELICS specific flag
-    simulationTimeout = 120         # global timeout for any simulation
-    coSimPlatform = 'HELICS'        # Co-Simulation platform to use (either HELICS or FNCS)
-    experimentType = 'ManyToOne'    # experiment type to use (either ManyToOne or Meshed)
-
-    df = run_search(Path(os.getcwd()) / experimentName, federateNumber, messageNumber, bytesNumber, updateInterval, simTime, logLevel, logFiles, uninterruptible, coreType, coreTick, coreTimeout, simulationTimeout, coSimPlatform, experimentType)
-
-    # create_many_to_one_experiment_helics(Path(os.getcwd()) / experimentName, federateNumber[0], messageNumber[0], bytesNumber[0], updateInterval, simTime, logLevel, logFiles, uninterruptible, coreType[0], coreTick, coreTimeout)    
-    # create_meshed_experiment_helics(Path(os.getcwd()) / experimentName, federateNumber[0], federateNumber[0]-1, messageNumber[0], bytesNumber[0], updateInterval, simTime, logLevel, logFiles, uninterruptible, coreType[0], coreTick, coreTimeout)
-    # create_many_to_one_experiment_fncs(Path(os.getcwd()) / experimentName, federateNumber[0], messageNumber[0], bytesNumber[0], updateInterval, simTime, logLevel, logFiles)    
-    # create_meshed_experiment_fncs(Path(os.getcwd()) / experimentName, federateNumber[0], federateNumber[0]-1, messageNumber[0], bytesNumber[0], updateInterval, simTime, logLevel, logFiles)
-    # result = run_experiment(Path(os.getcwd()) / experimentName)
-    # print(result)  
-
-    # plot results
-    # df = pd.read_csv('/Users/hans464/Desktop/test_HELICS/data.csv')
-    # plot_data(df)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Runs the co-simulation test suite experiments')
+    authkey = argparse.ArgumentParser(add_help=False)
+    authkey.add_argument('--authkey', default=os.environ.get('HELICS_TEST_SUITE_AUTHKEY'), help='shared secret between the coordinator and its workers (defaults to $HELICS_TEST_SUITE_AUTHKEY), needed with --dispatch and by a worker')
+    commands = parser.add_subparsers(dest='command', metavar='COMMAND')
+
+    generate = commands.add_parser('generate', help='create the experiment folders of a sweep without running them')
+    generate.add_argument('spec', help='YAML or JSON sweep spec')
+
+    run = commands.add_parser('run', parents=[authkey], help='run a sweep')
+    run.add_argument('spec', nargs='?', help='YAML or JSON sweep spec (the default sweep without one)')
+    run.add_argument('--force', action='store_true', help='run every experiment again even if it already has a result')
+    run.add_argument('--dispatch', nargs='+', metavar='HOST:PORT', help='run the sweep on these worker agents instead of here')
+
+    limit = commands.add_parser('limit', help='search for the largest number of federates each core type of a sweep spec can handle')
+    limit.add_argument('spec', nargs='?', help='YAML or JSON sweep spec with a single message and byte count (the default sweep settings without one)')
+    limit.add_argument('--start', type=int, default=10, help='federate count the search starts with (default 10)')
+    limit.add_argument('--max', type=int, default=10000, help='largest federate count that is tried (default 10000)')
+    limit.add_argument('--growth', type=float, default=2., help='factor the federate count grows by until the first failure (default 2)')
+    limit.add_argument('--resolution', type=float, default=0.05, help='relative gap the binary search stops at (default 0.05)')
+    limit.add_argument('--wall-limit', type=float, default=None, help='total wall time in seconds above which an experiment counts as failed')
+    limit.add_argument('--init-limit', type=float, default=None, help='initialization wall time in seconds above which an experiment counts as failed')
+
+    report = commands.add_parser('report', help='write the report (figures and index.html) of a sweep folder to its report folder')
+    report.add_argument('sweep', help='sweep folder with a data.csv')
+
+    fit = commands.add_parser('fit', help='fit scaling models to the times of a sweep folder and write them to its fits.csv')
+    fit.add_argument('sweep', help='sweep folder with a data.csv')
+    fit.add_argument('--extrapolate', nargs='+', type=int, default=[10000, 100000], metavar='FEDERATES', help='federate counts to predict the times for (default 10000 100000)')
+
+    compare = commands.add_parser('compare', help='compare the results of two sweep (or harness benchmark) folders, exits with 1 on a regression')
+    compare.add_argument('baseline', help='sweep folder, results file, or trials.csv of the baseline')
+    compare.add_argument('candidate', help='sweep folder, results file, or trials.csv of the candidate')
+    compare.add_argument('--threshold', type=float, default=0.05, help='relative increase of a metric that counts as a regression (default 0.05)')
+    compare.add_argument('--alpha', type=float, default=0.05, help='significance level of the regression test (default 0.05)')
+    compare.add_argument('--report', default='regression_report.json', help='file the comparison report is written to')
+
+    worker = commands.add_parser('worker', parents=[authkey], help='run a worker agent that runs experiments for a coordinator')
+    worker.add_argument('address', metavar='HOST:PORT', help='address to listen on')
+    worker.add_argument('--work-folder', default='worker', help='folder the worker agent runs its experiments in')
+    worker.add_argument('--base-port', type=int, default=None, help='first broker port of the experiments, give every worker on a host its own range (default: platform defaults)')
+    worker.add_argument('--port-stride', type=int, default=1000, help='number of ports reserved for the experiments of the worker')
+
+    benchmark = commands.add_parser('benchmark', help='benchmark the overhead of the test suite itself with the NOOP stand-in platform')
+    benchmark.add_argument('folder', help='folder the benchmark is run in')
+    args = parser.parse_args()
+
+    # the workers run whatever the coordinator sends them, so there is no built-in secret to fall back on
+    if (args.command == 'worker' or (args.command == 'run' and args.dispatch)) and not args.authkey:
+        parser.error('--authkey or $HELICS_TEST_SUITE_AUTHKEY is needed to ' + ('run a worker agent' if args.command == 'worker' else 'dispatch the sweep to workers'))
+
+    if args.command is None:
+        parser.print_help()
+        sys.exit(1)
+
+    if args.command == 'generate':
+        spec = load_sweep_spec(args.spec)
+        experimentFolders = generate_sweep(spec)
+        print('generated ' + str(len(experimentFolders)) + ' experiments in ' + str(spec['outFolder']))
+
+    if args.command == 'run':
+        spec = load_sweep_spec(args.spec)
+        settings = {key: value for key, value in spec.items() if key not in ['product', 'zip', 'exclude']}
+        run_search(combinations=sweep_points(spec), force=args.force, authkey=args.authkey.encode() if args.authkey else None,
+                        workerAddresses=[parse_address(address) for address in args.dispatch] if args.dispatch else None, **settings)
+
+    if args.command == 'limit':
+        spec = load_sweep_spec(args.spec)
+        # the search grows the federate count itself, so only the other axes of the spec are used
+        points = sweep_points(spec)
+        if len(set((messageNum, bytesNum) for _, messageNum, bytesNum, _ in points)) != 1:
+            parser.error('the sweep spec of a scaling limit search has a single message and byte count')
+        _, messageNum, bytesNum, _ = points[0]
+        searched = find_scaling_limit.__code__.co_varnames[:find_scaling_limit.__code__.co_argcount]
+        settings = {key: value for key, value in spec.items() if key in searched and key not in ['messageNumber', 'bytesNumber', 'coreType']}
+        limits, probes = find_scaling_limit(messageNumber=messageNum, bytesNumber=bytesNum, coreType=list(dict.fromkeys(point[3] for point in points)),
+                                            startFederates=args.start, maxFederates=args.max, growthFactor=args.growth, resolution=args.resolution,
+                                            wallTimeLimit=args.wall_limit, initTimeLimit=args.init_limit, **settings)
+        print(limits.to_string(index=False))
+
+    if args.command == 'report':
+        write_report(Path(args.sweep), Path(args.sweep) / 'report')
+
+    if args.command == 'fit':
+        fits = fit_scaling(Path(args.sweep), extrapolate=args.extrapolate)
+        fits.to_csv(Path(args.sweep) / 'fits.csv', index=False)
+        if len(fits) == 0:
+            print("WARNING: no successful experiments to fit in", args.sweep)
+        for _, group in (fits.groupby(['series', 'messages', 'bytes', 'metric'], sort=False) if len(fits) else []):
+            # without enough points for the information criterion every model that could be fitted is listed
+            shown = group[group['best']] if group['best'].any() else group[group['parameters'].notna()]
+            if len(shown) == 0:
+                row = group.iloc[0]
+                print('not enough points to fit', row['series'], 'messages=' + str(row['messages']), 'bytes=' + str(row['bytes']), row['metric'],
+                      '(' + str(row['points']) + ' federate counts)')
+            for _, row in shown.iterrows():
+                print(row['series'], 'messages=' + str(row['messages']), 'bytes=' + str(row['bytes']), row['metric'] + ':', row['model'], row['parameters'],
+                      'r2=%.3f holdout error=%.1f%%' % (row['r2'], 100. * row['holdout error']),
+                      ' '.join(['%d federates=%.1fs' % (count, row['prediction at ' + str(count) + ' federates']) for count in args.extrapolate]))
+
+    if args.command == 'compare':
+        # harness benchmarks are compared on the stages of the test suite, sweeps on the experiment results
+        harness = all(os.path.isfile(Path(folder) / 'harness_trials.csv') for folder in [args.baseline, args.candidate])
+        sys.exit(regression_gate(args.baseline, args.candidate, args.report, HARNESS_COLUMNS if harness else GATE_METRICS, threshold=args.threshold, alpha=args.alpha))
+
+    if args.command == 'worker':
+        serve_worker(parse_address(args.address), Path(args.work_folder).resolve(), args.authkey.encode(), basePort=args.base_port, portStride=args.port_stride)
+
+    if args.command == 'benchmark':
+        benchmark_harness(Path(args.folder).resolve())
@@ -0,0 +1,19 @@
+"""
+Shared setup of the tests, the test suite script is imported from the folder above. Tests that run experiments on the
+NOOP stand-in platform take the noop_platform fixture, they are skipped when noop_broker and testFedNoop (built from the
+federates folder) are not on the PATH
+"""
+
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+
+@pytest.fixture
+def noop_platform():
+    if shutil.which('noop_broker') is None or shutil.which('testFedNoop') is None:
+        pytest.skip('noop_broker and testFedNoop are not on the PATH')
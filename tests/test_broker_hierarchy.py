@@ -0,0 +1,44 @@
+"""
+Tests of the broker hierarchies
+"""
+
+import pytest
+
+import helicsTestSuite as suite
+
+
+def test_broker_hierarchy_block():
+    names = ['fed' + str(idx) for idx in range(0, 8)]
+    brokers, federatePorts = suite.broker_hierarchy(names, [2], brokerPort=40000)
+
+    assert [broker['name'] for broker in brokers] == ['broker', 'broker_1_0', 'broker_1_1']
+    assert [broker['port'] for broker in brokers] == [40000, 40001, 40002]
+    assert [broker['parent'] for broker in brokers] == [None, 40000, 40000]
+    assert [broker['federates'] for broker in brokers] == [8, 4, 4]
+    assert brokers[0]['portStart'] is None
+    # every leaf gets its own range of core ports after the broker ports
+    assert brokers[1]['portStart'] == 40003
+    assert brokers[2]['portStart'] == 40003 + 2 * 4 + 4
+    assert [federatePorts[name] for name in names] == [40001] * 4 + [40002] * 4
+
+
+def test_broker_hierarchy_roundrobin_two_levels():
+    names = ['fed' + str(idx) for idx in range(0, 8)]
+    brokers, federatePorts = suite.broker_hierarchy(names, [2, 2], placement='roundrobin', brokerPort=40000)
+
+    assert len(brokers) == 7
+    leaves = [broker for broker in brokers if broker['children'] == 0]
+    assert [leaf['federates'] for leaf in leaves] == [2, 2, 2, 2]
+    assert [federatePorts[name] for name in names[:4]] == [leaf['port'] for leaf in leaves]
+    # parents are listed before their children
+    ports = [broker['port'] for broker in brokers]
+    assert all(broker['parent'] is None or ports.index(broker['parent']) < ports.index(broker['port']) for broker in brokers)
+
+
+def test_broker_hierarchy_errors():
+    with pytest.raises(Exception, match='more leaf brokers'):
+        suite.broker_hierarchy(['fed0', 'fed1'], [4])
+    with pytest.raises(Exception, match='at least one broker'):
+        suite.broker_hierarchy(['fed0', 'fed1'], [0])
+    with pytest.raises(Exception, match='unknown federate placement'):
+        suite.broker_hierarchy(['fed0', 'fed1'], [2], placement='random')
@@ -0,0 +1,51 @@
+"""
+Tests of the communication graphs of the Meshed experiments
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import helicsTestSuite as suite
+
+
+def test_communication_graph_ring():
+    neighbours = suite.communication_graph(5, 'ring', degree=2)
+    assert neighbours == [[1, 2], [2, 3], [3, 4], [4, 0], [0, 1]]
+
+
+def test_ring_does_not_load_numpy(tmp_path):
+    # the default meshed experiments are generated without numpy, which takes longer to import than generating them
+    script = '\n'.join(['import sys', 'from pathlib import Path', 'sys.path.insert(0, sys.argv[1])', 'import helicsTestSuite as suite',
+                        'suite.create_experiment(Path(sys.argv[2]) / "meshed", "HELICS", "Meshed", 10, 1, 8, 1., 5., "INFO", False, False, "zmq", "1s", "30s")',
+                        'print("numpy._core" in sys.modules)'])
+    output = subprocess.run([sys.executable, '-c', script, str(Path(suite.__file__).parent), str(tmp_path)], stdout=subprocess.PIPE, check=True, universal_newlines=True).stdout
+    assert output.strip() == 'False'
+
+
+@pytest.mark.parametrize('graph, degree', [('regular', 4), ('erdos-renyi', 4), ('scale-free', 4), ('clustered', 4)])
+def test_communication_graph_symmetric(graph, degree):
+    neighbours = suite.communication_graph(40, graph, degree=degree, seed=1)
+
+    assert len(neighbours) == 40
+    links = set((fed, int(other)) for fed, others in enumerate(neighbours) for other in others)
+    assert all((other, fed) in links for fed, other in links)
+    assert all(fed != other for fed, other in links)
+    if graph == 'regular':
+        assert all(len(others) == degree for others in neighbours)
+    # the same seed gives the same graph
+    again = suite.communication_graph(40, graph, degree=degree, seed=1)
+    assert all(np.array_equal(first, second) for first, second in zip(neighbours, again))
+
+
+def test_communication_graph_edgelist(tmp_path):
+    edgeList = tmp_path / 'edges.txt'
+    edgeList.write_text('# links\n0 1\nfed1 fed2\n2 1\n')
+    neighbours = suite.communication_graph(4, 'edgelist', edgeList=edgeList)
+
+    assert [list(others) for others in neighbours] == [[1], [0, 2], [1], []]
+    with pytest.raises(Exception, match='invalid degree'):
+        suite.communication_graph(4, 'ring', degree=4)
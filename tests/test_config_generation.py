@@ -0,0 +1,71 @@
+"""
+Tests of the experiment configs generated from the pre-serialized templates
+"""
+
+import json
+
+import pytest
+
+import helicsTestSuite as suite
+
+
+def create(folder, coSimPlatform, experimentType, **settings):
+    return suite.create_experiment(folder, coSimPlatform, experimentType, 3, 2, 8, 1., 5., 'INFO', False, False, 'zmq', '1s', '30s', **settings)
+
+
+def test_helics_many_to_one_configs(tmp_path):
+    configBytes = create(tmp_path, 'HELICS', 'ManyToOne')
+
+    configFiles = sorted(tmp_path.glob('*.json'))
+    configFiles.remove(tmp_path / 'launch.json')
+    assert [configFile.name for configFile in configFiles] == ['echo.json', 'send0.json', 'send1.json', 'send2.json']
+    # only the federate configs are counted, not the launch files
+    assert configBytes == sum(configFile.stat().st_size for configFile in configFiles)
+
+    echo = json.loads((tmp_path / 'echo.json').read_text())
+    assert echo['coreInit'] == '--federates=1 --tick=1s --timeout=30s'
+    assert [publication['key'] for publication in echo['publications']] == ['send' + str(fed) + '_m' + str(message) for fed in range(0, 3) for message in range(0, 2)]
+    assert [subscription['key'] for subscription in echo['subscriptions']] == ['send' + str(fed) + '/send' + str(fed) + '_m' + str(message) for fed in range(0, 3) for message in range(0, 2)]
+    sender = json.loads((tmp_path / 'send1.json').read_text())
+    assert [publication['key'] for publication in sender['publications']] == ['send1_m0', 'send1_m1']
+    assert [subscription['key'] for subscription in sender['subscriptions']] == ['echo/send1_m0', 'echo/send1_m1']
+
+    manifest = json.loads((tmp_path / 'launch.json').read_text())
+    assert [process['name'] for process in manifest['processes']] == ['broker', 'echo', 'send0', 'send1', 'send2']
+    assert '--federates=4' in manifest['processes'][0]['command']
+    assert manifest['workload'] == {'messages per step': 12, 'bytes': 8, 'steps': 5}
+
+
+@pytest.mark.parametrize('experimentType', ['ManyToOne', 'Meshed'])
+def test_configs_do_not_depend_on_formatting_or_threads(tmp_path, experimentType):
+    create(tmp_path / 'compact', 'HELICS', experimentType)
+    create(tmp_path / 'indented', 'HELICS', experimentType, compact=False)
+    create(tmp_path / 'threads', 'HELICS', experimentType, writeThreads=3)
+
+    for configFile in (tmp_path / 'compact').glob('*.json'):
+        assert json.loads((tmp_path / 'indented' / configFile.name).read_text()) == json.loads(configFile.read_text())
+        assert (tmp_path / 'threads' / configFile.name).read_bytes() == configFile.read_bytes()
+
+
+def test_fncs_meshed_configs(tmp_path):
+    yaml = pytest.importorskip('yaml')
+    create(tmp_path, 'FNCS', 'Meshed', brokerPort=6000)
+
+    config = yaml.safe_load((tmp_path / 'fed0.yaml').read_text())
+    assert config['name'] == 'fed0'
+    assert config['broker'] == 'tcp://localhost:6000'
+    # every federate subscribes to each message of every other federate
+    assert sorted(value['topic'] for value in config['values'].values()) == ['fed1/m0', 'fed1/m1', 'fed2/m0', 'fed2/m1']
+
+
+def test_benchmark_config_generation(tmp_path):
+    results = suite.benchmark_config_generation(tmp_path, [2, 4], [1], coSimPlatform=['HELICS'])
+
+    assert len(results) == 4
+    assert (results['config bytes'] > 0).all()
+    for _, sizes in results.groupby('experiment type')['config bytes']:
+        # more federates need more configs
+        assert sizes.iloc[0] < sizes.iloc[1]
+    assert (tmp_path / 'config_generation_benchmark.csv').is_file()
+    # the generated experiments are removed once they are measured
+    assert not (tmp_path / 'HELICS' / 'ManyToOne' / 'gen_f_2_m_1').exists()
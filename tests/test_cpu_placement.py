@@ -0,0 +1,28 @@
+"""
+Tests of the placement of brokers and federates on cores
+"""
+
+import pytest
+
+import helicsTestSuite as suite
+
+
+def test_cpu_placement():
+    names = ['broker', 'fed0', 'fed1', 'fed2', 'fed3']
+    cpus = suite.cpu_placement(names, cpuSet=[0, 1, 2, 3, 4], coresPerFederate=1)
+    assert cpus == [[0], [1], [2], [3], [4]]
+
+    cpus = suite.cpu_placement(names, cpuSet=[0, 1, 2], coresPerFederate=0.5)
+    assert cpus == [[0], [1], [1], [2], [2]]
+
+    cpus = suite.cpu_placement(names, cpuSet=[0, 1, 2], brokerCores=0)
+    assert all(cpu == [0, 1, 2] for cpu in cpus)
+
+
+def test_cpu_placement_errors():
+    with pytest.raises(Exception, match='needs 4 cores'):
+        suite.cpu_placement(['broker', 'fed0', 'fed1', 'fed2', 'fed3'], cpuSet=[0, 1, 2], coresPerFederate=1)
+    with pytest.raises(Exception, match='leave none'):
+        suite.cpu_placement(['broker', 'fed0'], cpuSet=[0], brokerCores=1)
+    with pytest.raises(Exception, match='unknown cpu placement'):
+        suite.cpu_placement(['broker', 'fed0'], cpuSet=[0, 1], policy='scatter')
@@ -0,0 +1,59 @@
+"""
+Tests of the endpoint, delay filter, and clone filter configs of the HELICS federates
+"""
+
+import json
+
+import pytest
+
+import helicsTestSuite as suite
+
+
+def create(folder, experimentType, interface, coSimPlatform='HELICS'):
+    suite.create_experiment(folder, coSimPlatform, experimentType, 2, 1, 8, 1., 5., 'INFO', False, False, 'zmq', '1s', '30s', interface=interface)
+
+
+def load_config(configFile):
+    with open(configFile) as infile:
+        return json.load(infile)
+
+
+def test_helics_filter_entries():
+    assert suite.helics_filter_entries('send0/m0', 'endpoint', 1., []) == ''
+    assert json.loads(suite.helics_filter_entries('send0/m0', 'delay', 1., [])) == {'name': 'send0_m0_delay', 'sourcetargets': ['send0/m0'], 'operation': 'delay',
+                                                                                    'properties': {'name': 'delay', 'value': 0.5}}
+    clone = json.loads(suite.helics_filter_entries('fed0/m0', 'clone', 1., ['fed1/tap', 'fed2/tap']))
+    assert clone['delivery'] == ['fed1/tap', 'fed2/tap']
+    assert clone['cloning']
+
+
+@pytest.mark.parametrize('interface, messagesPerStep', [('endpoint', 4), ('delay', 4), ('clone', 6)])
+def test_many_to_one_endpoints(tmp_path, interface, messagesPerStep):
+    create(tmp_path, 'ManyToOne', interface)
+
+    echo = load_config(tmp_path / 'echo.json')
+    sender = load_config(tmp_path / 'send1.json')
+    assert echo['publications'] == echo['subscriptions'] == []
+    # the echo has an endpoint per sender message, the clones all go to its tap
+    assert [endpoint['name'] for endpoint in echo['endpoints']] == ['send0_m0', 'send1_m0'] + (['tap'] if interface == 'clone' else [])
+    assert sender['endpoints'] == [{'name': 'm0', 'global': False, 'info': 'echo/send1_m0'}]
+    filters = sender.get('filters', [])
+    assert [entry['operation'] for entry in filters] == ([] if interface == 'endpoint' else [interface])
+    if interface == 'clone':
+        assert filters[0]['delivery'] == ['echo/tap']
+    # a clone is one more message delivered for every message sent
+    assert load_config(tmp_path / 'launch.json')['workload']['messages per step'] == messagesPerStep
+
+
+def test_meshed_endpoints(tmp_path):
+    create(tmp_path, 'Meshed', 'clone')
+
+    fed0 = load_config(tmp_path / 'fed0.json')
+    assert fed0['endpoints'] == [{'name': 'm0', 'global': False, 'info': 'fed1/m0'}, {'name': 'tap', 'global': False, 'info': ''}]
+    assert fed0['filters'][0]['sourcetargets'] == ['fed0/m0']
+    assert fed0['filters'][0]['delivery'] == ['fed1/tap']
+
+
+def test_interfaces_need_helics(tmp_path):
+    with pytest.raises(Exception, match='only supported by HELICS'):
+        create(tmp_path, 'ManyToOne', 'endpoint', coSimPlatform='FNCS')
@@ -0,0 +1,63 @@
+"""
+Tests of the per step time request latency logged by every federate
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import helicsTestSuite as suite
+
+
+def write_steps(latencyFile, steps):
+    np.array(steps, dtype='<f4').tofile(latencyFile)
+
+
+def test_load_latency(tmp_path):
+    # pairs of work time and time request latency of every step
+    write_steps(tmp_path / 'send0.latency', [[0.1, 0.5], [0.1, 0.5]])
+    write_steps(tmp_path / 'send1.latency', [[0.4, 0.25], [0.4, 0.25], [0.4, 0.25]])
+    write_steps(tmp_path / 'echo.latency', [])
+
+    results = suite.load_latency(tmp_path)
+
+    assert results['grant latency p50 (s)'] == pytest.approx(0.25)
+    assert results['grant latency max (s)'] == pytest.approx(0.5)
+    assert results['straggler'] == 'send1'
+    assert results['straggler work time (s)'] == pytest.approx(1.2)
+    assert results['main loop time (s)'] == pytest.approx(1.95)
+
+    federates = pd.read_csv(tmp_path / 'latency.csv')
+    assert list(federates['name']) == ['echo', 'send0', 'send1']
+    assert list(federates['steps']) == [0, 2, 3]
+    assert np.isnan(federates['grant latency max (s)'][0])
+
+
+def test_load_latency_cut_short(tmp_path):
+    # a log truncated by the file size cap can end half way through a step
+    write_steps(tmp_path / 'send0.latency', [0.1, 0.5, 0.2])
+
+    results = suite.load_latency(tmp_path)
+
+    assert results['main loop time (s)'] == pytest.approx(0.6)
+    assert list(pd.read_csv(tmp_path / 'latency.csv')['steps']) == [1]
+
+
+def test_load_latency_without_logs(tmp_path):
+    results = suite.load_latency(tmp_path)
+
+    assert results['straggler'] is None
+    assert all(np.isnan(results[column]) for column in suite.LATENCY_COLUMNS)
+    assert not (tmp_path / 'latency.csv').exists()
+
+
+def test_noop_federates_log_latency(noop_platform, tmp_path):
+    suite.create_experiment(tmp_path, 'NOOP', 'ManyToOne', 2, 1, 8, 1, 5, 'WARNING', False, False, 'zmq', '1s', '30s', brokerPort=46000)
+
+    results = suite.run_experiment(tmp_path, 60, sampleInterval=None)
+
+    assert results['status'] == 0
+    federates = pd.read_csv(tmp_path / 'latency.csv')
+    assert list(federates['name']) == ['echo', 'send0', 'send1']
+    assert (federates['steps'] == 5).all()
+    assert results['straggler'] in ['echo', 'send0', 'send1']
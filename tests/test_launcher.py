@@ -0,0 +1,74 @@
+"""
+Tests of launching experiments from their launch manifest (launch.json) instead of the generated run.sh
+"""
+
+import json
+
+import pandas as pd
+import pytest
+
+import helicsTestSuite as suite
+
+
+def write_manifest(folder, commands, env={}):
+    processes = [{'name': name, 'command': command, 'env': {}, 'log': name + '.out'} for name, command in commands]
+    (folder / 'launch.json').write_text(json.dumps({'env': env, 'processes': processes}))
+
+
+def test_launch_experiment_success(tmp_path):
+    write_manifest(tmp_path, [('broker', ['true']), ('fed0', ['sh', '-c', 'echo $LOG_LEVEL $LOG_LATENCY']), ('fed1', ['true'])], env={'LOG_LEVEL': 'INFO'})
+
+    results = suite.launch_experiment(tmp_path, 30, sampleInterval=None, logLatency=False)
+
+    assert results['status'] == 0
+    assert results['failed process'] is None
+    assert results['spawn time (wall)'] > 0
+    assert (tmp_path / 'fed0.out').read_text() == 'INFO 0\n'
+    launches = pd.read_csv(tmp_path / 'launch.csv')
+    assert list(launches['name']) == ['broker', 'fed0', 'fed1']
+    assert list(launches['exit code']) == [0, 0, 0]
+    assert not launches['torn down'].any()
+
+
+def test_launch_experiment_signal(tmp_path):
+    write_manifest(tmp_path, [('broker', ['sleep', '60']), ('fed0', ['sh', '-c', 'kill -9 $$'])])
+
+    results = suite.launch_experiment(tmp_path, 30, terminateTimeout=0.5, sampleInterval=None)
+
+    assert results['status'] == 1
+    assert (results['failed process'], results['exit code'], results['signal']) == ('fed0', None, 9)
+
+
+def test_launch_experiment_timeout(tmp_path):
+    write_manifest(tmp_path, [('broker', ['sleep', '60']), ('fed0', ['true'])])
+
+    results = suite.launch_experiment(tmp_path, 0.5, terminateTimeout=0.5, sampleInterval=None)
+
+    assert results['status'] == 2
+    assert results['failed process'] is None
+    assert 0.5 <= results['launch time (wall)'] < 10
+
+
+def test_launch_experiment_batches(tmp_path):
+    write_manifest(tmp_path, [('broker', ['true'])] + [('fed' + str(idx), ['true']) for idx in range(0, 3)])
+
+    results = suite.launch_experiment(tmp_path, 30, startBatchSize=1, startBatchDelay=0.2, sampleInterval=None)
+
+    assert results['status'] == 0
+    starts = list(pd.read_csv(tmp_path / 'launch.csv')['start (s)'])
+    # the first batch follows the broker right away, the others wait for the delay
+    assert starts[1] - starts[0] < 0.2
+    assert starts[2] - starts[1] >= 0.2
+    assert starts[3] - starts[2] >= 0.2
+    # the delay between the batches does not count as spawn time
+    assert results['spawn time (wall)'] < 0.4
+
+
+@pytest.mark.parametrize('launcher', ['python', 'bash'])
+def test_noop_experiment(noop_platform, tmp_path, launcher):
+    suite.create_experiment(tmp_path, 'NOOP', 'ManyToOne', 3, 1, 8, 1, 5, 'WARNING', False, False, 'zmq', '1s', '30s', brokerPort=45000)
+
+    results = suite.run_experiment(tmp_path, 60, launcher=launcher, sampleInterval=None)
+
+    assert results['status'] == 0
+    assert results['failed process'] is None
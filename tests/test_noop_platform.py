@@ -0,0 +1,21 @@
+"""
+Tests of the NOOP stand-in platform, they are skipped when noop_broker and testFedNoop are not on the PATH
+"""
+
+import pandas as pd
+import pytest
+
+import helicsTestSuite as suite
+
+
+@pytest.mark.parametrize('experimentType', ['ManyToOne', 'Meshed'])
+def test_noop_broker_hierarchy(noop_platform, tmp_path, experimentType):
+    results = suite.run_search(tmp_path, [4], [1], [8], 1, 5, 'warning', False, False, ['zmq'], '1s', '30s', 60, 'NOOP', experimentType,
+                               sampleInterval=None, brokerFanOut=[2, 2], basePort=42000)
+
+    assert list(results['status']) == ['success']
+    processes = pd.read_csv(next(tmp_path.rglob('launch.csv')))
+    # every stand-in broker of the tree is started and only exits once everything below it has reported
+    brokers = processes[processes['name'].str.startswith('broker')]
+    assert len(brokers) == 7
+    assert (processes['exit code'] == 0).all()
@@ -0,0 +1,24 @@
+"""
+Tests of packing several federates into one process
+"""
+
+import pytest
+
+import helicsTestSuite as suite
+
+
+def test_pack_federates():
+    names = ['fed' + str(idx) for idx in range(0, 10)]
+    assert suite.pack_federates(names, 3) == [names[0:4], names[4:7], names[7:10]]
+    # more processes than federates gives every federate a process of its own
+    assert suite.pack_federates(names[:2], 5) == [['fed0'], ['fed1']]
+
+
+def test_pack_federates_keeps_leaf_brokers_apart():
+    names = ['fed' + str(idx) for idx in range(0, 6)]
+    federatePorts = {name: 40001 if idx < 4 else 40002 for idx, name in enumerate(names)}
+    packs = suite.pack_federates(names, 3, federatePorts)
+
+    assert packs == [names[0:2], names[2:4], names[4:6]]
+    with pytest.raises(Exception, match='can not be packed'):
+        suite.pack_federates(names, 1, federatePorts)
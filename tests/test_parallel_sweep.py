@@ -0,0 +1,38 @@
+"""
+Tests of running the experiments of a sweep in parallel, each worker slot with its own cores and broker ports
+"""
+
+import os
+
+import pandas as pd
+import pytest
+
+import helicsTestSuite as suite
+
+
+def sweep(outFolder, federateNumber, **settings):
+    return suite.run_search(outFolder, federateNumber, [1], [8], 1, 5, 'WARNING', False, False, ['zmq'], '1s', '30s', 60, 'NOOP', 'ManyToOne', sampleInterval=None, **settings)
+
+
+def test_parallel_sweep_budgets(tmp_path):
+    cores = len(os.sched_getaffinity(0))
+    with pytest.raises(Exception, match='core budget'):
+        sweep(tmp_path, [2], workers=2, coresPerExperiment=cores)
+    with pytest.raises(Exception, match='not enough ports'):
+        sweep(tmp_path, [2], coresPerExperiment=1, basePort=65000)
+    with pytest.raises(Exception, match='at least one worker'):
+        sweep(tmp_path, [2], workers=0)
+
+
+@pytest.mark.skipif(len(os.sched_getaffinity(0)) < 2, reason='a parallel sweep needs at least two cores')
+def test_noop_parallel_sweep(noop_platform, tmp_path):
+    results = sweep(tmp_path, [2, 3, 4, 5], workers=2, basePort=48000)
+
+    # the results are in sweep order no matter which experiment finished first
+    assert list(results['federates']) == [2, 3, 4, 5]
+    assert list(results['status']) == ['success'] * 4
+    # each worker slot pins its experiments to its own cores
+    cpus = set()
+    for launchFile in tmp_path.rglob('launch.csv'):
+        cpus.add(pd.read_csv(launchFile)['cpus'][0])
+    assert len(cpus) == 2
@@ -0,0 +1,95 @@
+"""
+Tests of profiling the brokers and a sample of the federates with perf. perf itself is not needed, the counters and
+stacks it writes are made up and perf script is stood in for by a script that prints a recorded stack dump
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import helicsTestSuite as suite
+
+PERF_STAT = '''# started on Sun Oct 18 10:00:00 2026
+
+2000,,cycles:u,1000,100.00,,
+3000,,instructions:u,1000,100.00,1.50,insn per cycle
+12,,context-switches:u,1000,100.00,0.012,K/sec
+<not counted>,,cache-misses:u,0,0.00,,
+'''
+
+PERF_SCRIPT = '''testFedNoop 1234 [000] 100.000001: 10101 cycles:u:
+\t    55d0c1a2b3c4 run_federate+0x14 (/usr/bin/testFedNoop)
+\t    55d0c1a2b000 main+0x2a (/usr/bin/testFedNoop)
+\t    7f0000001000 __libc_start_main+0xf3 (/lib/libc.so.6)
+
+testFedNoop 1234 [000] 100.010001: 10101 cycles:u:
+\t    55d0c1a2b3c4 run_federate+0x20 (/usr/bin/testFedNoop)
+\t    55d0c1a2b000 main+0x2a (/usr/bin/testFedNoop)
+\t    7f0000001000 __libc_start_main+0xf3 (/lib/libc.so.6)
+
+testFedNoop 1234 [000] 100.020001: 10101 cycles:u:
+\t    7f0000002000 [unknown] ([kernel.kallsyms])
+
+'''
+
+
+def test_profiled_processes():
+    names = ['broker', 'broker_1_0'] + ['fed' + str(idx) for idx in range(0, 10)]
+
+    assert suite.profiled_processes(names, 2) == {'broker', 'broker_1_0', 'fed0', 'fed5'}
+    assert suite.profiled_processes(names, 0) == {'broker', 'broker_1_0'}
+    assert len(suite.profiled_processes(names, 100)) == len(names)
+
+
+def test_profile_command():
+    assert suite.profile_command(['testFedNoop', 'fed0.json'], 'fed0') == ['perf', 'stat', '-x', ',', '-e', 'cycles,instructions,context-switches,cache-misses', '-o', 'fed0.perfstat', '--', 'testFedNoop', 'fed0.json']
+    wrapped = suite.profile_command(['testFedNoop'], 'fed0', profileRecord=True, profileFrequency=49)
+    # perf record samples perf stat and the process it runs
+    assert wrapped[:9] == ['perf', 'record', '-q', '-g', '-F', '49', '-o', 'fed0.perf.data', '--']
+    assert wrapped[9:11] == ['perf', 'stat']
+
+
+def test_read_perf_stat(tmp_path):
+    (tmp_path / 'fed0.perfstat').write_text(PERF_STAT)
+    counters = suite.read_perf_stat(tmp_path / 'fed0.perfstat')
+
+    assert counters['cycles'] == 2000.
+    assert counters['instructions'] == 3000.
+    assert counters['context-switches'] == 12.
+    assert np.isnan(counters['cache-misses'])
+    assert suite.read_perf_stat(tmp_path / 'missing.perfstat') == {}
+
+
+def test_collect_profile(tmp_path):
+    (tmp_path / 'broker.perfstat').write_text(PERF_STAT)
+    (tmp_path / 'broker_1_0.perfstat').write_text(PERF_STAT)
+    (tmp_path / 'fed0.perfstat').write_text(PERF_STAT)
+    (tmp_path / 'fed5.perfstat').write_text(PERF_STAT.replace('2000,', '6000,'))
+
+    results = suite.collect_profile(tmp_path)
+
+    # the brokers are added up, the federates are averaged
+    assert results['profiled federates'] == 2
+    assert results['broker cycles'] == 4000.
+    assert results['broker instructions per cycle'] == pytest.approx(1.5)
+    assert results['federate cycles'] == 4000.
+    assert results['federate instructions per cycle'] == pytest.approx(0.75)
+    assert np.isnan(results['broker cache misses'])
+    assert list(pd.read_csv(tmp_path / 'profile.csv')['name']) == ['broker', 'broker_1_0', 'fed0', 'fed5']
+
+
+def test_collapse_stacks(tmp_path, monkeypatch):
+    # perf script is stood in for by a script that prints the stack dump
+    (tmp_path / 'bin').mkdir()
+    (tmp_path / 'stacks.txt').write_text(PERF_SCRIPT)
+    (tmp_path / 'bin' / 'perf').write_text('#!/bin/sh\ncat ' + str(tmp_path / 'stacks.txt') + '\n')
+    os.chmod(tmp_path / 'bin' / 'perf', 0o755)
+    monkeypatch.setenv('PATH', str(tmp_path / 'bin') + os.pathsep + os.environ['PATH'])
+    (tmp_path / 'fed0.perf.data').write_bytes(b'')
+
+    assert suite.collapse_stacks(tmp_path / 'fed0.perf.data') == 3
+
+    assert (tmp_path / 'fed0.folded').read_text() == 'testFedNoop;[unknown] 1\ntestFedNoop;__libc_start_main;main;run_federate 2\n'
+    assert not (tmp_path / 'fed0.perf.data').exists()
@@ -0,0 +1,33 @@
+"""
+Tests of the comparison of a baseline and a candidate sweep
+"""
+
+import numpy as np
+import pytest
+
+import helicsTestSuite as suite
+
+
+def test_permutation_test():
+    baseline = np.array([1., 1.1, 0.9, 1.05])
+    assert suite.permutation_test(baseline, baseline + 1.) == pytest.approx(1. / 70.)
+    assert suite.permutation_test(baseline, baseline - 1.) == 1.
+    # with more splits than samples a random sample of them is used
+    rng = np.random.default_rng(1)
+    assert suite.permutation_test(rng.normal(1., 0.1, 20), rng.normal(2., 0.1, 20), samples=1000) < 0.01
+
+
+def test_compare_results_trials_table(tmp_path):
+    parameters = {'experiment type': 'ManyToOne', 'co-simulation platform': 'NOOP', 'core type': 'zmq', 'federates': 2, 'messages': 1, 'bytes': 8}
+    hashKey = suite.experiment_hash(parameters)
+    for trial, value in enumerate([1., 1.1, 0.9]):
+        suite.append_result(tmp_path / 'results.jsonl', {'hash': hashKey, 'trial': trial, 'parameters': parameters,
+                                                         'results': dict({column: value for column in suite.TIME_COLUMNS}, **{'experiment hash': hashKey, 'status': 'success'})})
+    suite.load_trials(tmp_path).to_csv(tmp_path / 'trials.csv', index=False)
+
+    trials = suite.load_trials(tmp_path / 'trials.csv')
+    assert list(trials['execution time (wall)']) == [1., 1.1, 0.9]
+    report, unmatched = suite.compare_results(tmp_path / 'trials.csv', tmp_path, metrics=['execution time (wall)'])
+    assert unmatched == {'baseline only': 0, 'candidate only': 0}
+    assert list(report['change']) == [0.]
+    assert not report['regression'].any()
@@ -0,0 +1,48 @@
+"""
+Tests of the headless sweep report, they are skipped when matplotlib is not installed
+"""
+
+import pandas as pd
+import pytest
+
+import helicsTestSuite as suite
+
+pytest.importorskip('matplotlib')
+
+
+def sweep_results():
+    rows = []
+    for coreType in ['zmq', 'tcp']:
+        for federates in [10, 100, 1000]:
+            for messages in [1, 10]:
+                value = federates * messages * (2. if coreType == 'tcp' else 1.) / 100.
+                rows.append({'experiment hash': coreType + str(federates) + '_' + str(messages), 'co-simulation platform': 'HELICS', 'core type': coreType,
+                             'status': 'success', 'federates': federates, 'messages': messages, 'bytes': 8, 'trials': 3, 'successful trials': 3,
+                             'execution time (wall)': value, 'execution time (wall) ci low': 0.9 * value, 'execution time (wall) ci high': 1.1 * value})
+    rows[-1]['status'] = 'timeout'
+    return pd.DataFrame(rows)
+
+
+def test_result_series():
+    results = sweep_results()
+    assert list(suite.result_series(results).unique()) == ['zmq', 'tcp']
+    results.loc[0, 'co-simulation platform'] = 'FNCS'
+    assert suite.result_series(results)[0] == 'FNCS zmq'
+
+
+def test_write_report(tmp_path):
+    results = sweep_results()
+    results.to_csv(tmp_path / 'data.csv', index_label='experiment')
+
+    summary = suite.write_report(tmp_path, tmp_path / 'report', metrics=['execution time (wall)'])
+
+    report = tmp_path / 'report'
+    assert sorted(path.name for path in report.iterdir()) == ['heatmap_execution_time_wall.png', 'index.html', 'scaling_execution_time_wall.png', 'summary.csv']
+    index = (report / 'index.html').read_text()
+    assert '12 experiments, 1 failed, series: tcp, zmq' in index
+    assert '<img src="scaling_execution_time_wall.png"' in index
+    # the failed experiment is not reported with the time it was cut off at
+    assert len(summary) == 12
+    assert summary['execution time (wall)'].isna().sum() == 1
+    assert list(summary['series'][:3]) == ['tcp'] * 3
+    assert len(pd.read_csv(report / 'summary.csv')) == 12
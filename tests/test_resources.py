@@ -0,0 +1,88 @@
+"""
+Tests of sampling the cpu, memory, and context switches of the processes of an experiment from /proc
+"""
+
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import helicsTestSuite as suite
+
+
+def test_read_process_sample():
+    sample = suite.read_process_sample(os.getpid())
+
+    assert sample['cpu time (s)'] > 0
+    assert 0 < sample['rss (MB)'] <= sample['peak rss (MB)']
+    assert sample['threads'] >= 1
+    assert sample['fds'] >= 3
+    assert sample['voluntary context switches'] + sample['involuntary context switches'] > 0
+
+    # a process that is gone has nothing to read
+    process = subprocess.Popen(['true'])
+    process.wait()
+    assert suite.read_process_sample(process.pid) is None
+
+
+def test_sample_processes():
+    busy = subprocess.Popen([sys.executable, '-c', 'import time\nend = time.monotonic() + 1.\nwhile time.monotonic() < end: pass'])
+    samples = []
+    stop = threading.Event()
+    startTime = time.monotonic()
+    sampler = threading.Thread(target=suite.sample_processes, args=(lambda: {busy.pid: 'fed0'}, 0.1, stop, startTime, samples))
+    sampler.start()
+    busy.wait()
+    stop.set()
+    sampler.join()
+
+    assert len(samples) >= 3
+    assert all(sample['name'] == 'fed0' and sample['pid'] == busy.pid for sample in samples)
+    times = [sample['time (s)'] for sample in samples]
+    assert times == sorted(times)
+    # the first sample has nothing to compare the cpu time to
+    assert np.isnan(samples[0]['cpu (%)'])
+    assert max(sample['cpu (%)'] for sample in samples[1:]) > 10.
+
+
+def test_summarize_resources():
+    def stats(name, cpuTime, peakRss):
+        return {'name': name, 'cpu time (s)': cpuTime, 'peak rss (MB)': peakRss, 'voluntary context switches': 10, 'involuntary context switches': 1}
+
+    finalStats = {1: stats('broker', 1., 20.), 2: stats('broker_1_0', 0.5, 30.), 3: stats('fed0', 2., 5.), 4: stats('fed1', 3., np.nan)}
+    samples = [{'name': 'broker', 'cpu (%)': np.nan, 'threads': 4, 'fds': 10}, {'name': 'broker_1_0', 'cpu (%)': 80., 'threads': 6, 'fds': 12},
+               {'name': 'fed0', 'cpu (%)': 100., 'threads': 2, 'fds': 20}]
+    summary = suite.summarize_resources(finalStats, samples)
+
+    # every broker of a hierarchy counts as the broker
+    assert summary['broker cpu time (s)'] == 1.5
+    assert summary['broker peak rss (MB)'] == 30.
+    assert summary['broker cpu max (%)'] == 80.
+    assert summary['broker threads max'] == 6
+    assert summary['federate cpu time (s)'] == 5.
+    # a federate that was never sampled has no peak memory
+    assert summary['federate peak rss max (MB)'] == 5.
+    assert summary['federate peak rss total (MB)'] == 5.
+    assert summary['voluntary context switches'] == 40
+    assert summary['open fds max'] == 20
+
+    assert all(np.isnan(value) for value in suite.summarize_resources({}, []).values())
+
+
+def test_launch_experiment_samples(tmp_path):
+    processes = [{'name': 'broker', 'command': ['sleep', '0.5'], 'env': {}, 'log': None}, {'name': 'fed0', 'command': ['sleep', '0.5'], 'env': {}, 'log': None}]
+    (tmp_path / 'launch.json').write_text(json.dumps({'env': {}, 'processes': processes}))
+
+    results = suite.launch_experiment(tmp_path, 30, sampleInterval=0.1)
+
+    assert results['status'] == 0
+    resources = pd.read_csv(tmp_path / 'resources.csv')
+    assert set(resources['name']) == {'broker', 'fed0'}
+    assert results['broker peak rss (MB)'] == pytest.approx(resources[resources['name'] == 'broker']['peak rss (MB)'].max())
+    assert results['broker threads max'] == 1
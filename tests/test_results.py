@@ -0,0 +1,56 @@
+"""
+Tests of the results persisted for a sweep, plus a NOOP sweep that is run twice to check that the second run resumes from
+the results of the first one
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+import helicsTestSuite as suite
+
+
+def test_experiment_hash():
+    parameters = {'federates': 10, 'messages': 1, 'core type': 'zmq'}
+
+    assert suite.experiment_hash(parameters) == suite.experiment_hash(dict(reversed(list(parameters.items()))))
+    assert suite.experiment_hash(parameters) != suite.experiment_hash(dict(parameters, federates=11))
+    assert len(suite.experiment_hash(parameters)) == 16
+
+
+def test_load_results_restarts_series(tmp_path):
+    resultsFile = tmp_path / 'results.jsonl'
+    for trial, value in [(0, 1.), (1, 2.), (0, 3.)]:
+        suite.append_result(resultsFile, {'hash': 'abc', 'trial': trial, 'parameters': {}, 'results': {'value': np.float64(value)}})
+    # a partial line left by a crash is skipped and the next record still goes on a line of its own
+    with open(resultsFile, 'a') as outfile:
+        outfile.write('{"hash": "abc", "tri')
+    suite.append_result(resultsFile, {'hash': 'abc', 'trial': 1, 'parameters': {}, 'results': {'value': 4.}})
+
+    records = suite.load_results(resultsFile)
+    assert [record['results']['value'] for record in records['abc']] == [3., 4.]
+
+
+def test_noop_sweep_resumes(noop_platform, tmp_path, capsys):
+    def sweep():
+        return suite.run_search(tmp_path, [2, 3], [1], [8], 1, 5, 'warning', False, False, ['zmq'], '1s', '30s', 60, 'NOOP', 'ManyToOne', sampleInterval=None)
+
+    first = sweep()
+    assert list(first['status']) == ['success', 'success']
+    resultsFile = tmp_path / 'results.jsonl'
+    with open(resultsFile) as infile:
+        lines = infile.readlines()
+    assert len(lines) == 2
+    capsys.readouterr()
+
+    second = sweep()
+    output = capsys.readouterr().out
+    assert output.count('skipping') == 2
+    with open(resultsFile) as infile:
+        assert infile.readlines() == lines
+    assert list(second['experiment hash']) == list(first['experiment hash'])
+    assert list(second['execution time (wall)']) == list(first['execution time (wall)'])
+    assert (tmp_path / 'trials.csv').is_file()
+    assert len(pd.read_csv(tmp_path / 'trials.csv')) == 2
+    assert set(json.loads(line)['hash'] for line in lines) == set(first['experiment hash'])
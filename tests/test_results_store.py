@@ -0,0 +1,60 @@
+"""
+Tests of the columnar results store, they are skipped when pyarrow is not installed
+"""
+
+import pandas as pd
+import pytest
+
+import helicsTestSuite as suite
+
+pytest.importorskip('pyarrow')
+
+
+def trial(recorded, version, federates, value, status='success', outlier=False):
+    return {'recorded': recorded, 'experiment hash': 'h' + str(federates), 'trial': 0, 'outlier': outlier, 'status': status, 'helics version': version,
+            'experiment type': 'ManyToOne', 'co-simulation platform': 'HELICS', 'core type': 'zmq', 'federates': federates, 'messages': 1, 'bytes': 8,
+            'execution time (wall)': value}
+
+
+def test_store_and_query_results(tmp_path):
+    store = tmp_path / 'store'
+    suite.store_results(store, [trial('2026-01-15T10:00:00+00:00', '3.0', 10, 1.), trial('2026-02-15T10:00:00+00:00', '3.0', 20, 2.)])
+    suite.store_results(store, [trial('2026-03-15T10:00:00+00:00', '3.1', 10, 3.)])
+    suite.store_results(store, [])
+
+    # one folder per month, every call adds its own file
+    assert sorted(folder.name for folder in store.iterdir()) == ['month=2026-01', 'month=2026-02', 'month=2026-03']
+
+    data = suite.query_results(store)
+    assert len(data) == 3
+    assert list(data.columns) == suite.STORE_COLUMNS
+    assert data['federates'].dtype == 'Int64'
+    assert str(data['recorded'].dtype).startswith('datetime64')
+
+    data = suite.query_results(store, {'federates': 10})
+    assert sorted(data['execution time (wall)']) == [1., 3.]
+    data = suite.query_results(store, {'federates': [10, 20]}, since='2026-02-01', until='2026-03-15', columns=['federates', 'execution time (wall)'])
+    assert list(data.columns) == ['federates', 'execution time (wall)']
+    assert list(data['execution time (wall)']) == [2.]
+    data = suite.query_results(store, since=pd.Timestamp('2026-03-15T10:00:00', tz='UTC'))
+    assert list(data['helics version']) == ['3.1']
+
+
+def test_query_empty_store(tmp_path):
+    assert list(suite.query_results(tmp_path / 'missing').columns) == suite.STORE_COLUMNS
+    assert list(suite.query_results(tmp_path, columns=['federates']).columns) == ['federates']
+
+
+def test_compare_versions(tmp_path):
+    recorded = '2026-05-01T10:00:00+00:00'
+    suite.store_results(tmp_path, [trial(recorded, '3.0', 10, 1.), trial(recorded, '3.0', 10, 1.2), trial(recorded, '3.0', 20, 4.),
+                                   trial(recorded, '3.1', 10, 2.2), trial(recorded, '3.1', 10, 50., outlier=True), trial(recorded, '3.1', 10, 0.1, status='failure'),
+                                   trial(recorded, '3.2', 20, 1.)])
+
+    comparison = suite.compare_versions(tmp_path, '3.0', '3.1')
+
+    # only the configurations run with both releases are compared, on their successful trials that are not outliers
+    assert list(comparison['federates']) == [10]
+    assert comparison['execution time (wall) baseline'][0] == pytest.approx(1.1)
+    assert comparison['execution time (wall) candidate'][0] == pytest.approx(2.2)
+    assert comparison['execution time (wall) ratio'][0] == pytest.approx(2.)
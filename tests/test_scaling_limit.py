@@ -0,0 +1,27 @@
+"""
+Tests of the scaling limit search
+"""
+
+import pytest
+
+import helicsTestSuite as suite
+
+
+@pytest.mark.parametrize('settings, message', [({'startFederates': 20, 'maxFederates': 10}, 'invalid federate range'), ({'startFederates': 0}, 'invalid federate range'),
+                                               ({'growthFactor': 1}, 'growth factor'), ({'growthFactor': 0.5}, 'growth factor'),
+                                               ({'resolution': 0}, 'resolution'), ({'resolution': -0.1}, 'resolution')])
+def test_find_scaling_limit_settings(tmp_path, settings, message):
+    with pytest.raises(Exception, match=message):
+        suite.find_scaling_limit(tmp_path, 1, 8, 1., 5., 'WARNING', False, False, ['zmq'], '1s', '30s', 60, 'NOOP', 'ManyToOne', **settings)
+    # nothing is run for invalid settings
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_noop_scaling_limit(noop_platform, tmp_path):
+    limits, probes = suite.find_scaling_limit(tmp_path, 1, 8, 1., 5., 'WARNING', False, False, ['zmq'], '1s', '30s', 60, 'NOOP', 'ManyToOne',
+                                              startFederates=2, maxFederates=5, growthFactor=2)
+
+    # 2 and 4 pass, then the count is capped at the maximum
+    assert list(probes['federates']) == [2, 4, 5]
+    assert limits['largest passing federates'][0] == 5
+    assert limits['smallest failing federates'].isna().all()
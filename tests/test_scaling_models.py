@@ -0,0 +1,38 @@
+"""
+Tests of the scaling models fitted to the sweep results
+"""
+
+import numpy as np
+import pytest
+
+import helicsTestSuite as suite
+
+
+@pytest.mark.parametrize('model, parameters', [('linear', {'intercept': 2., 'slope': 0.5}), ('power', {'a': 0.1, 'exponent': 1.5}),
+                                               ('amdahl', {'serial': 2., 'parallel': 6.}), ('usl', {'lambda': 0.5, 'sigma': 0.1, 'kappa': 0.01})])
+def test_fit_scaling_model(model, parameters):
+    federates = np.array([1, 2, 4, 8, 16, 32, 64], dtype=float)
+    if model == 'linear':
+        values = parameters['intercept'] + parameters['slope'] * federates
+    elif model == 'power':
+        values = parameters['a'] * federates ** parameters['exponent']
+    elif model == 'amdahl':
+        values = parameters['serial'] + parameters['parallel'] / federates
+    else:
+        values = (1 + parameters['sigma'] * (federates - 1) + parameters['kappa'] * federates * (federates - 1)) / parameters['lambda']
+    fitted, predict = suite.fit_scaling_model(federates, values, model)
+
+    assert fitted == pytest.approx(parameters, rel=1e-6)
+    assert predict(federates) == pytest.approx(values, rel=1e-6)
+
+
+def test_fit_scaling_model_keeps_terms_positive():
+    # times that grow with the federates would need a negative parallel time, the serial time is then their mean
+    fitted, predict = suite.fit_scaling_model([1, 2, 4, 8], [4.5, 5., 6., 8.], 'amdahl')
+    assert fitted == pytest.approx({'serial': 5.875, 'parallel': 0.})
+    assert predict([1000]) == pytest.approx([5.875])
+    # and times that fall with them would need negative contention and coherency terms
+    fitted, _ = suite.fit_scaling_model([1, 2, 4, 8], [8., 6., 5., 4.5], 'usl')
+    assert (fitted['sigma'], fitted['kappa']) == (0., 0.)
+    with pytest.raises(Exception, match='unknown scaling model'):
+        suite.fit_scaling_model([1, 2], [1., 2.], 'cubic')
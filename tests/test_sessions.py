@@ -0,0 +1,75 @@
+"""
+Tests of running every experiment in its own session and tearing down only the processes of that session
+"""
+
+import json
+import os
+import subprocess
+import time
+
+import pandas as pd
+
+import helicsTestSuite as suite
+
+
+def wait_for_commands(sessionId, commands, timeout=10.):
+    # the forked children run the shell until they exec their command
+    deadline = time.monotonic() + timeout
+    while True:
+        processes = dict()
+        suite.track_session_processes(sessionId, processes, time.monotonic())
+        if sorted(entry[0] for entry in processes.values()) == commands:
+            return processes
+        assert time.monotonic() < deadline
+        time.sleep(0.05)
+
+
+def test_terminate_session():
+    outsider = subprocess.Popen(['sleep', '60'])
+    # neither the shell nor its children stop on SIGTERM, so they have to be killed
+    session = subprocess.Popen(['sh', '-c', 'trap "" TERM; sleep 60 & sleep 60 & wait'], start_new_session=True)
+    try:
+        processes = wait_for_commands(session.pid, ['sh -c trap "" TERM; sleep 60 & sleep 60 & wait', 'sleep 60', 'sleep 60'])
+        assert outsider.pid not in processes
+
+        assert suite.terminate_session(session.pid, 0.5) == 3
+        session.wait(timeout=5)
+        # SIGKILL is not waited for, the processes are gone shortly after
+        wait_for_commands(session.pid, [])
+        assert outsider.poll() is None
+    finally:
+        outsider.kill()
+        session.kill()
+        outsider.wait()
+        session.wait()
+
+
+def test_launch_experiment_tears_down_sessions(tmp_path):
+    # the broker leaves a child behind in its session, the federate fails right away
+    manifest = {'env': {}, 'processes': [{'name': 'broker', 'command': ['sh', '-c', 'sleep 60 & exec sleep 60'], 'env': {}, 'log': None},
+                                         {'name': 'fed0', 'command': ['sh', '-c', 'sleep 0.2; exit 3'], 'env': {}, 'log': 'fed0.out'}]}
+    (tmp_path / 'launch.json').write_text(json.dumps(manifest))
+
+    results = suite.launch_experiment(tmp_path, 30, terminateTimeout=0.5, sampleInterval=None)
+
+    assert results['status'] == 1
+    assert (results['failed process'], results['exit code'], results['signal']) == ('fed0', 3, None)
+    launches = pd.read_csv(tmp_path / 'launch.csv')
+    assert list(launches['torn down']) == [True, False]
+    # the child the broker left behind goes with its session
+    for pid in launches['pid']:
+        wait_for_commands(int(pid), [])
+
+
+def test_run_launch_script_times_out(tmp_path):
+    (tmp_path / 'run.sh').write_text('#!/bin/bash\nsleep 60 &\nsleep 60 &\nwait\n')
+    os.chmod(tmp_path / 'run.sh', 0o755)
+
+    results = suite.run_launch_script(tmp_path, 1., pollInterval=0.1, terminateTimeout=0.5, sampleInterval=None)
+
+    assert results['status'] == 2
+    processes = pd.read_csv(tmp_path / 'processes.csv')
+    assert sorted(processes['command']) == ['/bin/bash ./run.sh', 'sleep 60', 'sleep 60']
+    # the launch script leads the session
+    sessionId = int(processes[processes['command'].str.contains('run.sh')]['pid'].iloc[0])
+    wait_for_commands(sessionId, [])
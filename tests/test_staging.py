@@ -0,0 +1,60 @@
+"""
+Tests of capping the logs of an experiment, running it in a staging folder, and compressing its logs afterwards
+"""
+
+import json
+import subprocess
+
+import pandas as pd
+
+import helicsTestSuite as suite
+
+
+def test_capped_command(tmp_path):
+    # the write past the cap fails instead of killing the process, so the shell goes on to report it
+    process = subprocess.Popen(suite.capped_command(['sh', '-c', 'head -c 10000 /dev/zero > big.bin; echo $?']), cwd=tmp_path, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    suite.cap_file_size(process, 1000)
+    output = process.stdout.read()
+    process.wait(timeout=10)
+
+    assert process.returncode == 0
+    assert output.strip() != b'0'
+    assert (tmp_path / 'big.bin').stat().st_size == 1000
+
+
+def test_launch_experiment_caps_logs(tmp_path):
+    processes = [{'name': 'broker', 'command': ['true'], 'env': {}, 'log': 'broker.out'},
+                 {'name': 'fed0', 'command': ['head', '-c', '5000', '/dev/zero'], 'env': {}, 'log': 'fed0.out'},
+                 {'name': 'fed1', 'command': ['true'], 'env': {}, 'log': None}]
+    (tmp_path / 'launch.json').write_text(json.dumps({'env': {}, 'processes': processes}))
+
+    results = suite.launch_experiment(tmp_path, 30, sampleInterval=None, logCap=100)
+    # head fails on the capped log, which fails the experiment
+    assert (results['status'], results['failed process']) == (1, 'fed0')
+
+    results = suite.collect_results(tmp_path, results['status'], logCap=100)
+    assert results['log bytes total'] == 100
+    assert results['log bytes per process'] == 100 / 3.
+    assert results['log bytes max'] == 100
+    assert results['truncated logs'] == 1
+    logs = pd.read_csv(tmp_path / 'logs.csv')
+    assert list(logs['name']) == ['broker', 'fed0']
+    assert list(logs['truncated']) == [False, True]
+
+
+def test_noop_experiment_staged(noop_platform, tmp_path):
+    experimentFolder = tmp_path / 'experiment'
+    stagingFolder = tmp_path / 'staging'
+    suite.create_experiment(experimentFolder, 'NOOP', 'ManyToOne', 2, 1, 8, 1, 5, 'WARNING', True, False, 'zmq', '1s', '30s', brokerPort=47000)
+
+    results = suite.run_experiment(experimentFolder, 60, sampleInterval=None, stagingFolder=stagingFolder, compressLogs=True, logCap=1 << 20)
+
+    assert results['status'] == 0
+    assert results['truncated logs'] == 0
+    # everything the run wrote is moved back and the staged copy is removed
+    assert list(stagingFolder.iterdir()) == []
+    assert (experimentFolder / 'timeDataLogging.csv').is_file()
+    assert (experimentFolder / 'launch.csv').is_file()
+    # the logs are only compressed after they were measured
+    assert sorted(path.name for path in experimentFolder.glob('*.out*')) == ['broker.out.gz', 'echo.out.gz', 'send0.out.gz', 'send1.out.gz']
+    assert results['log bytes total'] > 0
@@ -0,0 +1,55 @@
+"""
+Tests of the sweep specs
+"""
+
+import subprocess
+import sys
+
+import pandas as pd
+import pytest
+
+import helicsTestSuite as suite
+
+
+def test_sweep_points():
+    spec = {'federateNumber': [2, 4], 'messageNumber': 1, 'bytesNumber': [8, 16], 'coreType': ['zmq', 'tcp'],
+            'exclude': [{'federateNumber': 4, 'coreType': 'tcp'}]}
+    points = suite.sweep_points(spec)
+
+    assert points == [(2, 1, 8, 'zmq'), (2, 1, 8, 'tcp'), (2, 1, 16, 'zmq'), (2, 1, 16, 'tcp'), (4, 1, 8, 'zmq'), (4, 1, 16, 'zmq')]
+
+    # every comparison of a rule has to hold, any rule drops a point
+    spec['exclude'] = [{'federateNumber': {'>': 2, '<=': 4}, 'bytesNumber': 16}, {'coreType': {'in': ['tcp']}, 'bytesNumber': {'!=': 16}}]
+    assert suite.sweep_points(spec) == [(2, 1, 8, 'zmq'), (2, 1, 16, 'zmq'), (2, 1, 16, 'tcp'), (4, 1, 8, 'zmq')]
+
+
+@pytest.mark.parametrize('rule, message', [('federateNumber > 2', 'mapping of sweep axes'), ({'federates': 2}, 'unknown sweep axis'),
+                                           ({'federateNumber': {'=~': 2}}, 'unknown operator'), ({'federateNumber': {'>': 'many'}}, 'not able to compare')])
+def test_sweep_points_bad_exclude(rule, message):
+    spec = {'federateNumber': [2, 4], 'messageNumber': 1, 'bytesNumber': 8, 'coreType': 'zmq', 'exclude': [rule]}
+    with pytest.raises(Exception, match=message):
+        suite.sweep_points(spec)
+
+
+def test_sweep_points_zip():
+    spec = {'zip': [{'federateNumber': [2, 4], 'messageNumber': [10, 5]}], 'bytesNumber': 8, 'coreType': 'zmq'}
+    assert suite.sweep_points(spec) == [(2, 10, 8, 'zmq'), (4, 5, 8, 'zmq')]
+
+    spec['zip'][0]['messageNumber'] = [10]
+    with pytest.raises(Exception, match='same number of values'):
+        suite.sweep_points(spec)
+
+
+def test_limit_command(noop_platform, tmp_path):
+    (tmp_path / 'spec.yaml').write_text('outFolder: limit\ncoSimPlatform: NOOP\nmessageNumber: 1\nbytesNumber: 8\ncoreType: zmq\nsimTime: 5\n'
+                                        'updateInterval: 1\nlogLevel: WARNING\nresultsStore: null\n')
+    subprocess.run([sys.executable, suite.__file__, 'limit', 'spec.yaml', '--start', '2', '--max', '4'], cwd=tmp_path, check=True, stdout=subprocess.DEVNULL)
+
+    limits = pd.read_csv(tmp_path / 'limit' / 'scaling_limit_m_1_b_8.csv')
+    assert list(limits['largest passing federates']) == [4]
+
+    # the search only grows the federate count, so a spec with several message counts is refused
+    (tmp_path / 'spec.yaml').write_text('messageNumber: [1, 10]\nbytesNumber: 8\n')
+    failed = subprocess.run([sys.executable, suite.__file__, 'limit', 'spec.yaml'], cwd=tmp_path, stderr=subprocess.PIPE, universal_newlines=True)
+    assert failed.returncode == 2
+    assert 'single message and byte count' in failed.stderr
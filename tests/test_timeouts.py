@@ -0,0 +1,22 @@
+"""
+Tests of the timeouts predicted from earlier experiments
+"""
+
+import pytest
+
+import helicsTestSuite as suite
+
+
+def test_predict_timeout():
+    settings = {'experiment type': 'ManyToOne', 'core type': 'zmq', 'simulation timeout': 600}
+
+    def record(federates, launchTime, status='success', **changes):
+        return {'parameters': dict(settings, federates=federates, messages=1, bytes=8, **changes), 'results': {'status': status, 'launch time (wall)': launchTime}}
+
+    records = {'a': [record(10, 2.)], 'b': [record(100, 20.)], 'c': [record(1000, 1.e4, status='failure')], 'd': [record(10, 1.e3, **{'core type': 'tcp'})]}
+    parameters = dict(settings, federates=1000, messages=1, bytes=8)
+
+    assert suite.predict_timeout(records, parameters, 600) == pytest.approx(600.)
+    assert suite.predict_timeout(records, parameters, 1.e4) == pytest.approx(3. * 200.)
+    assert suite.predict_timeout(records, dict(parameters, federates=10), 600) == pytest.approx(10.)
+    assert suite.predict_timeout({}, parameters, 600) == 600
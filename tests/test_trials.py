@@ -0,0 +1,29 @@
+"""
+Tests of the aggregation of the repeated trials of an experiment
+"""
+
+import numpy as np
+import pytest
+
+import helicsTestSuite as suite
+
+
+def test_summarize_trials_flags_outliers():
+    times = [10., 10.2, 9.9, 10.1, 30.]
+    trials = [{'status': 'success', 'execution time (wall)': value} for value in times] + [{'status': 'failure', 'execution time (wall)': 0.}]
+    summary, outliers = suite.summarize_trials(trials, ['execution time (wall)'])
+
+    assert outliers == [False, False, False, False, True, False]
+    assert summary['trials'] == 6
+    assert summary['successful trials'] == 5
+    assert summary['outlier trials'] == 1
+    assert summary['execution time (wall)'] == pytest.approx(10.05)
+    assert summary['execution time (wall) ci low'] <= summary['execution time (wall) mean'] <= summary['execution time (wall) ci high']
+
+
+def test_summarize_trials_without_success():
+    summary, outliers = suite.summarize_trials([{'status': 'timeout'}], ['execution time (wall)'])
+
+    assert outliers == [False]
+    assert summary['execution time (wall)'] == 0.
+    assert np.isnan(summary['execution time (wall) std'])
@@ -0,0 +1,135 @@
+"""
+Tests of dispatching a sweep to worker agents. The coordinator is tested against stand-in workers that reply with
+canned messages, and a NOOP sweep is run on two worker agents on this host next to an address nobody listens on
+"""
+
+import json
+import socket
+import threading
+import time
+from multiprocessing.connection import Listener
+
+import pytest
+
+import helicsTestSuite as suite
+
+AUTHKEY = b'test'
+
+
+def free_address():
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        return probe.getsockname()
+
+
+def stand_in_worker(reply):
+    # serves one experiment per connection, reply gets the connection and the spec it was sent
+    listener = Listener(('127.0.0.1', 0), authkey=AUTHKEY)
+
+    def serve():
+        while True:
+            with listener.accept() as connection:
+                reply(connection, connection.recv()['spec'])
+
+    threading.Thread(target=serve, daemon=True).start()
+    return listener.address
+
+
+def trial(host):
+    return dict({column: 1. for column in suite.TIME_COLUMNS}, status='success', host=host)
+
+
+def read_records(resultsFile):
+    with open(resultsFile) as infile:
+        return [json.loads(line) for line in infile]
+
+
+def sweep(outFolder, federateNumber, workerAddresses, **settings):
+    return suite.run_search(outFolder, federateNumber, [1], [8], 1, 5, 'warning', False, False, ['zmq'], '1s', '30s', 60, 'NOOP', 'ManyToOne',
+                            sampleInterval=None, workerAddresses=workerAddresses, authkey=AUTHKEY, heartbeatTimeout=30., **settings)
+
+
+def test_dispatch_needs_authkey(tmp_path):
+    with pytest.raises(Exception, match='authkey'):
+        suite.run_search(tmp_path, [2], [1], [8], 1, 5, 'warning', False, False, ['zmq'], '1s', '30s', 60, 'NOOP', 'ManyToOne', workerAddresses=[free_address()])
+    with pytest.raises(Exception, match='authkey'):
+        suite.serve_worker(free_address(), tmp_path, None)
+
+
+def test_worker_error_is_failed_trial(tmp_path):
+    address = stand_in_worker(lambda connection, spec: connection.send({'type': 'error', 'error': 'no such core'}))
+
+    results = sweep(tmp_path, [2, 3], [address])
+
+    # the sweep goes on after the first experiment failed
+    assert list(results['status']) == ['failure', 'failure']
+    records = read_records(tmp_path / 'results.jsonl')
+    assert [record['results']['status'] for record in records] == ['failure', 'failure']
+    assert records[0]['results']['error'] == 'no such core'
+
+
+def test_worker_spec(tmp_path):
+    specs = []
+
+    def done(connection, spec):
+        specs.append(spec)
+        for _ in range(0, spec['repeats']):
+            connection.send({'type': 'trial', 'results': trial('done')})
+        connection.send({'type': 'done'})
+
+    results = sweep(tmp_path, [2], [stand_in_worker(done)], repeats=2, stagingFolder=tmp_path / 'staging', basePort=40000)
+
+    assert list(results['trials']) == [2]
+    # the worker gets the sweep settings of the experiment, where and on which ports it runs them is up to the worker
+    assert sorted(specs[0]) == sorted(setting for setting in suite.sweep_settings() if setting not in ['outFolder', 'workers', 'coresPerExperiment', 'basePort',
+                                                                                                      'portStride', 'saveTables', 'resultsStore', 'heartbeatTimeout'])
+    assert (specs[0]['federateNumber'], specs[0]['coreType'], specs[0]['repeats']) == ([2], ['zmq'], 2)
+    assert specs[0]['stagingFolder'] == str(tmp_path / 'staging')
+
+
+def test_dead_worker_trials_are_dropped(tmp_path):
+    def dies(connection, spec):
+        connection.send({'type': 'trial', 'results': trial('dies')})
+
+    def finishes(connection, spec):
+        for _ in range(0, spec['repeats']):
+            connection.send({'type': 'trial', 'results': trial('finishes')})
+        connection.send({'type': 'done'})
+
+    dying = stand_in_worker(dies)
+    results = sweep(tmp_path, [2], [dying, stand_in_worker(finishes)], repeats=2)
+
+    assert list(results['trials']) == [2]
+    records = read_records(tmp_path / 'results.jsonl')
+    assert [record['results']['host'] for record in records] == ['finishes', 'finishes']
+    assert [record['trial'] for record in records] == [0, 1]
+
+
+def test_noop_sweep_on_workers(noop_platform, tmp_path, capsys):
+    addresses = []
+    for idx, basePort in enumerate([43000, 44000]):
+        address = free_address()
+        threading.Thread(target=suite.serve_worker, args=(address, tmp_path / ('worker' + str(idx)), AUTHKEY), kwargs={'basePort': basePort}, daemon=True).start()
+        addresses.append(address)
+        # the worker is up once it accepts connections
+        deadline = time.monotonic() + 10.
+        while True:
+            try:
+                socket.create_connection(address).close()
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.05)
+    # the dead worker is first in line, so the first experiment has to be sent to another worker
+    deadAddress = free_address()
+
+    results = sweep(tmp_path / 'sweep', [2, 3, 4, 5], [deadAddress] + addresses)
+
+    assert list(results['status']) == ['success'] * 4
+    assert 'worker ' + suite.format_address(deadAddress) + ' is gone' in capsys.readouterr().out
+    # every experiment ran exactly once on one of the live workers
+    records = read_records(tmp_path / 'sweep' / 'results.jsonl')
+    assert sorted(record['hash'] for record in records) == sorted(results['experiment hash'])
+    experimentFolders = [folder for idx in range(0, 2) for folder in (tmp_path / ('worker' + str(idx))).iterdir()]
+    assert len(experimentFolders) == 4
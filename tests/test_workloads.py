@@ -0,0 +1,39 @@
+"""
+Tests of the bursty and trace workloads
+"""
+
+import pytest
+
+import helicsTestSuite as suite
+
+
+def test_workload_schedule_bursty():
+    workload = {'period': 0.5, 'bytes': {'distribution': 'uniform', 'low': 10, 'high': 20}, 'seed': 3}
+    schedule = suite.workload_schedule(['send0', 'send1'], 2, 100, 0.1, 10., workload)
+
+    assert set(schedule) == {'send0', 'send1'}
+    for messages in schedule.values():
+        assert messages == sorted(messages)
+        assert all(0 <= step < 100 and message in [0, 1] and 10 <= size <= 20 for step, message, size in messages)
+        # one message per publication every 5 steps
+        assert 36 <= len(messages) <= 40
+    assert schedule == suite.workload_schedule(['send0', 'send1'], 2, 100, 0.1, 10., workload)
+
+
+def test_workload_schedule_trace(tmp_path):
+    trace = tmp_path / 'trace.csv'
+    trace.write_text('time,federate,message,bytes\n0.3,0,0,50\n0.31,0,0,60\n1.0,send1,1,70\n20,0,0,10\n')
+    schedule = suite.workload_schedule(['send0', 'send1'], 2, 100, 0.1, 10., {'trace': trace})
+
+    # 0.3 falls on step 3 and not on the step before, a message sent twice in a step is only sent once, and the message
+    # after the end of the simulation is dropped
+    assert schedule == {'send0': [(3, 0, 60)], 'send1': [(10, 1, 70)]}
+    with pytest.raises(Exception, match='unknown workload settings'):
+        suite.workload_schedule(['send0'], 1, 100, 0.1, 10., {'rate': 1})
+    with pytest.raises(Exception, match='both the on and the off'):
+        suite.workload_schedule(['send0'], 1, 100, 0.1, 10., {'on': 1})
+    # a burst that does not last would never move the replay forward
+    with pytest.raises(Exception, match='on of a workload has to be larger than 0'):
+        suite.workload_schedule(['send0'], 1, 100, 0.1, 10., {'on': 0, 'off': 1})
+    with pytest.raises(Exception, match='period of a workload has to be larger than 0'):
+        suite.workload_schedule(['send0'], 1, 100, 0.1, 10., {'period': {'distribution': 'uniform', 'low': -2, 'high': -1}})